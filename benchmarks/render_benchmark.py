@@ -0,0 +1,159 @@
+"""Measure the time taken to render documentation with the templates of this package.
+
+Schemas rendered are the example cases (except those with references to URLs) and a synthetic schema big enough to
+make per-node rendering costs visible. Only rendering is measured: loading the templates and building the intermediate
+representation are done once beforehand, unless --include-loading is set, and the best time of several renders is
+kept. With --reference-templates-directory, each schema is also rendered with the
+templates from that directory (for example the templates directory of a previous version checked out elsewhere):
+the outputs are compared and both timings are reported. The same is done with --reference-renderer to compare the
+renderers of the md template. The exit code is 1 if any output differs.
+
+Examples:
+    python benchmarks/render_benchmark.py
+    python benchmarks/render_benchmark.py --reference-templates-directory /tmp/previous/json_schema_for_humans/templates
+    python benchmarks/render_benchmark.py --template-name md --renderer python --reference-renderer jinja
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+# init directories
+current_dir = os.path.abspath(os.path.dirname(__file__))
+parent_dir = os.path.abspath(os.path.dirname(current_dir))
+sys.path.insert(0, parent_dir)
+
+from json_schema_for_humans.generate import _get_intermediate_representation, _get_template, _pre_render
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.md_renderer import MarkdownRenderer
+
+CASES_DIRECTORY = os.path.join(parent_dir, "docs", "examples", "cases")
+GENERATED_TIMESTAMP_REGEXP = re.compile(r"on \d{4}-\d{2}-\d{2} at \d{2}:\d{2}:\d{2} [+-]\d{4}", re.IGNORECASE)
+
+
+def build_synthetic_schema(number_of_properties: int) -> Dict[str, Any]:
+    """Build a schema with nested objects, arrays, references, descriptions and examples"""
+    definitions = {
+        f"definition{i}": {
+            "type": "object",
+            "description": f"Definition {i} with **Markdown**\n\nAnd a `second` paragraph",
+            "properties": {
+                f"field{j}": {
+                    "type": ["string", "integer", "boolean"][j % 3],
+                    "description": "A field of a definition",
+                    "examples": [{"field": j, "values": [1, 2, 3]}],
+                }
+                for j in range(8)
+            },
+            "required": ["field0", "undocumented"],
+        }
+        for i in range(20)
+    }
+    properties = {
+        f"property{i}": {
+            "type": "object",
+            "description": f"Property {i}\n\n* item a\n* item b",
+            "properties": {
+                "reference": {"$ref": f"#/definitions/definition{i % 20}"},
+                "text": {"type": "string", "minLength": 1, "pattern": "^[a-z]+$", "examples": ["abc"]},
+                "list": {"type": "array", "minItems": 1, "items": {"$ref": f"#/definitions/definition{(i + 1) % 20}"}},
+                "choice": {"oneOf": [{"type": "integer", "minimum": 0}, {"type": "string", "enum": ["a", "b"]}]},
+            },
+        }
+        for i in range(number_of_properties)
+    }
+    return {"title": "Synthetic schema", "type": "object", "definitions": definitions, "properties": properties}
+
+
+def render(schema_path: str, config: GenerationConfiguration, repeat: int, include_loading: bool) -> Tuple[float, str]:
+    """Render the schema several times, return the best duration and the output without its timestamp"""
+    template = _get_template(config, False) if config.renderer == "jinja" else None
+    intermediate_representation = _get_intermediate_representation(schema_path, config, None)
+    best_duration = float("inf")
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if include_loading:
+            template = _get_template(config, False) if template else None
+        if template:
+            _pre_render(template, intermediate_representation, config)
+            output = "".join(template.generate(schema=intermediate_representation, config=config))
+        else:
+            output = "".join(MarkdownRenderer(config).generate(intermediate_representation))
+        best_duration = min(best_duration, time.perf_counter() - start)
+
+    return best_duration, GENERATED_TIMESTAMP_REGEXP.sub("", output)
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reference-templates-directory", help="Templates to compare with")
+    parser.add_argument("--renderer", choices=["jinja", "python"], default="jinja")
+    parser.add_argument("--reference-renderer", choices=["jinja", "python"], help="Renderer to compare with")
+    parser.add_argument("--template-name", action="append", choices=["js", "flat", "md"], dest="template_names")
+    parser.add_argument("--synthetic-properties", type=int, default=300, help="0 to not render a synthetic schema")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of renders of each schema, the best is kept")
+    parser.add_argument("--no-link-to-reused-ref", action="store_false", dest="link_to_reused_ref")
+    parser.add_argument("--include-loading", action="store_true", help="Also measure loading and compiling templates")
+    options = parser.parse_args(arguments)
+
+    schema_paths = [
+        os.path.join(CASES_DIRECTORY, file_name)
+        for file_name in sorted(os.listdir(CASES_DIRECTORY))
+        if file_name.endswith(".json") and "url" not in file_name
+    ]
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        if options.synthetic_properties:
+            synthetic_schema_path = os.path.join(temporary_directory, "synthetic.json")
+            with open(synthetic_schema_path, "w", encoding="utf-8") as synthetic_schema_file:
+                json.dump(build_synthetic_schema(options.synthetic_properties), synthetic_schema_file)
+            schema_paths.append(synthetic_schema_path)
+
+        has_reference = bool(options.reference_templates_directory or options.reference_renderer)
+        all_identical = True
+        for template_name in options.template_names or ["js", "flat", "md"]:
+            totals: Dict[str, float] = {"current": 0.0, "reference": 0.0}
+            for schema_path in schema_paths:
+                durations: Dict[str, float] = {}
+                outputs: Dict[str, str] = {}
+                versions: Dict[str, Tuple[str, str]] = {"current": (DEFAULT_TEMPLATES_DIRECTORY, options.renderer)}
+                if has_reference:
+                    versions["reference"] = (
+                        options.reference_templates_directory or DEFAULT_TEMPLATES_DIRECTORY,
+                        options.reference_renderer or options.renderer,
+                    )
+                for version, (templates_directory, renderer) in versions.items():
+                    config = GenerationConfiguration(
+                        template_name=template_name,
+                        templates_directory=templates_directory,
+                        renderer=renderer,
+                        minify=False,
+                        link_to_reused_ref=options.link_to_reused_ref,
+                    )
+                    durations[version], outputs[version] = render(
+                        schema_path, config, options.repeat, options.include_loading
+                    )
+                    totals[version] += durations[version]
+
+                line = f"{template_name:>4} {os.path.basename(schema_path):<40} {durations['current']:8.3f}s"
+                if "reference" in outputs:
+                    identical = outputs["current"] == outputs["reference"]
+                    all_identical = all_identical and identical
+                    line += f" {durations['reference']:8.3f}s {'identical' if identical else 'DIFFERENT'}"
+                print(line)
+
+            summary = f"{template_name:>4} {'Total':<40} {totals['current']:8.3f}s"
+            if has_reference:
+                summary += f" {totals['reference']:8.3f}s ({totals['reference'] / totals['current']:.2f}x)"
+            print(summary)
+
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
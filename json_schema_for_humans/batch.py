@@ -0,0 +1,270 @@
+import dataclasses
+import glob
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.lazy_sections import get_sections_directory
+from json_schema_for_humans.output_files import OutputFiles
+
+# Files found in directories given as input
+SCHEMA_FILE_EXTENSIONS = [".json", ".yaml", ".yml"]
+# {path} is the path of the schema relative to the input it was found from, without extension
+DEFAULT_OUTPUT_NAME = "{path}.{extension}"
+GLOB_CHARACTERS = "*?["
+
+
+def find_schema_files(inputs: List[str]) -> List[Tuple[str, str]]:
+    """Find the schema files to document from paths to files, paths to directories and glob patterns.
+
+    Directories are searched recursively for JSON and YAML files. Patterns can use ** to match any number of
+    directories. Return each schema file with its path relative to the directory of the input it was found from: the
+    directory itself, the part of the pattern before the first wildcard, or the directory of the file.
+    """
+    schema_files: Dict[str, str] = {}
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            base_directory = input_path
+            found_paths = [
+                os.path.join(directory, file_name)
+                for directory, _, file_names in os.walk(input_path)
+                for file_name in file_names
+                if os.path.splitext(file_name)[1] in SCHEMA_FILE_EXTENSIONS
+            ]
+        elif any(character in input_path for character in GLOB_CHARACTERS):
+            base_directory = _get_pattern_base_directory(input_path)
+            found_paths = [path for path in glob.glob(input_path, recursive=True) if os.path.isfile(path)]
+        elif os.path.isfile(input_path):
+            base_directory = os.path.dirname(input_path)
+            found_paths = [input_path]
+        else:
+            raise ValueError(f"{input_path} is not a file, a directory or a pattern")
+
+        if not found_paths:
+            raise ValueError(f"No schema file found in {input_path}")
+        for found_path in sorted(found_paths):
+            # The same file can be found from several inputs, it is only documented once
+            schema_files.setdefault(os.path.realpath(found_path), os.path.relpath(found_path, base_directory or "."))
+
+    return list(schema_files.items())
+
+
+def _get_pattern_base_directory(pattern: str) -> str:
+    """Get the directory a glob pattern starts from: its parts before the first one with a wildcard"""
+    parts = pattern.replace(os.path.sep, "/").split("/")
+    for index, part in enumerate(parts):
+        if any(character in part for character in GLOB_CHARACTERS):
+            return "/".join(parts[:index])
+    return os.path.dirname(pattern)
+
+
+def get_result_paths(
+    schema_files: List[Tuple[str, str]], output_directory: str, output_name: str, config: GenerationConfiguration
+) -> List[str]:
+    """Get the path of the result file of each schema file found by find_schema_files.
+
+    output_name is a pattern for the path of the result file relative to output_directory, that can use {name}, the
+    name of the schema file without extension, {path}, the same with the directories of the schema file relative to
+    its input, and {extension}, html or md depending on the template.
+    """
+    extension = "md" if config.template_name == "md" else "html"
+    result_paths = []
+    schemas_by_result_path: Dict[str, str] = {}
+    for schema_path, relative_path in schema_files:
+        path_without_extension = os.path.splitext(relative_path)[0]
+        try:
+            result_name = output_name.format(
+                name=os.path.basename(path_without_extension), path=path_without_extension, extension=extension
+            )
+        except (KeyError, IndexError) as error:
+            raise ValueError(
+                f"Unknown placeholder {error} in output name {output_name}, use {{name}}, {{path}} or {{extension}}"
+            )
+        result_path = os.path.normpath(os.path.join(output_directory, result_name))
+        if result_path in schemas_by_result_path:
+            raise ValueError(
+                f"{schemas_by_result_path[result_path]} and {schema_path} would both be documented in {result_path}, "
+                "use {path} in the output name"
+            )
+        schemas_by_result_path[result_path] = schema_path
+        result_paths.append(result_path)
+
+    return result_paths
+
+
+@dataclass
+class BatchResult:
+    """Outcome of the generation of the documentation of one schema file in a batch"""
+
+    schema_path: str
+    result_path: str
+    duration: timedelta = timedelta()
+    error: Optional[str] = None
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    # Paths or URLs of the schema and of the schemas it references
+    used_schemas: List[str] = field(default_factory=list)
+
+
+def generate_batch(
+    schema_files: List[Tuple[str, str]],
+    output_directory: str,
+    output_name: str = DEFAULT_OUTPUT_NAME,
+    config: GenerationConfiguration = None,
+    jobs: int = 1,
+    output_files: Optional[OutputFiles] = None,
+) -> List[BatchResult]:
+    """Generate the documentation of several schema files, found with find_schema_files, to output_directory.
+
+    The schemas are documented by jobs processes. Each process compiles the template once and loads each referenced
+    file once, for all the schemas it documents. The CSS and JS files are copied once per directory of result files.
+    A schema that cannot be documented does not stop the others, its error is in its result.
+    """
+    config = config or GenerationConfiguration()
+    output_files = output_files or OutputFiles()
+    result_paths = get_result_paths(schema_files, output_directory, output_name, config)
+    copy_assets(result_paths, config, output_files)
+
+    tasks = [(schema_path, result_path) for (schema_path, _), result_path in zip(schema_files, result_paths)]
+    return generate_all(tasks, config, jobs, output_files)
+
+
+def copy_assets(result_paths: List[str], config: GenerationConfiguration, output_files: OutputFiles) -> None:
+    """Copy the CSS and JS files once to each directory of result files, creating them"""
+    # Imported here, generate uses this module
+    from json_schema_for_humans.generate import copy_css_and_js_to_target
+
+    copied_directories = set()
+    for result_path in result_paths:
+        result_directory = os.path.dirname(result_path)
+        if result_directory not in copied_directories:
+            os.makedirs(result_directory or ".", exist_ok=True)
+            copy_css_and_js_to_target(result_path, config, output_files)
+            copied_directories.add(result_directory)
+
+
+def generate_all(
+    tasks: List[Tuple[str, str]],
+    config: GenerationConfiguration,
+    jobs: int,
+    output_files: OutputFiles,
+    generator: Optional["BatchGenerator"] = None,
+) -> List[BatchResult]:
+    """Generate the documentation of each schema path to its result path, using jobs processes.
+
+    If given, generator is used when there is a single process, to reuse its compiled template and loaded schemas.
+    """
+    if jobs <= 1 or len(tasks) < 2:
+        generator = generator or BatchGenerator(config)
+        results = [generator.generate(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_initialize_worker, initargs=(config,)) as executor:
+            results = list(executor.map(_generate_in_worker, *zip(*tasks)))
+
+    for result in results:
+        output_files.written.extend(result.written)
+        output_files.unchanged.extend(result.unchanged)
+    return results
+
+
+def sum_durations(results: List[BatchResult]) -> timedelta:
+    """Get the time taken by the generation of all the results, as if they were generated one after the other"""
+    return sum((result.duration for result in results), timedelta())
+
+
+def format_batch_summary(results: List[BatchResult], duration: timedelta) -> str:
+    """Get the report of a batch, with the time taken by each schema and the errors"""
+    lines = []
+    for result in results:
+        if result.error:
+            lines.append(f"FAILED {result.schema_path}: {result.error}")
+        else:
+            lines.append(f"{result.schema_path} -> {result.result_path} in {result.duration}")
+    failed_count = sum(1 for result in results if result.error)
+    lines.append(f"Generated {len(results) - failed_count} of {len(results)} schemas in {duration}")
+    if failed_count:
+        lines.append(f"{failed_count} schemas failed")
+
+    return "\n".join(lines)
+
+
+class BatchGenerator:
+    """Generate the documentation of schemas one after the other, keeping what they can share between them: the
+    compiled template and the loaded schemas, so that a file referenced by several schemas is only read once.
+    """
+
+    def __init__(self, config: GenerationConfiguration) -> None:
+        # Imported here, generate uses this module
+        from json_schema_for_humans.generate import _get_template, _uses_python_renderer
+
+        # The schemas are already documented in parallel, they do not start their own processes
+        self.config = dataclasses.replace(config, render_processes=0, pre_render_processes=0)
+        self.template = None if _uses_python_renderer(config) else _get_template(self.config, config.minify)
+        self.loaded_schemas: Dict[str, Any] = {}
+
+    def generate(self, schema_path: str, result_path: str) -> BatchResult:
+        """Generate the documentation of the schema at schema_path to result_path"""
+        # Imported here, generate uses this module
+        from json_schema_for_humans.generate import _write_result_file
+
+        start = datetime.now()
+        result = BatchResult(schema_path, result_path)
+        output_files = OutputFiles()
+        used_schemas = {schema_path}
+        try:
+            chunks = self.render(schema_path, get_sections_directory(result_path), used_schemas, output_files)
+            _write_result_file(result_path, chunks, self.config, output_files)
+        except Exception as exception:
+            logging.debug(f"Error documenting {schema_path}", exc_info=True)
+            result.error = f"{type(exception).__name__}: {exception}"
+
+        result.duration = datetime.now() - start
+        result.written = output_files.written
+        result.unchanged = output_files.unchanged
+        result.used_schemas = sorted(used_schemas)
+        return result
+
+    def render(
+        self,
+        schema_path: str,
+        sections_directory: Optional[str] = None,
+        used_schemas: Optional[Set[str]] = None,
+        output_files: Optional[OutputFiles] = None,
+    ) -> Iterator[str]:
+        """Render the documentation of the schema at schema_path as a stream of chunks. The schemas read to build it are
+        added to used_schemas, and the lazy section files written are counted by output_files, if given.
+        """
+        # Imported here, generate uses this module
+        from json_schema_for_humans.generate import _generate_chunks
+
+        return _generate_chunks(
+            schema_path,
+            self.loaded_schemas,
+            self.config,
+            self.config.minify,
+            sections_directory,
+            self.template,
+            used_schemas,
+            output_files,
+        )
+
+    def forget(self, schema_paths: Iterable[str]) -> None:
+        """Forget loaded schemas that changed, so that they are read again"""
+        for schema_path in schema_paths:
+            self.loaded_schemas.pop(schema_path, None)
+
+
+_worker_generator: Optional[BatchGenerator] = None
+
+
+def _initialize_worker(config: GenerationConfiguration) -> None:
+    global _worker_generator
+    _worker_generator = BatchGenerator(config)
+
+
+def _generate_in_worker(schema_path: str, result_path: str) -> BatchResult:
+    return _worker_generator.generate(schema_path, result_path)
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Type
+
+import markdown2
+import pygments
+
+from json_schema_for_humans import const, jinja_filters
+from json_schema_for_humans.schema_node import SchemaNode
+
+# Under this number of texts to convert, starting a process pool costs more than it saves
+MIN_TEXTS_FOR_PROCESS_POOL = 50
+
+
+class LruCache:
+    """Mapping of texts to their converted version, forgetting the least recently used ones past max_size entries.
+
+    A max_size of 0 or less disables the cache.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class PersistentCache:
+    """Cache of converted texts stored on disk, shared between generations.
+
+    Each entry is a file named after a hash of the text and of the conversion settings (key_prefix), so that changing
+    settings or versions never gives back a stale result. Errors reading or writing the cache are logged and otherwise
+    ignored, the cache is only there to save time.
+    """
+
+    def __init__(self, directory: str, key_prefix: str) -> None:
+        self.directory = directory
+        self.key_prefix = key_prefix
+
+    def _get_entry_path(self, key: str) -> str:
+        digest = hashlib.sha256(f"{self.key_prefix}\0{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest[2:])
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._get_entry_path(key), encoding="utf-8", newline="") as entry_file:
+                return entry_file.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.warning(f"Unable to read from cache directory {self.directory}: {e}")
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        entry_path = self._get_entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            # Write then rename so that concurrent generations never read a partially written entry
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(entry_path))
+            with open(file_descriptor, "w", encoding="utf-8", newline="") as entry_file:
+                entry_file.write(value)
+            os.replace(temporary_path, entry_path)
+        except OSError as e:
+            logging.warning(f"Unable to write to cache directory {self.directory}: {e}")
+
+
+class CachedConverter:
+    """Base class for the expensive conversions done while rendering (Markdown, syntax highlighting).
+
+    Results are looked up, in order, in the results of pre_convert, in an in-memory LRU cache and in a persistent
+    cache on disk if a cache directory is provided. Subclasses implement _convert and define which settings the result
+    depends on, used to tell apart entries of the persistent cache.
+    """
+
+    cache_namespace = ""
+
+    def __init__(self, options: Any, cache_size: int = 0, cache_directory: Optional[str] = None) -> None:
+        self.options = options
+        self.cache = LruCache(cache_size)
+        self.persistent_cache: Optional[PersistentCache] = None
+        if cache_directory:
+            self.persistent_cache = PersistentCache(
+                os.path.join(cache_directory, self.cache_namespace), self._get_persistent_cache_key_prefix()
+            )
+        self._pre_converted: Dict[str, str] = {}
+
+    def _get_persistent_cache_key_prefix(self) -> str:
+        raise NotImplementedError
+
+    def _convert(self, text: str) -> str:
+        raise NotImplementedError
+
+    def convert(self, text: str) -> str:
+        """Return the converted text, from a cache if possible"""
+        converted = self._pre_converted.get(text)
+        if converted is not None:
+            return converted
+
+        converted = self.cache.get(text)
+        if converted is not None:
+            return converted
+
+        if self.persistent_cache:
+            converted = self.persistent_cache.get(text)
+        if converted is None:
+            converted = self._convert(text)
+            if self.persistent_cache:
+                self.persistent_cache.put(text, converted)
+
+        self.cache.put(text, converted)
+        return converted
+
+    def pre_convert(self, texts: Iterable[str], processes: int) -> None:
+        """Convert all distinct texts ahead of rendering, using a pool of processes.
+
+        The results are kept regardless of the size of the LRU cache, until clear_pre_converted is called.
+        """
+        to_convert: List[str] = []
+        for text in dict.fromkeys(texts):
+            if text in self._pre_converted:
+                continue
+            converted = self.persistent_cache.get(text) if self.persistent_cache else None
+            if converted is None:
+                to_convert.append(text)
+            else:
+                self._pre_converted[text] = converted
+
+        if processes <= 1 or len(to_convert) < MIN_TEXTS_FOR_PROCESS_POOL:
+            converted_texts: Iterable[str] = map(self._convert, to_convert)
+            self._store_pre_converted(to_convert, converted_texts)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=_initialize_worker, initargs=(type(self), self.options)
+        ) as executor:
+            converted_texts = executor.map(
+                _convert_in_worker, to_convert, chunksize=max(1, len(to_convert) // (processes * 4))
+            )
+            self._store_pre_converted(to_convert, converted_texts)
+
+    def clear_pre_converted(self) -> None:
+        """Forget the results of pre_convert, once the render they were converted for is over"""
+        self._pre_converted.clear()
+
+    def _store_pre_converted(self, texts: List[str], converted_texts: Iterable[str]) -> None:
+        for text, converted in zip(texts, converted_texts):
+            self._pre_converted[text] = converted
+            if self.persistent_cache:
+                self.persistent_cache.put(text, converted)
+
+
+_worker_converter: Optional[CachedConverter] = None
+
+
+def _initialize_worker(converter_class: Type[CachedConverter], options: Any) -> None:
+    global _worker_converter
+    _worker_converter = converter_class(options)
+
+
+def _convert_in_worker(text: str) -> str:
+    return _worker_converter._convert(text)
+
+
+class MarkdownConverter(CachedConverter):
+    """Convert Markdown descriptions to HTML with markdown2, options being the markdown2 extras"""
+
+    cache_namespace = "markdown"
+
+    def __init__(self, options: Any, cache_size: int = 0, cache_directory: Optional[str] = None) -> None:
+        super().__init__(options, cache_size, cache_directory)
+        self._markdown = markdown2.Markdown(extras=options)
+
+    def _get_persistent_cache_key_prefix(self) -> str:
+        return json.dumps({"markdown2": markdown2.__version__, "extras": self.options}, sort_keys=True, default=str)
+
+    def _convert(self, text: str) -> str:
+        return self._markdown.convert(text)
+
+
+class ExampleHighlighter(CachedConverter):
+    """Highlight JSON examples as HTML with Pygments. There are no options, the lexer and formatter never change"""
+
+    cache_namespace = "examples"
+
+    def _get_persistent_cache_key_prefix(self) -> str:
+        return json.dumps({"pygments": pygments.__version__})
+
+    def _convert(self, text: str) -> str:
+        return jinja_filters.highlight_json_example(text)
+
+
+class FragmentCache:
+    """Rendered content of referenced definitions, to render each of them only once when it is used several times.
+
+    All nodes referencing the same definition share the same referenced node in the intermediate representation, with
+    the same HTML ids, so the content rendered for it is the same everywhere unless the referencing node adds keywords
+    that are rendered along with the definition. Only those keywords are rendered separately, as headers of the
+    referencing node.
+    """
+
+    HEADER_KEYWORDS = {const.DESCRIPTION, const.DEFAULT, const.KW_TITLE}
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._fragments: Dict[SchemaNode, str] = {}
+
+    def clear(self) -> None:
+        """Forget all fragments, to be called before rendering another schema"""
+        self._fragments.clear()
+
+    def render(self, schema_node: SchemaNode, caller: Callable[[], str]) -> str:
+        """Render the content of the definition referenced by schema_node with caller, unless it was already rendered.
+
+        Meant to be called from a template using {% call %}.
+        """
+        if not self.enabled or not schema_node.refers_to or not self.HEADER_KEYWORDS.issuperset(schema_node.keywords):
+            return caller()
+
+        fragment = self._fragments.get(schema_node.refers_to)
+        if fragment is None:
+            self.misses += 1
+            fragment = caller()
+            self._fragments[schema_node.refers_to] = fragment
+        else:
+            self.hits += 1
+
+        return fragment
+
+
+def iterate_schema_nodes(schema_node: SchemaNode) -> Iterator[SchemaNode]:
+    """Iterate over all nodes of an intermediate representation, each one once"""
+    seen: Set[int] = set()
+    to_visit = [schema_node]
+    while to_visit:
+        current_node = to_visit.pop()
+        if id(current_node) in seen:
+            continue
+        seen.add(id(current_node))
+        yield current_node
+
+        # Some keywords, like examples and default, are kept as JSON text
+        to_visit.extend(keyword for keyword in current_node.keywords.values() if isinstance(keyword, SchemaNode))
+        to_visit.extend(current_node.array_items)
+        to_visit.extend(current_node.properties.values())
+        to_visit.extend(current_node.pattern_properties.values())
+        for linked_node in [current_node.refers_to, current_node.links_to, current_node.additional_properties]:
+            if linked_node:
+                to_visit.append(linked_node)
@@ -0,0 +1,92 @@
+import json
+import string
+from typing import Dict, Optional
+
+import jinja2
+
+from json_schema_for_humans import const
+from json_schema_for_humans.caching import iterate_schema_nodes
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.multi_page import INDEX_PAGE_NAME, get_page_url
+from json_schema_for_humans.schema_node import SchemaNode
+
+ELEMENT_IDS_SCRIPT_ID = "element-ids"
+BASE36_DIGITS = string.digits + string.ascii_lowercase
+# Ids starting with a digit would need to be escaped in CSS selectors, and HTML ids made from paths never start with "_"
+SHORT_ID_PREFIX = "_"
+
+
+def to_base36(number: int) -> str:
+    """Write a positive number in base 36, with digits and lowercase letters"""
+    digits = []
+    while True:
+        number, digit = divmod(number, 36)
+        digits.append(BASE36_DIGITS[digit])
+        if number == 0:
+            return "".join(reversed(digits))
+
+
+def has_short_id(node: SchemaNode) -> bool:
+    """Check if the element of node is repeated enough in the js template for a short id to be worth it.
+
+    These are the sections of properties and the tabs of combining and conditional subschemas.
+    """
+    if node.is_a_property_node or node.parent_key in [const.KW_IF, const.KW_THEN, const.KW_ELSE]:
+        return True
+    return bool(node.parent and node.parent.parent_key in [const.KW_ALL_OF, const.KW_ANY_OF, const.KW_ONE_OF])
+
+
+class CompactIds:
+    """Short HTML ids for the elements of the js template, to make pages of deep schemas smaller.
+
+    The HTML id of a node is its path, and the js template repeats it about 8 times per property (ids of the section
+    and of its header, toggle target, aria attributes, inline handlers). With compact ids, each node gets a short
+    base 36 id instead, and inline handlers are replaced by listeners of schema_doc.js. Links, the search index and
+    lazy sections keep the readable HTML ids, the page gets a table from readable to short ids that schema_doc.js uses
+    to resolve them.
+
+    Short ids are given in the order of the sorted HTML ids, so that they do not depend on the order in which the
+    nodes are rendered, nor on the process rendering them.
+    """
+
+    def __init__(self, config: GenerationConfiguration) -> None:
+        self.enabled = bool(
+            config.template_name == "js"
+            and config.templates_directory == DEFAULT_TEMPLATES_DIRECTORY
+            and config.template_js_options.get("compact_ids")
+        )
+        self._schema_node: Optional[SchemaNode] = None
+        self._short_ids: Dict[str, str] = {}
+
+    def start(self, schema_node: SchemaNode) -> None:
+        """Give a short id to the nodes of schema_node"""
+        self._schema_node = schema_node
+        self._short_ids = {}
+        if not self.enabled:
+            return
+
+        html_ids = {node.html_id for node in iterate_schema_nodes(schema_node) if has_short_id(node)}
+        for index, html_id in enumerate(sorted(html_ids)):
+            self._short_ids[html_id] = f"{SHORT_ID_PREFIX}{to_base36(index)}"
+
+    def get_element_id(self, node: SchemaNode) -> str:
+        """Jinja filter. Get the id of the element documenting node"""
+        return self._short_ids.get(node.html_id, node.html_id)
+
+    @jinja2.contextfunction
+    def render(self, context: jinja2.runtime.Context) -> str:
+        """Get the HTML giving the page the short ids of the elements it contains. Meant to be called from a template"""
+        if not self._short_ids:
+            return ""
+
+        pages = context.get("pages")
+        page_properties = context.get("page_properties")
+        current_page = get_page_url(pages, page_properties[0]) if page_properties else f"{INDEX_PAGE_NAME}.html"
+        short_ids = {}
+        for node in iterate_schema_nodes(self._schema_node):
+            if node.html_id in self._short_ids and (not pages or get_page_url(pages, node) == current_page):
+                short_ids[node.html_id] = self._short_ids[node.html_id]
+
+        # Do not let a "</script>" in an HTML id end the script
+        short_ids_json = json.dumps(short_ids, separators=(",", ":")).replace("<", "\\u003c")
+        return f'<script type="application/json" id="{ELEMENT_IDS_SCRIPT_ID}">{short_ids_json}</script>'
@@ -0,0 +1,78 @@
+import gzip
+from typing import List, Optional
+
+from json_schema_for_humans.output_files import OutputFile, OutputFiles
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_EXTENSION = ".gz"
+BROTLI_EXTENSION = ".br"
+# Read files to compress by blocks of this size, to not load big files in memory
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+def get_sidecar_extensions() -> List[str]:
+    """Extensions of the compressed copies written next to each file, .br only if brotli is installed"""
+    return [GZIP_EXTENSION] + ([BROTLI_EXTENSION] if brotli else [])
+
+
+class CompressedSidecars:
+    """Write compressed copies of a file next to it while it is written, for static servers that can send them
+    instead of compressing the file for each request.
+
+    A .gz copy is always written, a .br copy only if the brotli package is installed. level is the gzip level, from 1
+    (fastest) to 9 (smallest). The same number is used as the brotli quality.
+    """
+
+    def __init__(self, path: str, level: int, output_files: Optional[OutputFiles] = None) -> None:
+        self.path = path
+        output_files = output_files or OutputFiles()
+        self._gzip_output = output_files.open(path + GZIP_EXTENSION, "wb")
+        # mtime=0 so that the copy is the same whenever it is written
+        self._gzip_file = gzip.GzipFile(
+            path + GZIP_EXTENSION, mode="wb", compresslevel=level, fileobj=self._gzip_output, mtime=0
+        )
+        self._brotli_compressor = None
+        self._brotli_file: Optional[OutputFile] = None
+        if brotli:
+            self._brotli_compressor = brotli.Compressor(quality=level)
+            self._brotli_file = output_files.open(path + BROTLI_EXTENSION, "wb")
+
+    def write(self, data: bytes) -> None:
+        """Compress the next part of the file"""
+        self._gzip_file.write(data)
+        if self._brotli_file:
+            self._brotli_file.write(self._brotli_compressor.process(data))
+
+    def close(self) -> None:
+        """Write the copies, unless they did not change"""
+        self._gzip_file.close()
+        self._gzip_output.close()
+        if self._brotli_file:
+            self._brotli_file.write(self._brotli_compressor.finish())
+            self._brotli_file.close()
+
+    def discard(self) -> None:
+        """Leave the copies as they were, the file was not completely written"""
+        self._gzip_output.discard()
+        if self._brotli_file:
+            self._brotli_file.discard()
+
+    def __enter__(self) -> "CompressedSidecars":
+        return self
+
+    def __exit__(self, exception_type, *_) -> None:
+        if exception_type:
+            self.discard()
+        else:
+            self.close()
+
+
+def write_compressed_sidecars(path: str, level: int, output_files: Optional[OutputFiles] = None) -> None:
+    """Write the compressed copies of a file that is already written"""
+    with open(path, "rb") as source_file, CompressedSidecars(path, level, output_files) as sidecars:
+        for block in iter(lambda: source_file.read(COPY_BLOCK_SIZE), b""):
+            sidecars.write(block)
@@ -0,0 +1,38 @@
+from typing import Dict, Iterable, Optional
+
+from json_schema_for_humans.output_files import OutputFiles
+
+
+def escape_make_path(path: str) -> str:
+    """Escape a path to be used as a target or a prerequisite of a Make rule"""
+    return path.replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+
+def format_depfile(dependencies: Dict[str, Iterable[str]]) -> str:
+    """Get a dependency file in the Make format, as written by compilers with -MD, with a rule for each result file
+    listing the schemas used to generate it.
+
+    Schemas loaded from URLs cannot be prerequisites, they are listed in comments after the rules.
+    """
+    rules = []
+    remote_schemas = []
+    for result_path, used_schemas in dependencies.items():
+        used_schemas = sorted(used_schemas)
+        local_schemas = [escape_make_path(path) for path in used_schemas if not path.startswith("http")]
+        rules.append(" \\\n  ".join([f"{escape_make_path(result_path)}:"] + local_schemas))
+        urls = [path for path in used_schemas if path.startswith("http")]
+        if urls:
+            remote_schemas.append(f"# {result_path}: {' '.join(urls)}")
+
+    depfile = "\n".join(rules) + "\n"
+    if remote_schemas:
+        depfile += "\n# Schemas loaded from URLs\n" + "\n".join(remote_schemas) + "\n"
+
+    return depfile
+
+
+def write_depfile(
+    path: str, dependencies: Dict[str, Iterable[str]], output_files: Optional[OutputFiles] = None
+) -> None:
+    """Write the dependency file of the result files, if it changed"""
+    (output_files or OutputFiles()).write_text(path, format_depfile(dependencies))
@@ -1,64 +1,116 @@
+import dataclasses
+import logging
 import os
-import re
-import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TextIO, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
 
 import click
-import htmlmin
 import jinja2
-import markdown2
 from jinja2 import FileSystemLoader
 from jinja2.ext import loopcontrols
 
 from json_schema_for_humans import jinja_filters, templating_utils
-from json_schema_for_humans.generation_configuration import GenerationConfiguration, _get_final_config
+from json_schema_for_humans.batch import (
+    DEFAULT_OUTPUT_NAME,
+    find_schema_files,
+    format_batch_summary,
+    generate_batch,
+    copy_assets,
+    generate_all,
+    get_result_paths,
+    sum_durations,
+)
+from json_schema_for_humans.caching import (
+    ExampleHighlighter,
+    FragmentCache,
+    MarkdownConverter,
+    iterate_schema_nodes,
+)
+from json_schema_for_humans.compact_ids import CompactIds
+from json_schema_for_humans.compression import CompressedSidecars, write_compressed_sidecars
+from json_schema_for_humans.depfile import write_depfile
+from json_schema_for_humans.generation_configuration import (
+    DEFAULT_TEMPLATES_DIRECTORY,
+    GenerationConfiguration,
+    _get_final_config,
+)
 from json_schema_for_humans.intermediate_representation import build_intermediate_representation
+from json_schema_for_humans.lazy_sections import LazySections, get_sections_directory
+from json_schema_for_humans.manifest import MANIFEST_FILE_NAME, BuildManifest
+from json_schema_for_humans.md_renderer import MarkdownRenderer
 from json_schema_for_humans.md_template import MarkdownTemplate
+from json_schema_for_humans.minification import WhitespaceCollapseExtension, minify_chunks
+from json_schema_for_humans.multi_page import (
+    get_index_file_name,
+    get_pages,
+    is_splitting_in_pages_supported,
+    page_url,
+)
+from json_schema_for_humans.offline_assets import OfflineAssets
+from json_schema_for_humans.output_files import OutputFile, OutputFiles
+from json_schema_for_humans.parallel_rendering import ParallelPropertiesRenderer
+from json_schema_for_humans.schema_node import SchemaNode
+from json_schema_for_humans.search_index import SearchIndex
+from json_schema_for_humans.serve import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    RenderServer,
+    create_http_server,
+)
+from json_schema_for_humans.stdio_server import run_stdio_server
+from json_schema_for_humans.watch import Watcher
 
 TEMPLATE_FILE_NAME = "base.html"
 CSS_FILE_NAME = "schema_doc.css"
 JS_FILE_NAME = "schema_doc.min.js"
 
 
-def generate_from_schema(
-    schema_file: Union[str, Path, TextIO],
-    loaded_schemas: Optional[Dict[str, Any]] = None,
-    minify: bool = True,
-    deprecated_from_description: bool = False,
-    default_from_description: bool = False,
-    expand_buttons: bool = False,
-    link_to_reused_ref: bool = True,
-    config: GenerationConfiguration = None,
-) -> str:
-    config = config or _get_final_config(
-        minify=minify,
-        deprecated_from_description=deprecated_from_description,
-        default_from_description=default_from_description,
-        expand_buttons=expand_buttons,
-        copy_css=False,
-        copy_js=False,
-        link_to_reused_ref=link_to_reused_ref,
-    )
-
+def _get_template(config: GenerationConfiguration, minify: bool) -> jinja2.Template:
+    """Create the Jinja environment for the configured template and load the base template from it"""
     templates_directory = os.path.join(config.templates_directory, config.template_name)
     base_template_path = os.path.join(templates_directory, TEMPLATE_FILE_NAME)
 
-    md = markdown2.Markdown(extras=config.markdown_options)
+    extensions = [loopcontrols]
+    if minify and config.template_name != "md" and config.templates_directory == DEFAULT_TEMPLATES_DIRECTORY:
+        # The result will be minified anyway, save the minifier the trouble for the static parts of the templates
+        extensions.append(WhitespaceCollapseExtension)
+
+    markdown_converter = MarkdownConverter(config.markdown_options, config.markdown_cache_size, config.cache_directory)
+    example_highlighter = ExampleHighlighter(None, config.highlight_cache_size, config.cache_directory)
+    fragment_cache = FragmentCache(config.cache_fragments)
+    parallel_renderer = ParallelPropertiesRenderer(config, minify)
+    lazy_sections = LazySections(config, minify)
+    search_index = SearchIndex(config, lazy_sections)
+    offline_assets = OfflineAssets(config)
+    compact_ids = CompactIds(config)
     loader = FileSystemLoader(templates_directory)
     env = jinja2.Environment(
         loader=loader,
-        extensions=[loopcontrols],
+        extensions=extensions,
         trim_blocks=(config.template_name == "md"),
         lstrip_blocks=(config.template_name == "md"),
     )
+    env.extend(
+        markdown_converter=markdown_converter,
+        example_highlighter=example_highlighter,
+        fragment_cache=fragment_cache,
+        parallel_renderer=parallel_renderer,
+        lazy_sections=lazy_sections,
+        search_index=search_index,
+        offline_assets=offline_assets,
+        compact_ids=compact_ids,
+    )
     if config.template_name == "md":
         md_template = MarkdownTemplate(config)
         md_template.register_jinja(env)
 
     env.filters["markdown"] = (
-        lambda text: jinja2.Markup(md.convert(text)) if config.description_is_markdown else lambda t: t
+        (lambda text: jinja2.Markup(markdown_converter.convert(text)))
+        if config.description_is_markdown
+        else (lambda text: text)
     )
     env.filters["python_to_json"] = jinja_filters.python_to_json
     env.filters["get_default"] = (
@@ -75,33 +127,281 @@ def generate_from_schema(
     env.filters["get_required_properties"] = jinja_filters.get_required_properties
     env.filters["get_first_property"] = jinja_filters.get_first_property
     env.filters["get_undocumented_required_properties"] = jinja_filters.get_undocumented_required_properties
-    env.filters["highlight_json_example"] = jinja_filters.highlight_json_example
+    env.filters["highlight_json_example"] = example_highlighter.convert
     env.filters["first_line"] = jinja_filters.first_line
+    env.filters["element_id"] = compact_ids.get_element_id
 
     env.tests["combining"] = jinja_filters.is_combining
     env.tests["description_short"] = jinja_filters.is_text_short
     env.tests["deprecated"] = lambda schema: jinja_filters.deprecated(config, schema)
+    env.tests["rendering_own_properties"] = lambda schema: jinja_filters.is_rendering_own_properties(config, schema)
     env.globals["get_local_time"] = jinja_filters.get_local_time
+    env.globals["get_generation_time"] = lambda: jinja_filters.get_generation_time(config)
+    env.globals["cached_fragment"] = fragment_cache.render
+    env.globals["rendered_in_parallel"] = parallel_renderer.render
+    env.globals["page_url"] = page_url
+    env.globals["lazy_section"] = lazy_sections.render
+    env.globals["search_index"] = search_index.render
+    env.globals["offline_assets"] = offline_assets.render
+    env.globals["element_ids"] = compact_ids.render
 
     with open(base_template_path, "r") as template_fp:
         template = env.from_string(template_fp.read())
 
+    return template
+
+
+def _get_intermediate_representation(
+    schema_file: Union[str, Path, TextIO],
+    config: GenerationConfiguration,
+    loaded_schemas: Optional[Dict[str, Any]],
+    used_schemas: Optional[Set[str]] = None,
+) -> SchemaNode:
     if isinstance(schema_file, list):
         # Backward compatibility
         schema_file = os.path.sep.join(schema_file)
 
-    intermediate_schema = build_intermediate_representation(schema_file, config, loaded_schemas)
+    return build_intermediate_representation(schema_file, config, loaded_schemas, used_schemas)
+
+
+def _pre_render(
+    template: jinja2.Template,
+    intermediate_schema: SchemaNode,
+    config: GenerationConfiguration,
+    pages: Optional[Dict[str, str]] = None,
+    sections_directory: Optional[str] = None,
+    output_files: Optional[OutputFiles] = None,
+) -> None:
+    """Prepare the template for rendering a new schema.
+
+    If configured, do the expensive conversions needed by the templates before rendering, using several processes,
+    and start rendering the root properties in other processes. If given, output_files counts the lazy section files.
+    """
+    environment = template.environment
+    environment.fragment_cache.clear()
+    # The converters are kept between renders, only the texts of this schema are kept out of their bounded caches
+    environment.markdown_converter.clear_pre_converted()
+    environment.example_highlighter.clear_pre_converted()
+    environment.lazy_sections.start(sections_directory, output_files)
+    environment.search_index.start(intermediate_schema, pages)
+    environment.compact_ids.start(intermediate_schema)
+    environment.parallel_renderer.start(intermediate_schema, pages)
+
+    if config.pre_render_processes <= 0:
+        return
+
+    if config.template_name == "md":
+        # Descriptions and examples are written as they are in Markdown
+        return
+
+    nodes = list(iterate_schema_nodes(intermediate_schema))
+    if config.description_is_markdown:
+        get_description = environment.filters["get_description"]
+        descriptions = (get_description(node) for node in nodes)
+        environment.markdown_converter.pre_convert(
+            [description for description in descriptions if description], config.pre_render_processes
+        )
+    examples = [example for node in nodes for example in node.examples]
+    environment.example_highlighter.pre_convert(examples, config.pre_render_processes)
+
+
+def _report_cache_statistics(chunks: Iterable[str], template: jinja2.Template) -> Iterator[str]:
+    """Pass the rendered chunks through, then log how useful the caches were once rendering is over"""
+    yield from chunks
+
+    _log_cache_statistics(template)
+
+
+def _log_cache_statistics(template: jinja2.Template) -> None:
+    environment = template.environment
+    for cache_name, cache in [
+        ("Rendered fragments", environment.fragment_cache),
+        ("Markdown descriptions", environment.markdown_converter.cache),
+        ("Highlighted examples", environment.example_highlighter.cache),
+    ]:
+        logging.info(f"{cache_name} cache: {cache.hits} hits, {cache.misses} misses")
+
+
+def _render(
+    template: jinja2.Template,
+    intermediate_schema: SchemaNode,
+    config: GenerationConfiguration,
+    minify: bool,
+    sections_directory: Optional[str] = None,
+    output_files: Optional[OutputFiles] = None,
+) -> Iterator[str]:
+    """Render the documentation of a schema as a stream of chunks, minified if requested"""
+    _pre_render(template, intermediate_schema, config, sections_directory=sections_directory, output_files=output_files)
+    try:
+        chunks = template.generate(schema=intermediate_schema, config=config)
+        if minify:
+            chunks = minify_chunks(chunks, config.template_name)
+        yield from _report_cache_statistics(chunks, template)
+        template.environment.lazy_sections.finish()
+    finally:
+        # Do not leave workers behind if rendering failed or was not consumed until the end
+        template.environment.parallel_renderer.close()
+
+
+def _render_pages(
+    template: jinja2.Template,
+    intermediate_schema: SchemaNode,
+    config: GenerationConfiguration,
+    minify: bool,
+    sections_directory: Optional[str] = None,
+    output_files: Optional[OutputFiles] = None,
+) -> Iterator[Tuple[str, Iterator[str]]]:
+    """Render the documentation of a schema as several pages: an index with the root of the schema and links to one
+    page per root property.
+
+    Yield the file name of each page with its stream of chunks. The chunks of a page must be consumed before moving to
+    the next page.
+    """
+    pages = get_pages(config, intermediate_schema)
+    _pre_render(template, intermediate_schema, config, pages, sections_directory, output_files)
+    try:
+        page_properties: Dict[str, List[SchemaNode]] = {page_name: [] for page_name in pages.values()}
+        if pages:
+            for sub_property in intermediate_schema.iterate_properties:
+                page_properties[pages[sub_property.html_id]].append(sub_property)
+
+        for page_name, properties in [(get_index_file_name(config), [])] + list(page_properties.items()):
+            chunks = template.generate(
+                schema=intermediate_schema, config=config, pages=pages, page_properties=properties
+            )
+            if minify:
+                chunks = minify_chunks(chunks, config.template_name)
+            yield page_name, chunks
+
+        template.environment.lazy_sections.finish()
+        _log_cache_statistics(template)
+    finally:
+        template.environment.parallel_renderer.close()
 
-    rendered = template.render(schema=intermediate_schema, config=config)
 
+def _uses_python_renderer(config: GenerationConfiguration) -> bool:
+    """Check if the documentation is rendered with the python renderer instead of the jinja templates"""
+    if config.renderer != "python":
+        return False
+
+    if config.template_name != "md" or config.templates_directory != DEFAULT_TEMPLATES_DIRECTORY:
+        logging.warning("The python renderer only renders the built-in md template, using the jinja renderer instead")
+        return False
+
+    return True
+
+
+def _generate_chunks(
+    schema_file: Union[str, Path, TextIO],
+    loaded_schemas: Optional[Dict[str, Any]],
+    config: GenerationConfiguration,
+    minify: bool,
+    sections_directory: Optional[str] = None,
+    template: Optional[jinja2.Template] = None,
+    used_schemas: Optional[Set[str]] = None,
+    output_files: Optional[OutputFiles] = None,
+) -> Iterator[str]:
+    """Render the documentation of a schema as a stream of chunks, with the configured renderer.
+
+    If given, lazy sections are written to sections_directory, and counted by output_files. template can be given to
+    reuse a template already compiled with the same configuration. If given, the schemas read to build the
+    documentation are added to used_schemas.
+    """
+    if _uses_python_renderer(config):
+        template = None
+    elif not template:
+        template = _get_template(config, minify)
+    intermediate_schema = _get_intermediate_representation(schema_file, config, loaded_schemas, used_schemas)
+    if template:
+        return _render(template, intermediate_schema, config, minify, sections_directory, output_files)
+
+    chunks = MarkdownRenderer(config).generate(intermediate_schema)
     if minify:
-        if config.template_name == "md":
-            # remove multiple contiguous empty lines
-            rendered = re.sub(r"\n\s*\n", "\n\n", rendered)
-        else:
-            rendered = htmlmin.minify(rendered)
+        chunks = minify_chunks(chunks, config.template_name)
 
-    return rendered
+    return chunks
+
+
+def generate_from_schema(
+    schema_file: Union[str, Path, TextIO],
+    loaded_schemas: Optional[Dict[str, Any]] = None,
+    minify: bool = True,
+    deprecated_from_description: bool = False,
+    default_from_description: bool = False,
+    expand_buttons: bool = False,
+    link_to_reused_ref: bool = True,
+    config: GenerationConfiguration = None,
+) -> str:
+    config = config or _get_final_config(
+        minify=minify,
+        deprecated_from_description=deprecated_from_description,
+        default_from_description=default_from_description,
+        expand_buttons=expand_buttons,
+        copy_css=False,
+        copy_js=False,
+        link_to_reused_ref=link_to_reused_ref,
+    )
+
+    return "".join(_generate_chunks(schema_file, loaded_schemas, config, minify))
+
+
+def generate_stream_from_schema(
+    schema_file: Union[str, Path, TextIO],
+    loaded_schemas: Optional[Dict[str, Any]] = None,
+    config: GenerationConfiguration = None,
+) -> Iterator[str]:
+    """Generate the schema documentation as a stream of chunks.
+
+    The template is rendered incrementally and, if config.minify is set, minified on the fly, so the whole document
+    does not need to be held in memory at once.
+    """
+    config = config or GenerationConfiguration()
+
+    return _generate_chunks(schema_file, loaded_schemas, config, config.minify)
+
+
+def generate_pages_from_schema(
+    schema_file: Union[str, Path, TextIO],
+    output_directory: Union[str, Path],
+    loaded_schemas: Optional[Dict[str, Any]] = None,
+    config: GenerationConfiguration = None,
+    output_files: Optional[OutputFiles] = None,
+) -> List[str]:
+    """Generate the schema documentation as several pages written to output_directory.
+
+    The index page documents the root of the schema and links to one page per root property. Links between parts
+    of the schema that are in different pages point to the right page. CSS and JS files are copied once, next to the
+    pages.
+
+    Only the built-in HTML templates can be split, other templates are written to a single index page.
+
+    Pages that did not change are not written again. If given, output_files counts the written and unchanged files.
+
+    :return: The paths of the pages, starting with the index page
+    """
+    config = config or GenerationConfiguration()
+    output_files = output_files or OutputFiles()
+    os.makedirs(output_directory, exist_ok=True)
+    index_path = os.path.join(output_directory, get_index_file_name(config))
+    copy_css_and_js_to_target(index_path, config, output_files)
+
+    if not is_splitting_in_pages_supported(config):
+        logging.warning("Only the built-in js and flat templates can be split in several pages, writing a single page")
+        chunks = _generate_chunks(schema_file, loaded_schemas, config, config.minify)
+        _write_result_file(index_path, chunks, config, output_files)
+        return [index_path]
+
+    template = _get_template(config, config.minify)
+    intermediate_schema = _get_intermediate_representation(schema_file, config, loaded_schemas)
+    written_paths = []
+    sections_directory = get_sections_directory(index_path)
+    pages = _render_pages(template, intermediate_schema, config, config.minify, sections_directory, output_files)
+    for page_name, chunks in pages:
+        page_path = os.path.join(output_directory, page_name)
+        _write_result_file(page_path, chunks, config, output_files)
+        written_paths.append(page_path)
+
+    return written_paths
 
 
 def generate_from_filename(
@@ -115,8 +415,13 @@ def generate_from_filename(
     copy_js: bool = True,
     link_to_reused_ref: bool = True,
     config: GenerationConfiguration = None,
+    output_files: Optional[OutputFiles] = None,
 ) -> None:
-    """Generate the schema documentation from a filename"""
+    """Generate the schema documentation from a filename.
+
+    The result file and the copied CSS and JS files are not written again if they did not change. If given,
+    output_files counts the written and unchanged files.
+    """
     config = config or _get_final_config(
         minify=minify,
         deprecated_from_description=deprecated_from_description,
@@ -132,20 +437,32 @@ def generate_from_filename(
     elif isinstance(schema_file_name, Path):
         schema_file_name = str(schema_file_name.resolve())
 
-    rendered_schema_doc = generate_from_schema(
-        schema_file_name,
-        minify=minify,
-        deprecated_from_description=deprecated_from_description,
-        default_from_description=default_from_description,
-        expand_buttons=expand_buttons,
-        link_to_reused_ref=link_to_reused_ref,
-        config=config,
-    )
+    _generate_to_file(schema_file_name, result_file_name, config, output_files or OutputFiles())
 
-    copy_css_and_js_to_target(result_file_name, config)
 
-    with open(result_file_name, "w", encoding="utf-8") as result_schema_doc:
-        result_schema_doc.write(rendered_schema_doc)
+def _generate_to_file(
+    schema_file: Union[str, TextIO],
+    result_file_path: str,
+    config: GenerationConfiguration,
+    output_files: OutputFiles,
+    used_schemas: Optional[Set[str]] = None,
+) -> None:
+    """Generate the schema documentation to the file at result_file_path, along with its CSS and JS files. The path
+    of every schema loaded is added to used_schemas, if given.
+    """
+    copy_css_and_js_to_target(result_file_path, config, output_files)
+
+    sections_directory = get_sections_directory(result_file_path)
+    chunks = _generate_chunks(
+        schema_file,
+        None,
+        config,
+        config.minify,
+        sections_directory,
+        used_schemas=used_schemas,
+        output_files=output_files,
+    )
+    _write_result_file(result_file_path, chunks, config, output_files)
 
 
 def generate_from_file_object(
@@ -159,9 +476,13 @@ def generate_from_file_object(
     copy_js: bool = True,
     link_to_reused_ref: bool = True,
     config: GenerationConfiguration = None,
+    output_files: Optional[OutputFiles] = None,
 ) -> None:
     """Generate the JSON schema documentation from opened file objects for both input and output files. The
     result_file should be opened in write mode.
+
+    The result file is always written. The copied CSS and JS files are not written again if they did not change. If
+    given, output_files counts the written and unchanged files.
     """
     config = config or _get_final_config(
         minify=minify,
@@ -173,15 +494,67 @@ def generate_from_file_object(
         link_to_reused_ref=link_to_reused_ref,
     )
 
-    result = generate_from_schema(schema_file, config=config)
+    output_files = output_files or OutputFiles()
+    copy_css_and_js_to_target(result_file.name, config, output_files)
+
+    sections_directory = get_sections_directory(result_file.name)
+    chunks = _generate_chunks(schema_file, None, config, config.minify, sections_directory, output_files=output_files)
+    if not config.compress_output or result_file.name in ["-", "<stdout>"]:
+        # The standard output cannot have compressed copies
+        write_stream(chunks, result_file)
+        return
+
+    with CompressedSidecars(result_file.name, config.compression_level, output_files) as compressed_sidecars:
+        write_stream(chunks, result_file, compressed_sidecars)
+
 
-    copy_css_and_js_to_target(result_file.name, config)
+def _write_result_file(
+    result_file_path: str, chunks: Iterable[str], config: GenerationConfiguration, output_files: OutputFiles
+) -> None:
+    """Write rendered chunks to a file, along with its compressed copies if configured. Files that did not change are
+    left as they are
+    """
+    with output_files.open(result_file_path) as result_file:
+        if not config.compress_output:
+            write_stream(chunks, result_file)
+            return
 
-    result_file.write(result)
+        with CompressedSidecars(result_file_path, config.compression_level, output_files) as compressed_sidecars:
+            write_stream(chunks, result_file, compressed_sidecars)
 
 
-def copy_css_and_js_to_target(result_file_path: str, config: GenerationConfiguration) -> None:
-    """Copy the CSS and JS files needed to display the resulting page to the directory containing the result file"""
+def write_stream(
+    chunks: Iterable[str],
+    result_file: Union[TextIO, OutputFile],
+    compressed_sidecars: Optional[CompressedSidecars] = None,
+) -> None:
+    """Write rendered chunks to an open file as they are produced, compressing them on the way if sidecars are given"""
+    for chunk in chunks:
+        result_file.write(chunk)
+        if compressed_sidecars:
+            # The file is opened in text mode, its copies must have the same line endings
+            compressed_sidecars.write(chunk.replace("\n", os.linesep).encode("utf-8"))
+
+
+def copy_css_and_js_to_target(
+    result_file_path: str, config: GenerationConfiguration, output_files: Optional[OutputFiles] = None
+) -> None:
+    """Copy the CSS and JS files needed to display the resulting page to the directory containing the result file.
+
+    Files that are already there with the same content are not copied again. If given, output_files counts the copied
+    and unchanged files.
+    """
+    output_files = output_files or OutputFiles()
+    target_directory = os.path.dirname(result_file_path)
+    offline_assets = OfflineAssets(config)
+    if offline_assets.enabled:
+        # The CSS and JS of the template are in the page or in the bundle
+        for bundle_file_name in offline_assets.write_bundle(target_directory, output_files):
+            if config.compress_output:
+                bundle_file_path = os.path.join(target_directory, bundle_file_name)
+                write_compressed_sidecars(bundle_file_path, config.compression_level, output_files)
+        return
+
     files_to_copy = []
     if config.copy_css:
         files_to_copy.append(CSS_FILE_NAME)
@@ -190,7 +563,6 @@ def copy_css_and_js_to_target(result_file_path: str, config: GenerationConfigura
     if not files_to_copy:
         return
 
-    target_directory = os.path.dirname(result_file_path)
     source_directory = os.path.join(config.templates_directory, config.template_name)
     if target_directory == source_directory:
         return
@@ -199,15 +571,26 @@ def copy_css_and_js_to_target(result_file_path: str, config: GenerationConfigura
         source_file_path = os.path.join(source_directory, file_to_copy)
         if not os.path.exists(source_file_path):
             continue
-        try:
-            shutil.copy(source_file_path, os.path.join(target_directory, file_to_copy))
-        except shutil.SameFileError:
-            print(f"Not copying {file_to_copy} to {os.path.abspath(target_directory)}, file already exists")
+        target_file_path = os.path.join(target_directory, file_to_copy)
+        output_files.copy(source_file_path, target_file_path)
+        if config.compress_output:
+            write_compressed_sidecars(target_file_path, config.compression_level, output_files)
 
 
-@click.command()
-@click.argument("schema_file", nargs=1, type=click.File("r", encoding="utf-8"))
-@click.argument("result_file", nargs=1, type=click.File("w+", encoding="utf-8"), default="schema_doc.html")
+class _GenerateCommand(click.Command):
+    """Command running one of the SUBCOMMANDS instead when its name is the first argument"""
+
+    def main(self, args: Optional[List[str]] = None, prog_name: Optional[str] = None, **extra: Any) -> Any:
+        args = list(sys.argv[1:] if args is None else args)
+        if args and args[0] in SUBCOMMANDS:
+            prog_name = f"{prog_name or os.path.basename(sys.argv[0])} {args[0]}"
+            return SUBCOMMANDS[args[0]].main(args[1:], prog_name, **extra)
+
+        return super().main(args, prog_name, **extra)
+
+
+@click.command(cls=_GenerateCommand)
+@click.argument("paths", nargs=-1, metavar="SCHEMA_FILE [RESULT_FILE]")
 @click.option(
     "--config-file", type=click.File("r", encoding="utf-8"), help="JSON or YAML file containing generation parameters"
 )
@@ -233,9 +616,72 @@ def copy_css_and_js_to_target(result_file_path: str, config: GenerationConfigura
     help="If set and 2 parts of the schema refer to the same definition, the definition will only be rendered once "
     "and all other references will be replaced by a link.",
 )
+@click.option(
+    "--pages-directory",
+    type=click.Path(file_okay=False),
+    help="Split the documentation in an index page and one page per root property, all written to this directory "
+    "instead of RESULT_FILE",
+)
+@click.option(
+    "--compress",
+    is_flag=True,
+    help="Also write compressed copies of the result and of the copied CSS and JS files: .gz, and .br if the brotli "
+    "package is installed",
+)
+@click.option(
+    "--compression-level",
+    type=click.IntRange(1, 9),
+    help="Level of the compressed copies, from 1 (fastest) to 9 (smallest, default)",
+)
+@click.option(
+    "--output-directory",
+    type=click.Path(file_okay=False),
+    help="Document all the schemas given as files, directories or glob patterns instead of SCHEMA_FILE, writing the "
+    "results to this directory",
+)
+@click.option(
+    "--output-name",
+    default=DEFAULT_OUTPUT_NAME,
+    show_default=True,
+    help="With --output-directory, path of each result file in the directory. {name} is the name of the schema file "
+    "without extension, {path} is the same with the directories of the schema file from its input, {extension} is "
+    "html or md",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="With --output-directory or --stdio-server, number of processes documenting schemas at the same time",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running and generate the documentation again when a schema or a file it references changes",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=f"Only generate the results that are out of date, according to the {MANIFEST_FILE_NAME} file written next "
+    "to them",
+)
+@click.option(
+    "--check",
+    is_flag=True,
+    help=f"Only report the results that are out of date according to {MANIFEST_FILE_NAME}, exit with 1 if there are",
+)
+@click.option(
+    "--depfile",
+    type=click.Path(dir_okay=False),
+    help="Also write a dependency file in the Make format, listing the schema files used to generate each result",
+)
+@click.option(
+    "--stdio-server",
+    is_flag=True,
+    help="Instead of SCHEMA_FILE, read jobs from the standard input, one JSON object per line, and write the result "
+    "of each one as a JSON object on a line of the standard output. Up to --jobs jobs are run at the same time",
+)
 def main(
-    schema_file: TextIO,
-    result_file: TextIO,
+    paths: Tuple[str, ...],
     config_file: TextIO,
     config: List[str],
     minify: bool,
@@ -245,7 +691,25 @@ def main(
     copy_css: bool,
     copy_js: bool,
     link_to_reused_ref: bool,
+    pages_directory: Optional[str],
+    compress: bool,
+    compression_level: Optional[int],
+    output_directory: Optional[str],
+    output_name: str,
+    jobs: int,
+    watch: bool,
+    incremental: bool,
+    check: bool,
+    depfile: Optional[str],
+    stdio_server: bool,
 ) -> None:
+    """Generate the documentation of SCHEMA_FILE to RESULT_FILE (schema_doc.html by default).
+
+    With --output-directory, generate the documentation of all the given schemas at once instead. Each path can be
+    a schema file, a directory searched recursively for JSON and YAML files, or a glob pattern.
+
+    Run "generate-schema-doc serve --help" to render documentation on demand with a local HTTP server instead.
+    """
     start = datetime.now()
     config = _get_final_config(
         minify=minify,
@@ -258,10 +722,227 @@ def main(
         config=config_file,
         config_parameters=config,
     )
+    if compress:
+        config = dataclasses.replace(config, compress_output=True)
+    if compression_level:
+        config = dataclasses.replace(config, compression_level=compression_level)
+
+    if stdio_server:
+        if paths or pages_directory or output_directory or watch or incremental or check or depfile:
+            raise click.UsageError("--stdio-server only takes its jobs from the standard input")
+        if run_stdio_server(sys.stdin, sys.stdout, config, jobs):
+            sys.exit(1)
+        return
+    if not paths:
+        raise click.UsageError("Missing argument 'SCHEMA_FILE'")
+
+    output_files = OutputFiles()
+    if pages_directory and (output_directory or watch or incremental or check):
+        raise click.UsageError("--pages-directory cannot be used with --output-directory, --watch or --incremental")
+    if watch and (incremental or check):
+        raise click.UsageError("--watch cannot be used with --incremental or --check")
+    if depfile and (pages_directory or watch or check):
+        raise click.UsageError("--depfile cannot be used with --pages-directory, --watch or --check")
+    if watch:
+        _watch(paths, output_directory, output_name, config, jobs, output_files)
+        return
+    if incremental or check:
+        _generate_incremental(paths, output_directory, output_name, config, jobs, output_files, check, depfile)
+        return
+
+    if output_directory:
+        try:
+            results = generate_batch(
+                find_schema_files(list(paths)), output_directory, output_name, config, jobs, output_files
+            )
+        except ValueError as error:
+            raise click.UsageError(str(error))
+        if depfile:
+            write_depfile(depfile, {result.result_path: result.used_schemas for result in results}, output_files)
+        print(format_batch_summary(results, datetime.now() - start))
+        if output_files.unchanged:
+            print(f"{len(output_files.unchanged)} unchanged files were not rewritten")
+        if any(result.error for result in results):
+            sys.exit(1)
+        return
 
-    generate_from_file_object(schema_file, result_file, config=config)
+    if len(paths) > 2:
+        raise click.UsageError("Use --output-directory to document several schemas")
+    schema_file = click.File("r", encoding="utf-8").convert(paths[0], None, click.get_current_context())
+    result_file = paths[1] if len(paths) > 1 else "schema_doc.html"
+    if pages_directory:
+        written_paths = generate_pages_from_schema(
+            schema_file, pages_directory, config=config, output_files=output_files
+        )
+        duration = datetime.now() - start
+        print(
+            f"Generated {len(written_paths)} pages in {pages_directory} in {duration}{_unchanged_files(output_files)}"
+        )
+        return
+
+    if result_file == "-":
+        if depfile:
+            raise click.UsageError("--depfile needs a RESULT_FILE to be the target of its rule")
+        generate_from_file_object(schema_file, sys.stdout, config=config, output_files=output_files)
+    else:
+        used_schemas: Set[str] = set()
+        # Not opened before, so that an unchanged result file is left as it is
+        _generate_to_file(schema_file, result_file, config, output_files, used_schemas)
+        if depfile:
+            write_depfile(depfile, {result_file: used_schemas}, output_files)
     duration = datetime.now() - start
-    print(f"Generated {result_file.name} in {duration}")
+    print(f"Generated {result_file} in {duration}{_unchanged_files(output_files)}")
+
+
+def _get_cli_tasks(
+    paths: Tuple[str, ...], output_directory: Optional[str], output_name: str, config: GenerationConfiguration
+) -> List[Tuple[str, str]]:
+    """Get the schema files given to the CLI with the path of their result file"""
+    try:
+        if output_directory:
+            schema_files = find_schema_files(list(paths))
+            result_paths = get_result_paths(schema_files, output_directory, output_name, config)
+            return [(schema_path, result_path) for (schema_path, _), result_path in zip(schema_files, result_paths)]
+        if len(paths) > 2 or "-" in paths:
+            raise ValueError("Expected a single SCHEMA_FILE and RESULT_FILE, or --output-directory")
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+    return [(os.path.realpath(paths[0]), paths[1] if len(paths) > 1 else "schema_doc.html")]
+
+
+def _generate_incremental(
+    paths: Tuple[str, ...],
+    output_directory: Optional[str],
+    output_name: str,
+    config: GenerationConfiguration,
+    jobs: int,
+    output_files: OutputFiles,
+    check: bool,
+    depfile: Optional[str] = None,
+) -> None:
+    """Generate the documentation of the schemas given to the CLI that is out of date, or only report it with check.
+
+    The dependency file lists the schemas used by all the results, the ones of the results that were up to date come
+    from the manifest.
+    """
+    start = datetime.now()
+    tasks = _get_cli_tasks(paths, output_directory, output_name, config)
+    manifest = BuildManifest(output_directory or os.path.dirname(tasks[0][1]) or ".", config)
+    out_of_date_tasks = [task for task in tasks if not manifest.is_up_to_date(*task)]
+    if check:
+        for _, result_path in out_of_date_tasks:
+            print(f"Out of date: {result_path}")
+        print(f"{len(out_of_date_tasks)} of {len(tasks)} results are out of date")
+        if out_of_date_tasks:
+            sys.exit(1)
+        return
+
+    copy_assets([result_path for _, result_path in out_of_date_tasks], config, output_files)
+    results = generate_all(out_of_date_tasks, config, jobs, output_files)
+    for result in results:
+        if result.error:
+            manifest.forget(result.result_path)
+        else:
+            manifest.record(result.schema_path, result.result_path, result.used_schemas)
+    manifest.save(output_files)
+    if depfile:
+        dependencies = {result_path: manifest.get_used_schemas(result_path) for _, result_path in tasks}
+        dependencies.update({result.result_path: result.used_schemas for result in results})
+        write_depfile(depfile, dependencies, output_files)
+
+    if results:
+        print(format_batch_summary(results, datetime.now() - start))
+    print(f"{len(tasks) - len(out_of_date_tasks)} of {len(tasks)} results were up to date")
+    if any(result.error for result in results):
+        sys.exit(1)
+
+
+def _watch(
+    paths: Tuple[str, ...],
+    output_directory: Optional[str],
+    output_name: str,
+    config: GenerationConfiguration,
+    jobs: int,
+    output_files: OutputFiles,
+) -> None:
+    """Generate the documentation of the schemas given to the CLI, then again each time they change"""
+    start = datetime.now()
+    watcher = Watcher(_get_cli_tasks(paths, output_directory, output_name, config), config, jobs, output_files)
+    print(format_batch_summary(watcher.build(), datetime.now() - start))
+    print(f"Watching {len(watcher.watched_files)} files for changes, press Ctrl+C to stop")
+    try:
+        watcher.run(lambda results: print(format_batch_summary(results, sum_durations(results))))
+    except KeyboardInterrupt:
+        pass
+
+
+@click.command()
+@click.argument("paths", nargs=-1, metavar="[SCHEMA_FILE]...")
+@click.option(
+    "--config-file", type=click.File("r", encoding="utf-8"), help="JSON or YAML file containing generation parameters"
+)
+@click.option(
+    "--config",
+    multiple=True,
+    help="Override generation parameters from the configuration file. "
+    "Format is parameter_name=parameter_value. For example: --config minify=false. Can be repeated.",
+)
+@click.option("--host", default=DEFAULT_HOST, show_default=True, help="Address to listen on")
+@click.option(
+    "--port", type=click.IntRange(0, 65535), default=DEFAULT_PORT, show_default=True, help="Port to listen on"
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_CACHE_SIZE,
+    show_default=True,
+    help="Number of rendered documents kept in memory",
+)
+def serve(
+    paths: Tuple[str, ...], config_file: TextIO, config: List[str], host: str, port: int, cache_size: int
+) -> None:
+    """Run a local HTTP server rendering the documentation of schemas on demand.
+
+    Schemas posted to /render are rendered, relative references in them are resolved from the working directory.
+    Each SCHEMA_FILE, which can also be a directory or a glob pattern like for --output-directory, is rendered at
+    /schemas/<path>. Add config=parameter_name=parameter_value query parameters to change the configuration of a
+    request. /metrics gives the counters of the server.
+    """
+    final_config = _get_final_config(
+        minify=True,
+        deprecated_from_description=False,
+        default_from_description=False,
+        expand_buttons=False,
+        copy_css=True,
+        copy_js=True,
+        link_to_reused_ref=True,
+        config=config_file,
+        config_parameters=config,
+    )
+    try:
+        schema_files = find_schema_files(list(paths))
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+    server = create_http_server(RenderServer(final_config, schema_files, cache_size), host, port)
+    print(f"Serving {len(schema_files)} schemas on http://{host}:{server.server_port}, press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+SUBCOMMANDS: Dict[str, click.Command] = {"serve": serve}
+
+
+def _unchanged_files(output_files: OutputFiles) -> str:
+    """Get the part of the CLI report about the files that were not written again"""
+    if not output_files.unchanged:
+        return ""
+    return f", {len(output_files.unchanged)} unchanged files were not rewritten"
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ from typing import Any, Union, TextIO, Dict, List, Optional
 import yaml
 from dataclasses_json import dataclass_json
 
+DEFAULT_TEMPLATES_DIRECTORY = os.path.join(os.path.dirname(__file__), "templates")
+
 
 @dataclass_json
 @dataclass
@@ -24,13 +26,26 @@ class GenerationConfiguration:
     expand_buttons: bool = False
     copy_css: bool = True
     copy_js: bool = True
+    assets: str = "cdn"
     link_to_reused_ref: bool = True
     recursive_detection_depth: int = 25
-    templates_directory: str = os.path.join(os.path.dirname(__file__), "templates")
+    templates_directory: str = DEFAULT_TEMPLATES_DIRECTORY
     template_name: str = "js"
+    renderer: str = "jinja"
     # markdown2 extra parameters can be added here: https://github.com/trentm/python-markdown2/wiki/Extras
     markdown_options: Any = None
     template_md_options: Any = None
+    template_js_options: Any = None
+    cache_fragments: bool = True
+    markdown_cache_size: int = 1024
+    highlight_cache_size: int = 1024
+    cache_directory: Optional[str] = None
+    pre_render_processes: int = 0
+    render_processes: int = 0
+    compress_output: bool = False
+    compression_level: int = 9
+    deterministic_output: bool = False
+    generation_time: Optional[int] = None
 
     def __post_init__(self) -> None:
         default_markdown_options = {
@@ -45,6 +60,15 @@ class GenerationConfiguration:
         default_template_md_options.update(self.template_md_options or {})
         self.template_md_options = default_template_md_options
 
+        default_template_js_options = {
+            "lazy_sections": False,
+            "search": False,
+            "runtime": "bootstrap",
+            "compact_ids": False,
+        }
+        default_template_js_options.update(self.template_js_options or {})
+        self.template_js_options = default_template_js_options
+
 
 CONFIG_DEPRECATION_MESSAGE = (
     "JSON Schema for humans: Please supply a GenerationConfiguration object instead of individual options"
@@ -3,7 +3,7 @@ import json
 import os
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple, Union
 
 import requests
 import yaml
@@ -18,10 +18,14 @@ def build_intermediate_representation(
     schema_path: Union[str, TextIO],
     config: GenerationConfiguration,
     loaded_schemas: Optional[Dict[str, Any]] = None,
+    used_schemas: Optional[Set[str]] = None,
 ) -> SchemaNode:
     """Build a SchemaNode object representing a JSON schema with added metadata to help rendering as a documentation.
 
     The representation will resolve references and generate HTML ids for elements
+
+    If given, the paths or URLs of the schema and of all the schemas it references are added to used_schemas, even
+    if they were already in loaded_schemas.
     """
     resolved_references: Dict[str, Dict[str, SchemaNode]] = defaultdict(dict)
 
@@ -211,6 +215,8 @@ def build_intermediate_representation(
 
         Loaded paths are kept in memory as to ensure never loading the same file twice
         """
+        if used_schemas is not None:
+            used_schemas.add(schema_uri)
         if schema_uri in _loaded_schemas:
             loaded_schema = _loaded_schemas[schema_uri]
         else:
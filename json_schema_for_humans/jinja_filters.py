@@ -1,5 +1,6 @@
+import os
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Any
 
 from pygments import highlight
@@ -16,6 +17,13 @@ SHORT_DESCRIPTION_NUMBER_OF_LINES = 8
 DEFAULT_PATTERN = r"(\[Default - `([^`]+)`\])"
 DEPRECATED_PATTERN = r"\[Deprecated"
 
+# Lexing and formatting hold no state between calls, the same instances can be used for all examples
+JSON_EXAMPLE_LEXER = JavascriptLexer()
+JSON_EXAMPLE_FORMATTER = HtmlFormatter()
+
+TIME_FORMAT = "%Y-%m-%d at %H:%M:%S %z"
+SOURCE_DATE_EPOCH_VARIABLE = "SOURCE_DATE_EPOCH"
+
 
 def is_combining(schema_node: SchemaNode) -> bool:
     """Test if a schema is one of the combining schema keyword"""
@@ -44,6 +52,20 @@ def is_deprecated_look_in_description(schema_node: SchemaNode) -> bool:
     return bool(re.match(DEPRECATED_PATTERN, schema_node.keywords[const.DESCRIPTION].literal))
 
 
+def is_rendering_own_properties(config, schema_node: SchemaNode) -> bool:
+    """Test. Check if the content of a node, including its properties, is rendered from the node itself and not from a
+    reference, a link or a combining keyword with a single element
+    """
+    if schema_node.should_be_a_link(config) or schema_node.refers_to:
+        return False
+
+    for combining_node in [schema_node.kw_all_of, schema_node.kw_any_of]:
+        if combining_node and len(combining_node.array_items) == 1:
+            return False
+
+    return True
+
+
 def get_required_properties(schema_node: SchemaNode) -> List[str]:
     required_properties = schema_node.keywords.get("required") or []
     if required_properties:
@@ -67,7 +89,12 @@ def get_first_property(schema_node: SchemaNode) -> Any:
 
 
 def get_undocumented_required_properties(schema_node: SchemaNode) -> List[str]:
-    return list(set(get_required_properties(schema_node)).difference(schema_node.properties.keys()))
+    """Filter. Get the required properties that are not in the properties of the node, in the order they are required"""
+    undocumented_required_properties = []
+    for property_name in get_required_properties(schema_node):
+        if property_name not in schema_node.properties and property_name not in undocumented_required_properties:
+            undocumented_required_properties.append(property_name)
+    return undocumented_required_properties
 
 
 def python_to_json(value: Any) -> Any:
@@ -236,9 +263,32 @@ def _get_description(schema_node: SchemaNode) -> str:
 
 
 def get_local_time() -> str:
-    return datetime.now(tz=reference.LocalTimezone()).strftime("%Y-%m-%d at %H:%M:%S %z")
+    return datetime.now(tz=reference.LocalTimezone()).strftime(TIME_FORMAT)
+
+
+def get_generation_time(config) -> str:
+    """Get the time of the generation written in the footer, empty if no time must be written.
+
+    The time can be fixed with config.generation_time or with the SOURCE_DATE_EPOCH environment variable (see
+    https://reproducible-builds.org/specs/source-date-epoch/), in seconds since the epoch, and is then written in UTC.
+    Otherwise, it is the current local time, or nothing with config.deterministic_output, so that the documentation
+    of a schema is the same each time it is generated.
+    """
+    fixed_time = config.generation_time
+    source_date_epoch = os.environ.get(SOURCE_DATE_EPOCH_VARIABLE)
+    if fixed_time is None and source_date_epoch:
+        try:
+            fixed_time = int(source_date_epoch)
+        except ValueError:
+            raise ValueError(
+                f"{SOURCE_DATE_EPOCH_VARIABLE} must be a number of seconds since the epoch, not {source_date_epoch!r}"
+            )
+    if fixed_time is not None:
+        return datetime.fromtimestamp(fixed_time, tz=timezone.utc).strftime(TIME_FORMAT)
+
+    return "" if config.deterministic_output else get_local_time()
 
 
 def highlight_json_example(example_text: str) -> str:
     """Filter. Return an highlighted version of the provided JSON text"""
-    return highlight(example_text, JavascriptLexer(), HtmlFormatter())
+    return highlight(example_text, JSON_EXAMPLE_LEXER, JSON_EXAMPLE_FORMATTER)
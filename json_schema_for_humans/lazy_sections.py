@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+from typing import Callable, Optional, Set
+
+from jinja2 import escape
+
+from json_schema_for_humans.compression import BROTLI_EXTENSION, GZIP_EXTENSION, get_sidecar_extensions
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.minification import minify_chunks
+from json_schema_for_humans.output_files import OutputFiles
+
+SECTIONS_DIRECTORY_SUFFIX = "_sections"
+
+
+def get_sections_directory(result_file_path: str) -> str:
+    """Directory where the lazy sections of the page at result_file_path are written, next to it"""
+    return os.path.splitext(result_file_path)[0] + SECTIONS_DIRECTORY_SUFFIX
+
+
+class LazySections:
+    """Sections of the js template that are collapsed when the page is loaded, written to their own files instead of
+    the page.
+
+    Each section is replaced in the page by an empty placeholder. schema_doc.js loads the file of a section when the
+    section is shown, or when an anchor link targets an element inside it. This keeps the size of the page, and the
+    time the browser takes to load it, about the same whatever the size of the schema.
+
+    Section files are scripts calling sectionLoaded() with the HTML of the section, since a page opened from the file
+    system is not allowed to fetch other files. Sections nested in a section are written to their own files too.
+    """
+
+    def __init__(self, config: GenerationConfiguration, minify: bool) -> None:
+        self.enabled = bool(
+            config.template_name == "js"
+            and config.templates_directory == DEFAULT_TEMPLATES_DIRECTORY
+            and config.template_js_options.get("lazy_sections")
+        )
+        self.config = config
+        self.minify = minify
+        self.written = 0
+        self._sections_directory: Optional[str] = None
+        self._output_files = OutputFiles()
+        # Names of the files written to the sections directory by the current render, with their compressed copies
+        self._file_names: Set[str] = set()
+
+    def start(self, sections_directory: Optional[str], output_files: Optional[OutputFiles] = None) -> None:
+        """Write the sections rendered from now on to sections_directory, which must be next to the rendered page.
+
+        If sections_directory is None, the sections are rendered in the page. Files that did not change are left as
+        they are. If given, output_files counts the written and unchanged files.
+        """
+        self.written = 0
+        self._sections_directory = None
+        self._output_files = output_files or OutputFiles()
+        self._file_names = set()
+        if not self.enabled:
+            return
+
+        if not sections_directory:
+            logging.info("Lazy sections are only written next to a result file, rendering them in the page")
+            return
+
+        os.makedirs(sections_directory, exist_ok=True)
+        self._sections_directory = sections_directory
+
+    def finish(self) -> None:
+        """Remove the files left in the sections directory by a previous render of the page, that may have had more
+        sections. Meant to be called once the whole documentation is rendered.
+        """
+        if not self._sections_directory:
+            return
+
+        for file_name in os.listdir(self._sections_directory):
+            section_file_name = file_name
+            for extension in [GZIP_EXTENSION, BROTLI_EXTENSION]:
+                if section_file_name.endswith(extension):
+                    section_file_name = section_file_name[: -len(extension)]
+            if section_file_name.endswith(".js") and file_name not in self._file_names:
+                os.remove(os.path.join(self._sections_directory, file_name))
+
+    def render(self, section_id: str, caller: Callable[[], str]) -> str:
+        """Render a section with caller and write it to its own file, returning the placeholder to put in the page.
+
+        section_id is the HTML id of the node documented by the section. Meant to be called from a template using
+        {% call %}.
+        """
+        if not self._sections_directory:
+            return caller()
+
+        html = caller()
+        if self.minify:
+            html = "".join(minify_chunks([html], "js"))
+
+        self.written += 1
+        file_name = f"{self.written}.js"
+        section_source = self.get_source(file_name)
+        self.write_file(file_name, f"sectionLoaded({json.dumps(section_source)}, {json.dumps(html)});\n")
+
+        return f'<div class="lazy-section" data-section="{escape(section_id)}" data-src="{section_source}"></div>'
+
+    @property
+    def is_writing(self) -> bool:
+        """Check if sections are written to their own files"""
+        return bool(self._sections_directory)
+
+    def get_source(self, file_name: str) -> str:
+        """URL of a file of the sections directory, relative to the page"""
+        return f"{os.path.basename(self._sections_directory)}/{file_name}"
+
+    def write_file(self, file_name: str, content: str) -> None:
+        """Write a file to the sections directory, along with its compressed copies if configured"""
+        # Imported here, generate uses this module
+        from json_schema_for_humans.generate import _write_result_file
+
+        _write_result_file(
+            os.path.join(self._sections_directory, file_name), [content], self.config, self._output_files
+        )
+        self._file_names.add(file_name)
+        if self.config.compress_output:
+            self._file_names.update(file_name + extension for extension in get_sidecar_extensions())
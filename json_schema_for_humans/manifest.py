@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.jinja_filters import SOURCE_DATE_EPOCH_VARIABLE
+from json_schema_for_humans.output_files import OutputFiles
+
+MANIFEST_FILE_NAME = ".schema_doc_manifest.json"
+PACKAGE_NAME = "json-schema-for-humans"
+UNKNOWN_VERSION = "unknown"
+# Options that only change how fast the documentation is generated, not what is generated
+PERFORMANCE_OPTIONS = [
+    "cache_fragments",
+    "markdown_cache_size",
+    "highlight_cache_size",
+    "cache_directory",
+    "pre_render_processes",
+    "render_processes",
+]
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def get_package_version() -> str:
+    """Get the installed version of json-schema-for-humans, unknown when running from sources"""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        # Python < 3.8
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution(PACKAGE_NAME).version
+        except pkg_resources.DistributionNotFound:
+            return UNKNOWN_VERSION
+
+    try:
+        return version(PACKAGE_NAME)
+    except PackageNotFoundError:
+        return UNKNOWN_VERSION
+
+
+def hash_file(path: str) -> Optional[str]:
+    """Get the SHA-256 of the content of a file, None if it does not exist"""
+    file_hash = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+                file_hash.update(block)
+    except FileNotFoundError:
+        return None
+    return file_hash.hexdigest()
+
+
+def get_config_fingerprint(config: GenerationConfiguration) -> str:
+    """Get a hash of the options of config that change the generated documentation"""
+    options = {name: value for name, value in config.to_dict().items() if name not in PERFORMANCE_OPTIONS}
+    # The time written in the footer can come from the environment
+    options[SOURCE_DATE_EPOCH_VARIABLE] = os.environ.get(SOURCE_DATE_EPOCH_VARIABLE)
+    return hashlib.sha256(json.dumps(options, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def get_template_hashes(config: GenerationConfiguration) -> Dict[str, str]:
+    """Get the hash of each file of the configured template, by path relative to the template directory"""
+    template_directory = os.path.join(config.templates_directory, config.template_name)
+    template_hashes = {}
+    for directory, _, file_names in os.walk(template_directory):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            template_hashes[os.path.relpath(path, template_directory).replace(os.path.sep, "/")] = hash_file(path)
+    return dict(sorted(template_hashes.items()))
+
+
+class BuildManifest:
+    """Record of what each result file in a directory was generated from, to only generate again the ones that are
+    out of date.
+
+    For each result file, the manifest keeps the hash of the result file, of the schema and of every schema it
+    references, of the files of the template, of the configuration and the version of json-schema-for-humans. A
+    result file is up to date if all of them are the same. Referenced URLs cannot be checked without downloading
+    them, results using them are never up to date.
+
+    The manifest is a JSON file in the directory, paths of result files are relative to it.
+    """
+
+    def __init__(self, directory: str, config: GenerationConfiguration) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_FILE_NAME)
+        self.build = {
+            "version": get_package_version(),
+            "config": get_config_fingerprint(config),
+            "template": get_template_hashes(config),
+        }
+        # Stored for each result, the details of the build are only stored once
+        self.build_fingerprint = hashlib.sha256(json.dumps(self.build, sort_keys=True).encode("utf-8")).hexdigest()
+        try:
+            with open(self.path, encoding="utf-8") as manifest_file:
+                self.results: Dict[str, Dict[str, Any]] = json.load(manifest_file)["results"]
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            self.results = {}
+
+    def _get_key(self, result_path: str) -> str:
+        return os.path.relpath(result_path, self.directory).replace(os.path.sep, "/")
+
+    def is_up_to_date(self, schema_path: str, result_path: str) -> bool:
+        """Check if the result file was generated from the same schema, referenced schemas, template and configuration
+        as they are now
+        """
+        entry = self.results.get(self._get_key(result_path))
+        if not entry or entry.get("schema") != schema_path or entry.get("build") != self.build_fingerprint:
+            return False
+        if hash_file(result_path) != entry.get("result"):
+            return False
+        return all(digest and hash_file(path) == digest for path, digest in entry.get("schemas", {}).items())
+
+    def record(self, schema_path: str, result_path: str, used_schemas: Iterable[str]) -> None:
+        """Record what result_path was just generated from"""
+        self.results[self._get_key(result_path)] = {
+            "schema": schema_path,
+            "build": self.build_fingerprint,
+            "result": hash_file(result_path),
+            "schemas": {path: None if path.startswith("http") else hash_file(path) for path in sorted(used_schemas)},
+        }
+
+    def get_used_schemas(self, result_path: str) -> List[str]:
+        """Get the schemas that result_path was generated from, when it was last recorded"""
+        return list(self.results.get(self._get_key(result_path), {}).get("schemas", {}))
+
+    def forget(self, result_path: str) -> None:
+        """Forget what result_path was generated from, when it could not be generated"""
+        self.results.pop(self._get_key(result_path), None)
+
+    def save(self, output_files: Optional[OutputFiles] = None) -> None:
+        """Write the manifest, if it changed"""
+        output_files = output_files or OutputFiles()
+        content = {"build": self.build, "results": dict(sorted(self.results.items()))}
+        output_files.write_text(self.path, json.dumps(content, indent=2) + "\n")
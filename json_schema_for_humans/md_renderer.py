@@ -0,0 +1,203 @@
+from typing import Iterator
+from urllib.parse import quote
+
+from json_schema_for_humans import jinja_filters
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.md_template import HeadingScope, MarkdownTemplate
+from json_schema_for_humans.schema_node import SchemaNode
+
+FOOTER_SEPARATOR = "-" * 124
+GENERATED_BY = "Generated using [json-schema-for-humans](https://github.com/coveooss/json-schema-for-humans)"
+
+
+class MarkdownRenderer:
+    """Render the documentation of a schema as Markdown in Python only, without Jinja.
+
+    The md template mostly glues together what the filters of MarkdownTemplate compute, so the same is done here
+    directly. Each method matches the macro of the md template with the same name and writes exactly the same text,
+    including whitespace: the output is identical to rendering the built-in md template.
+    """
+
+    def __init__(self, config: GenerationConfiguration) -> None:
+        self.config = config
+        self.md_template = MarkdownTemplate(config)
+        self.get_description = (
+            jinja_filters.get_description_remove_default
+            if config.default_from_description
+            else jinja_filters.get_description
+        )
+
+    def generate(self, schema: SchemaNode) -> Iterator[str]:
+        """Render the documentation of schema as a stream of chunks, like base.html"""
+        headings = self.md_template.plan_headings(schema)
+        yield headings.get("title").markdown + "\n\n"
+        yield self.md_template.get_toc() + "\n\n"
+        yield from self.content(schema, False, 0, False, headings)
+        generation_time = jinja_filters.get_generation_time(self.config)
+        footer = f"{GENERATED_BY} on {generation_time}" if generation_time else GENERATED_BY
+        yield f"\n\n{FOOTER_SEPARATOR}\n{footer}"
+
+    def content(
+        self, schema: SchemaNode, skip_headers: bool, depth: int, skip_required: bool, headings: HeadingScope
+    ) -> Iterator[str]:
+        md_template = self.md_template
+        yield "\n"
+        if not skip_headers:
+            title = schema.title
+            title_line = f"**Title:** {title}\n" if title else ""
+            type_info_table = md_template.generate_table(md_template.type_info_table(schema))
+            yield f"\n{title_line}\n{type_info_table}\n\n"
+            yield self.section_description(self.get_description(schema))
+        yield "\n"
+
+        if schema.should_be_a_link(self.config):
+            return
+        if schema.refers_to:
+            yield from self.content(schema.refers_to_merged, True, depth, skip_required, headings)
+            return
+
+        type_name = schema.type_name
+        if type_name == "object":
+            yield md_template.generate_table(md_template.properties_table(schema))
+        yield "    \n"
+
+        for title, combining_node in [
+            ("All of(Requirement)", schema.kw_all_of),
+            ("Any of(Option)", schema.kw_any_of),
+            ("One of(Option)", schema.kw_one_of),
+        ]:
+            if combining_node:
+                yield from self.tabbed_section(schema, title, combining_node, depth, headings)
+        if schema.kw_not:
+            yield from self.section_not(schema, depth, headings)
+        yield "\n"
+
+        if schema.kw_enum:
+            yield self.section_one_of(schema)
+        if schema.kw_const:
+            yield f"Specific value: `{jinja_filters.python_to_json(schema.kw_const.literal)}`"
+
+        if schema.has_conditional:
+            yield from self.section_conditional_subschema(schema, depth + 1, skip_required, headings)
+        yield "\n"
+
+        yield self.section_undocumented_required_properties(schema, headings)
+        yield "\n"
+        yield md_template.generate_table(md_template.restrictions_table(schema))
+
+        if type_name.startswith("array"):
+            yield from self.section_array(schema, depth, headings)
+        yield "\n"
+
+        examples = schema.examples
+        if examples:
+            yield self.section_examples(examples)
+        yield "\n"
+
+        if type_name == "object":
+            yield from self.section_properties_details(schema, depth, skip_required, headings)
+
+    @staticmethod
+    def section_description(description: str) -> str:
+        if not description:
+            return ""
+
+        return f"**Description:** {description}\n"
+
+    def tabbed_section(
+        self, schema: SchemaNode, title: str, current_node: SchemaNode, depth: int, headings: HeadingScope
+    ) -> Iterator[str]:
+        md_template = self.md_template
+        yield f"\n{md_template.generate_table(md_template.array_items(schema, title))}\n\n"
+        for node in current_node.array_items:
+            yield md_template.heading(headings, "option", node)
+            yield from self.content(node, False, depth + 1, True, md_template.nested_headings(headings, "option", node))
+
+    def section_not(self, schema: SchemaNode, depth: int, headings: HeadingScope) -> Iterator[str]:
+        yield self.md_template.heading(headings, "not") + "\n"
+        yield from self.content(
+            schema.kw_not, False, depth + 1, True, self.md_template.nested_headings(headings, "not")
+        )
+
+    @staticmethod
+    def section_one_of(schema: SchemaNode) -> str:
+        enum_choices = "".join(
+            f"* {jinja_filters.python_to_json(enum_choice.literal)}\n" for enum_choice in schema.kw_enum.array_items
+        )
+        return f"Must be one of:\n{enum_choices}"
+
+    def section_conditional_subschema(
+        self, schema: SchemaNode, depth: int, skip_required: bool, headings: HeadingScope
+    ) -> Iterator[str]:
+        if not schema.kw_if:
+            return
+
+        yield "\n"
+        for kind, node in [("then", schema.kw_then), ("else", schema.kw_else)]:
+            if node:
+                yield self.md_template.heading(headings, kind)
+                yield from self.content(
+                    node, False, depth, skip_required, self.md_template.nested_headings(headings, kind)
+                )
+
+    def section_undocumented_required_properties(self, schema: SchemaNode, headings: HeadingScope) -> str:
+        undocumented_required_properties = jinja_filters.get_undocumented_required_properties(schema)
+        if not undocumented_required_properties:
+            return ""
+
+        heading = self.md_template.heading(headings, "required")
+        required_properties = "".join(
+            f"* {required_property}\n" for required_property in undocumented_required_properties
+        )
+        return f"{heading}\n{required_properties}"
+
+    def section_array(self, schema: SchemaNode, depth: int, headings: HeadingScope) -> Iterator[str]:
+        md_template = self.md_template
+        yield md_template.generate_table(md_template.array_restrictions(schema)) + "\n\n"
+
+        if schema.kw_items:
+            yield md_template.generate_table(md_template.array_items_restrictions(schema)) + "\n\n"
+            for item in schema.kw_items:
+                yield md_template.heading(headings, "item", item)
+                yield from self.content(
+                    item, False, depth + 1, True, md_template.nested_headings(headings, "item", item)
+                )
+        yield "\n"
+
+        if schema.kw_contains and schema.kw_contains.literal != {}:
+            yield md_template.heading(headings, "contains") + "\n"
+            yield from self.content(
+                schema.kw_contains, False, depth + 1, True, md_template.nested_headings(headings, "contains")
+            )
+
+    @staticmethod
+    def section_examples(examples: list) -> str:
+        plural = "s" if len(examples) > 1 else ""
+        formatted_examples = "".join(f"```json\n{example}\n```\n" for example in examples)
+        return f"**Example{plural}:** \n\n{formatted_examples}"
+
+    def section_properties_details(
+        self, schema: SchemaNode, depth: int, skip_required: bool, headings: HeadingScope
+    ) -> Iterator[str]:
+        md_template = self.md_template
+        for sub_property in schema.iterate_properties:
+            if sub_property.is_additional_properties and not sub_property.is_additional_properties_schema:
+                continue
+
+            yield f"\n\n  \n{md_template.heading(headings, 'property', sub_property)}\n"
+            if sub_property.is_pattern_property:
+                property_name = sub_property.property_name
+                yield (
+                    "> All property whose name matches the regular expression \n"
+                    f"```{property_name}``` ([Test](https://regex101.com/?regex={quote(property_name, safe='/')}))\n"
+                    "must respect the following conditions\n"
+                )
+            yield "\n\n"
+            yield from self.content(
+                sub_property,
+                False,
+                depth + 1,
+                skip_required,
+                md_template.nested_headings(headings, "property", sub_property),
+            )
+            yield "\n"
@@ -1,4 +1,4 @@
-from typing import Dict, List, Union
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 from urllib.parse import quote_plus
 
 import jinja2
@@ -6,6 +6,55 @@ import jinja2
 from json_schema_for_humans import const, jinja_filters
 from json_schema_for_humans.schema_node import SchemaNode
 
+TABLE_ESCAPE_TRANSLATION = str.maketrans({"|": "\\|", "`": "\\`"})
+FIRST_LINE_TRANSLATION = str.maketrans({"`": "'"})
+PROPERTIES_TABLE_HEADER = ["Property", "Pattern", "Type", "Deprecated", "Definition", "Title/Description"]
+# Minimum number of dashes under a header cell for the table to be recognized, when cells are not padded
+COMPACT_TABLE_DELIMITER = "---"
+
+
+class PlannedHeading:
+    """A heading of the documentation, numbered by the pre-pass of MarkdownTemplate.plan_headings"""
+
+    def __init__(self, depth: int, heading_numbers: str, title: str, html_id: str) -> None:
+        self.depth = depth
+        self.heading_numbers = heading_numbers
+        self.title = title
+        self.html_id = html_id
+        # Headings of the content rendered under this heading
+        self.nested_headings = HeadingScope()
+
+    @property
+    def markdown(self) -> str:
+        """The heading line, with an anchor except for the title of the document"""
+        menu = "#" * (self.depth + 1)
+        if self.depth == 0:
+            return f"{menu} {self.title}"
+
+        return f'{menu} <a name="{self.html_id}"></a>{self.heading_numbers} {self.title}'
+
+    @property
+    def toc_menu(self) -> str:
+        return f"[{self.heading_numbers} {self.title}](#{self.html_id})"
+
+
+class HeadingScope:
+    """Headings written by one call of the content macro, by kind of section and node the section is about.
+
+    The same definition can be rendered at several places of the documentation, with different heading numbers each
+    time: each place has its own scope, given to the content macro along with the node to render.
+    """
+
+    def __init__(self) -> None:
+        self._headings: Dict[Tuple[str, Optional[SchemaNode]], PlannedHeading] = {}
+
+    def add(self, kind: str, node: Optional[SchemaNode], heading: PlannedHeading) -> PlannedHeading:
+        self._headings[(kind, node)] = heading
+        return heading
+
+    def get(self, kind: str, node: Optional[SchemaNode] = None) -> PlannedHeading:
+        return self._headings[(kind, node)]
+
 
 class MarkdownTemplate(object):
     def __init__(self, config):
@@ -18,7 +67,9 @@ class MarkdownTemplate(object):
         env.filters["md_get_numeric_minimum_restriction"] = self.get_numeric_minimum_restriction
         env.filters["md_get_numeric_maximum_restriction"] = self.get_numeric_maximum_restriction
         env.filters["md_escape_for_table"] = self.escape_for_table
+        env.filters["md_plan_headings"] = self.plan_headings
         env.filters["md_heading"] = self.heading
+        env.filters["md_nested_headings"] = self.nested_headings
         env.filters["md_properties_table"] = self.properties_table
         env.filters["md_type_info_table"] = self.type_info_table
         env.filters["md_array_restrictions"] = self.array_restrictions
@@ -81,12 +132,118 @@ class MarkdownTemplate(object):
 
     def escape_for_table(self, example_text: str) -> str:
         """Filter. escape characters('|', '`') in string to be inserted into markdown table"""
-        return example_text.translate(str.maketrans({"|": "\\|", "`": "\\`"}))
+        return example_text.translate(TABLE_ESCAPE_TRANSLATION)
 
-    def heading(self, title: str, depth: int, html_id: Union[bool, str] = False) -> str:
+    def plan_headings(self, schema: SchemaNode) -> HeadingScope:
         """
-        Filter. display heading menu, heading number automatically calculated
-        from previous heading and depth provided
+        Filter. Pre-pass walking the schema in the order the templates render it, to number all headings and build
+        the table of contents before rendering. Headings of the root content are in the returned scope, along with
+        the title of the document (kind "title")
+        """
+        self.headings = {}
+        self.auto_generated_heading = 0
+        self.toc = {}
+
+        headings = HeadingScope()
+        title = schema.keywords.get(const.KW_TITLE)
+        self._add_heading(headings, "title", None, title.literal if title else "Schema Docs", 0)
+        self._plan_content_headings(schema, headings, 0, False)
+
+        return headings
+
+    def _plan_content_headings(self, schema: SchemaNode, headings: HeadingScope, depth: int, skip_required: bool):
+        """Plan the headings written by the content macro for schema, in the same order"""
+        if schema.should_be_a_link(self.config):
+            return
+        if schema.refers_to:
+            self._plan_content_headings(schema.refers_to_merged, headings, depth, skip_required)
+            return
+
+        for combining_node in [schema.kw_all_of, schema.kw_any_of, schema.kw_one_of]:
+            if not combining_node:
+                continue
+            for node in combining_node.array_items:
+                title = f"{'Pattern' if node.is_pattern_property else ''} Property `{self.breadcrumbs(node)}`"
+                heading = self._add_heading(headings, "option", node, title, depth + 1, node.html_id)
+                self._plan_content_headings(node, heading.nested_headings, depth + 1, True)
+
+        if schema.kw_not:
+            heading = self._add_heading(headings, "not", None, "Must **not** be", depth + 1)
+            self._plan_content_headings(schema.kw_not, heading.nested_headings, depth + 1, True)
+
+        if schema.has_conditional and schema.kw_if:
+            first_property = jinja_filters.get_first_property(schema.kw_if)
+            property_name = ""
+            property_value = ""
+            if first_property:
+                property_name = self.escape_for_table(first_property.property_name)
+                if first_property.kw_const:
+                    property_value = jinja_filters.python_to_json(first_property.kw_const.literal)
+            for kind, node, title in [
+                ("then", schema.kw_then, f"If ({property_name} = {property_value})"),
+                ("else", schema.kw_else, f"Else (i.e.  {property_name} != {property_value})"),
+            ]:
+                if node:
+                    heading = self._add_heading(headings, kind, None, title, depth + 1)
+                    self._plan_content_headings(node, heading.nested_headings, depth + 1, skip_required)
+
+        if jinja_filters.get_undocumented_required_properties(schema):
+            self._add_heading(headings, "required", None, "The following properties are required", depth + 1)
+
+        if schema.type_name.startswith("array"):
+            for item in schema.kw_items or []:
+                heading = self._add_heading(headings, "item", item, self.breadcrumbs(item), depth + 1)
+                self._plan_content_headings(item, heading.nested_headings, depth + 1, True)
+            if schema.kw_contains and schema.kw_contains.literal != {}:
+                heading = self._add_heading(headings, "contains", None, "At least one of the items must be", depth + 1)
+                self._plan_content_headings(schema.kw_contains, heading.nested_headings, depth + 1, True)
+
+        if schema.type_name == "object":
+            for sub_property, is_required in iterate_properties_with_required(schema):
+                if sub_property.is_additional_properties and not sub_property.is_additional_properties_schema:
+                    continue
+                title = self._get_property_title(sub_property, is_required, skip_required)
+                heading = self._add_heading(headings, "property", sub_property, title, depth + 1, sub_property.html_id)
+                self._plan_content_headings(sub_property, heading.nested_headings, depth + 1, skip_required)
+
+    def _get_property_title(self, sub_property: SchemaNode, is_required: bool, skip_required: bool) -> str:
+        title = ""
+        if not skip_required and sub_property.property_name:
+            if is_required:
+                title += self.badge("Required", "blue")
+            else:
+                title += self.badge("Optional", "yellow")
+        is_deprecated = jinja_filters.deprecated(self.config, sub_property)
+        if is_deprecated:
+            title += "~~"
+        if sub_property.is_pattern_property:
+            title += "Pattern"
+        title += f" Property `{self.breadcrumbs(sub_property)}`"
+        if is_deprecated:
+            title += "~~"
+
+        return title.replace("\n", "")
+
+    def breadcrumbs(self, schema: SchemaNode) -> str:
+        """Path to the node from the root, or its name only if breadcrumbs are not shown, escaped for tables"""
+        if self.config.show_breadcrumbs:
+            breadcrumbs = " > ".join(str(node.name_for_breadcrumbs) for node in schema.nodes_from_root)
+        else:
+            breadcrumbs = str(schema.property_name)
+
+        return self.escape_for_table(breadcrumbs)
+
+    def _add_heading(
+        self,
+        headings: HeadingScope,
+        kind: str,
+        node: Optional[SchemaNode],
+        title: str,
+        depth: int,
+        html_id: Union[bool, str] = False,
+    ) -> PlannedHeading:
+        """
+        Number a new heading from the previous heading and the depth provided, and add it to the scope and the TOC
         """
         if not html_id:
             self.auto_generated_heading = self.auto_generated_heading + 1
@@ -113,24 +270,26 @@ class MarkdownTemplate(object):
             if curDepth != 0:
                 heading_numbers += f"{self.headings[curDepth]}."
 
-        # markdown menu depth
-        menu = "#" * (depth + 1)
-
-        # generate markdown title with anchor (except if depth 0)
-        if depth == 0:
-            menu += f" {title}"
-        else:
-            menu += f' <a name="{html_id}"></a>{heading_numbers} {title}'
+        heading = headings.add(kind, node, PlannedHeading(depth, heading_numbers, title, html_id))
 
         # store current heading in toc
-        toc_menu = f"[{heading_numbers} {title}](#{html_id})"
-        self.toc[heading_numbers] = {"depth": depth, "menu": toc_menu}
+        self.toc[heading_numbers] = {"depth": depth, "menu": heading.toc_menu}
 
-        return menu
+        return heading
+
+    @staticmethod
+    def heading(headings: HeadingScope, kind: str, node: Optional[SchemaNode] = None) -> str:
+        """Filter. Heading of a section, numbered by plan_headings"""
+        return headings.get(kind, node).markdown
+
+    @staticmethod
+    def nested_headings(headings: HeadingScope, kind: str, node: Optional[SchemaNode] = None) -> HeadingScope:
+        """Filter. Headings of the content rendered under the heading of a section"""
+        return headings.get(kind, node).nested_headings
 
     def get_toc(self) -> str:
         """
-        generate Table Of Content from the heading that has been generated
+        generate Table Of Content from the headings planned by plan_headings
         """
         toc_str = ""
 
@@ -173,11 +332,11 @@ class MarkdownTemplate(object):
         """
         Generate list of properties ready to be rendered by generate_table filter
         """
-        properties = []
-        for sub_property in schema.iterate_properties:
+        properties = [PROPERTIES_TABLE_HEADER]
+        for sub_property, is_required in iterate_properties_with_required(schema):
             line = []
             # property name
-            property_name = "+ " if sub_property.is_required_property else "- "
+            property_name = "+ " if is_required else "- "
             property_name += self.format_link(self.escape_for_table(sub_property.property_name), sub_property.html_id)
             line.append(property_name)
             # pattern
@@ -203,23 +362,21 @@ class MarkdownTemplate(object):
                 line.append("-")
 
             # title or description
-            description = jinja_filters.get_description(sub_property) or "-"
-            if sub_property.title:
-                description = sub_property.title
+            description = sub_property.title or jinja_filters.get_description(sub_property) or "-"
 
             line.append(self.escape_for_table(self.first_line_fixed(description, const.LINE_WIDTH)))
 
             properties.append(line)
 
-        if properties:
-            # add header
-            properties.insert(0, ["Property", "Pattern", "Type", "Deprecated", "Definition", "Title/Description"])
+        if len(properties) == 1:
+            # Only the header
+            return []
 
         return properties
 
     def first_line_fixed(self, example_text: str, max_length: int = 0) -> str:
         """first_line truncated but replace ` with ' to avoid to have only one ` to avoid issues with jekyll"""
-        return jinja_filters.first_line(example_text, max_length).translate(str.maketrans({"`": "'"}))
+        return jinja_filters.first_line(example_text, max_length).translate(FIRST_LINE_TRANSLATION)
 
     def type_info_table(self, schema: SchemaNode) -> List[List]:
         """
@@ -380,32 +537,54 @@ class MarkdownTemplate(object):
         Pretty print markdown table using list of rows.
         Assuming first row is header line.
         Ending with empty line for rendering bottom border.
-        Each column is str padded to max size string in the column.
+        Each column is str padded to max size string in the column, unless the compact_tables option is set.
         """
         if len(table) == 0:
             return ""
 
+        if self.config.template_md_options.get("compact_tables"):
+            number_of_columns = max(len(row) for row in table)
+            lines = ["".join(f"| {cell} " for cell in row) + "|" for row in table]
+            lines.insert(1, f"| {COMPACT_TABLE_DELIMITER} " * len(table[0]) + "|")
+            lines.append("|  " * number_of_columns + "|")
+            return "\n".join(lines) + "\n"
+
         # compute max length of each column
-        max_cell_length: Dict = {}
-        for idx_row, row in enumerate(table):
+        column_lengths: List[int] = []
+        for row in table:
             for idx_col, cell in enumerate(row):
-                max_cell_length[idx_col] = max(max_cell_length.get(idx_col, 0), len(cell))
+                if idx_col == len(column_lengths):
+                    column_lengths.append(len(cell))
+                elif len(cell) > column_lengths[idx_col]:
+                    column_lengths[idx_col] = len(cell)
 
         # generate md table
-        output = ""
-        for idx_row, row in enumerate(table):
-            for idx_col, cell in enumerate(row):
-                output += "| " + cell.ljust(max_cell_length[idx_col], " ") + " "
-            output += "|\n"
-            # add header line
-            if idx_row == 0:
-                for idx_col, cell in enumerate(row):
-                    output += "| " + "".ljust(max_cell_length[idx_col], "-") + " "
-                output += "|\n"
-
+        lines = [
+            "".join(f"| {cell.ljust(length)} " for cell, length in zip(row, column_lengths)) + "|" for row in table
+        ]
+        # add header line
+        lines.insert(1, "".join(f"| {'-' * length} " for _, length in zip(table[0], column_lengths)) + "|")
         # add last empty row
-        for cell in max_cell_length.values():
-            output += "| " + "".ljust(cell, " ") + " "
-        output += "|\n"
+        lines.append("".join(f"| {' ' * length} " for length in column_lengths) + "|")
+
+        return "\n".join(lines) + "\n"
+
+
+def iterate_properties_with_required(schema: SchemaNode) -> Iterator[Tuple[SchemaNode, bool]]:
+    """Iterate over the properties of a node along with whether each one is required by its parent.
+
+    Same as SchemaNode.is_required_property, but the required properties of the parent are only read once instead of
+    once per property, which matters for objects with many properties.
+    """
+    required_properties_by_parent: Dict[int, Set[str]] = {}
+    for sub_property in schema.iterate_properties:
+        parent = sub_property.parent
+        if not parent:
+            yield sub_property, False
+            continue
 
-        return output
+        required_properties = required_properties_by_parent.get(id(parent))
+        if required_properties is None:
+            required_properties = set(parent.required_properties)
+            required_properties_by_parent[id(parent)] = required_properties
+        yield sub_property, sub_property.property_name in required_properties
@@ -0,0 +1,267 @@
+import re
+from typing import Iterable, Iterator, List, Match, Optional, Pattern
+
+from jinja2.ext import Extension
+from jinja2.lexer import Token, TokenStream
+
+# Minimum number of characters to accumulate before handing rendered text to a minifier. Jinja yields a lot of tiny
+# chunks and feeding them one by one to the minifier is much slower than feeding larger blocks.
+MINIFY_BUFFER_SIZE = 64 * 1024
+
+CONTIGUOUS_EMPTY_LINES_PATTERN = re.compile(r"\n\s*\n")
+TRAILING_WHITESPACE_PATTERN = re.compile(r"\s+$")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# A comment is handled separately, a tag (or declaration), some text or a "<" that is not starting a tag
+HTML_TOKEN_PATTERN = re.compile(r"<[a-zA-Z/!?](?:[^>\"']|\"[^\"]*\"|'[^']*')*>|[^<]+|<")
+TAG_START_PATTERN = re.compile(r"<[a-zA-Z/!?]")
+TAG_NAME_PATTERN = re.compile(r"</?([a-zA-Z][a-zA-Z0-9-]*)")
+# Whitespace inside a tag, except in quoted attribute values (captured to be kept as-is, or unquoted)
+TAG_WHITESPACE_PATTERN = re.compile(r"(=?)(\"[^\"]*\"|'[^']*')|\s+")
+# Attribute values that can be written without quotes, as htmlmin decides
+UNQUOTED_ATTRIBUTE_VALUE_PATTERN = re.compile(r"[^\x20\t\n\f\r\"'=<>`]+")
+HTML_WHITESPACE = "\x20\t\n\f\r"
+PRESERVED_WHITESPACE_TAGS = {"pre", "textarea"}
+# Elements that cannot have content, the "/" ending their tag is ignored by browsers
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+RAW_TEXT_TAGS = {"script", "style"}
+
+
+class BlankLinesCollapser:
+    """Incrementally remove multiple contiguous empty lines from a text received in chunks.
+
+    The result is the same as running `re.sub(r"\\n\\s*\\n", "\\n\\n", text)` on the whole text: trailing whitespace of a
+    chunk is held back until we know where the whitespace run ends.
+    """
+
+    def __init__(self) -> None:
+        self._pending = ""
+
+    def input(self, chunk: str) -> str:
+        """Feed a chunk of text and return the part of the result that is final"""
+        text = self._pending + chunk
+        trailing_whitespace = TRAILING_WHITESPACE_PATTERN.search(text)
+        if trailing_whitespace:
+            self._pending = text[trailing_whitespace.start() :]
+            text = text[: trailing_whitespace.start()]
+        else:
+            self._pending = ""
+
+        return CONTIGUOUS_EMPTY_LINES_PATTERN.sub("\n\n", text)
+
+    def finalize(self) -> str:
+        """Return what is left of the result once all chunks have been received"""
+        text = CONTIGUOUS_EMPTY_LINES_PATTERN.sub("\n\n", self._pending)
+        self._pending = ""
+        return text
+
+
+class HtmlMinifier:
+    """Incrementally minify an HTML document received in chunks.
+
+    Runs of whitespace are replaced by a single space, except inside <pre>, <textarea>, <script> and <style> elements
+    and inside attribute values. Whitespace-only text is removed from <head> and after the doctype, and the title is
+    trimmed. Quotes are removed from attribute values that do not need them, empty values are removed, and so is the
+    "/" ending the tags of void elements. This is what htmlmin does with its default options, but the tags are
+    rewritten in place instead of being parsed and rebuilt, which is where most of the time was spent.
+
+    State is kept between chunks: the end of a chunk that could be continued by the next one (text, an unfinished tag
+    or comment) is only processed once more is received or when finalizing.
+    """
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._preserve_whitespace_depth = 0
+        self._raw_text_end: Optional[Pattern] = None
+        self._in_head = False
+        self._in_title = False
+        self._after_doctype = False
+        self._at_document_start = True
+        self._leading_whitespace = False
+        self._last_character = ""
+
+    def input(self, chunk: str) -> str:
+        """Feed a chunk of HTML and return the part of the minified result that is final"""
+        return self._minify(self._pending + chunk, final=False)
+
+    def finalize(self) -> str:
+        """Return what is left of the minified result once all chunks have been received"""
+        return self._minify(self._pending, final=True)
+
+    def _minify(self, text: str, final: bool) -> str:
+        output: List[str] = []
+        position = 0
+        length = len(text)
+        while position < length:
+            if self._raw_text_end:
+                # Inside <script> or <style>, everything is kept as-is up to the closing tag
+                raw_text_end = self._raw_text_end.search(text, position)
+                if not raw_text_end:
+                    # Keep enough to find the closing tag if it is cut in two by the end of the chunk
+                    keep_from = length if final else max(position, length - len("</script"))
+                    output.append(text[position:keep_from])
+                    position = keep_from
+                    break
+                if raw_text_end.start() > position:
+                    self._last_character = text[raw_text_end.start() - 1]
+                output.append(text[position : raw_text_end.start()])
+                position = raw_text_end.start()
+                self._raw_text_end = None
+
+            if text.startswith("<!--", position):
+                comment_end = text.find("-->", position)
+                if comment_end == -1:
+                    if not final:
+                        break
+                    comment_end = length
+                token = text[position : comment_end + 3]
+                position += len(token)
+                output.append(token)
+                self._last_character = token[-1]
+                continue
+
+            match = HTML_TOKEN_PATTERN.match(text, position)
+            token = match.group()
+            is_tag = len(token) > 1 and token[0] == "<"
+            if not final and not is_tag and (match.end() == length or TAG_START_PATTERN.match(text, position)):
+                # Either text that may continue in the next chunk or a tag that is not finished yet
+                break
+            position = match.end()
+
+            if is_tag:
+                output.append(self._minify_tag(token))
+            else:
+                output.append(self._minify_text(token))
+
+        self._pending = text[position:]
+        return "".join(output)
+
+    def _minify_tag(self, tag: str) -> str:
+        tag_name_match = TAG_NAME_PATTERN.match(tag)
+        tag_name = tag_name_match.group(1).lower() if tag_name_match else ""
+        is_closing_tag = tag.startswith("</")
+        is_declaration = tag.startswith("<!")
+
+        if is_declaration:
+            self._after_doctype = True
+        else:
+            self._after_doctype = False
+
+        if tag_name in PRESERVED_WHITESPACE_TAGS:
+            self._preserve_whitespace_depth += -1 if is_closing_tag else 1
+        elif tag_name in RAW_TEXT_TAGS and not is_closing_tag and not tag.endswith("/>"):
+            self._raw_text_end = re.compile(f"</{tag_name}", re.IGNORECASE)
+        elif tag_name == "head":
+            self._in_head = not is_closing_tag
+        elif tag_name == "title":
+            self._in_title = self._in_head and not is_closing_tag
+
+        if tag_name in VOID_ELEMENTS and tag.endswith("/>"):
+            # Unless the "/" ends an unquoted attribute value
+            tag_start = tag[:-2]
+            if tag_start[-1] in f"{HTML_WHITESPACE}\"'" or tag_start.lower() == f"<{tag_name}":
+                tag = tag_start + ">"
+
+        if is_declaration or is_closing_tag:
+            minified_tag = TAG_WHITESPACE_PATTERN.sub(lambda m: m.group(0) if m.group(2) else " ", tag)
+        else:
+            minified_tag = TAG_WHITESPACE_PATTERN.sub(_minify_tag_part, tag)
+        if minified_tag.endswith(" >"):
+            minified_tag = minified_tag[:-2] + ">"
+
+        if self._leading_whitespace and not is_declaration:
+            # Whitespace at the start of the document is only removed before the doctype
+            minified_tag = " " + minified_tag
+        self._leading_whitespace = False
+        self._at_document_start = False
+        self._last_character = ">"
+
+        return minified_tag
+
+    def _minify_text(self, text: str) -> str:
+        if self._preserve_whitespace_depth > 0:
+            self._last_character = text[-1]
+            return text
+
+        text = WHITESPACE_PATTERN.sub(" ", text)
+        if text == " ":
+            if self._at_document_start:
+                self._leading_whitespace = True
+                return ""
+            if self._in_head or self._after_doctype:
+                return ""
+        if self._in_title:
+            text = text.strip()
+        elif text[0] == " " and self._last_character == " ":
+            text = text[1:]
+        self._at_document_start = False
+        self._last_character = text[-1:] or self._last_character
+
+        return text
+
+
+def _minify_tag_part(match: Match) -> str:
+    """Collapse whitespace in a tag, or remove the quotes of an attribute value when they are not needed"""
+    equals_sign, quoted_value = match.group(1), match.group(2)
+    if not quoted_value:
+        return " "
+
+    value = quoted_value[1:-1]
+    next_character = match.string[match.end() : match.end() + 1]
+    # A value followed by "/" or directly by another attribute would take them in without quotes
+    if not equals_sign or next_character not in f"{HTML_WHITESPACE}>":
+        return match.group(0)
+    if not value:
+        return ""
+    if UNQUOTED_ATTRIBUTE_VALUE_PATTERN.fullmatch(value):
+        return f"={value}"
+    return match.group(0)
+
+
+def buffer_chunks(chunks: Iterable[str], buffer_size: int = MINIFY_BUFFER_SIZE) -> Iterator[str]:
+    """Group small chunks together so that each yielded chunk is at least buffer_size characters long (except the
+    last one)
+    """
+    buffer = []
+    buffered_size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered_size += len(chunk)
+        if buffered_size >= buffer_size:
+            yield "".join(buffer)
+            buffer = []
+            buffered_size = 0
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def minify_chunks(chunks: Iterable[str], template_name: str) -> Iterator[str]:
+    """Minify a document received in chunks, yielding the minified result as it becomes available.
+
+    Markdown documents only get their multiple contiguous empty lines removed, other documents are minified as HTML.
+    """
+    minifier = BlankLinesCollapser() if template_name == "md" else HtmlMinifier()
+    for chunk in buffer_chunks(chunks):
+        minified = minifier.input(chunk)
+        if minified:
+            yield minified
+
+    minified = minifier.finalize()
+    if minified:
+        yield minified
+
+
+class WhitespaceCollapseExtension(Extension):
+    """Jinja extension collapsing the whitespace of the static parts of HTML templates when they are compiled.
+
+    The HTML minifier replaces any run of whitespace by a single space outside of tags like <pre>, which the built-in
+    templates do not contain, so doing it ahead of time does not change the minified result. It greatly reduces the
+    size of the rendered document before minification, and the time spent minifying it.
+    """
+
+    def filter_stream(self, stream: TokenStream) -> Iterator[Token]:
+        for token in stream:
+            if token.type == "data":
+                token = Token(token.lineno, "data", WHITESPACE_PATTERN.sub(" ", token.value))
+            yield token
@@ -0,0 +1,78 @@
+from typing import Dict, Optional
+
+import jinja2
+
+from json_schema_for_humans import jinja_filters
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.schema_node import SchemaNode
+
+INDEX_PAGE_NAME = "index"
+
+
+def get_index_file_name(config: GenerationConfiguration) -> str:
+    """Name of the file of the index page when writing the documentation as several pages"""
+    extension = "md" if config.template_name == "md" else "html"
+    return f"{INDEX_PAGE_NAME}.{extension}"
+
+
+def is_splitting_in_pages_supported(config: GenerationConfiguration) -> bool:
+    """Check if the configured template can render a page for a single root property.
+
+    Only the built-in HTML templates can.
+    """
+    return config.template_name != "md" and config.templates_directory == DEFAULT_TEMPLATES_DIRECTORY
+
+
+def get_pages(config: GenerationConfiguration, schema_node: SchemaNode) -> Dict[str, str]:
+    """Map the HTML id of each root property of schema_node to the name of the file of its page, in order.
+
+    Pages are keyed by HTML id and not by node: a referenced definition is built with the HTML id of the first property
+    using it, so the nodes under it can still be found in the page of that property.
+    """
+    if not is_splitting_in_pages_supported(config):
+        return {}
+
+    if not jinja_filters.is_rendering_own_properties(config, schema_node):
+        # The root properties are rendered by the content of a referenced node, keep everything in the index
+        return {}
+
+    pages: Dict[str, str] = {}
+    used_page_names = {INDEX_PAGE_NAME}
+    for sub_property in schema_node.iterate_properties:
+        html_id = sub_property.html_id
+        if html_id in pages:
+            # Different property names can be escaped to the same HTML id, they are documented in the same page
+            continue
+
+        # Do not let pages overwrite each other on case-insensitive file systems
+        page_name = html_id
+        suffix = 1
+        while page_name.lower() in used_page_names:
+            suffix += 1
+            page_name = f"{html_id}_{suffix}"
+        used_page_names.add(page_name.lower())
+        pages[html_id] = f"{page_name}.html"
+
+    return pages
+
+
+def get_page_url(pages: Optional[Dict[str, str]], node: SchemaNode) -> str:
+    """Get the file of the page documenting node, to be put before "#" in links to it.
+
+    Return an empty string if the documentation is a single page. Otherwise, the file is always returned, even for
+    links inside the same page, so that a rendered fragment is the same whatever the page it is rendered in.
+    """
+    if not pages:
+        return ""
+
+    nodes_from_root = list(node.nodes_from_root)
+    if len(nodes_from_root) < 2:
+        return f"{INDEX_PAGE_NAME}.html"
+
+    return pages.get(nodes_from_root[1].html_id, f"{INDEX_PAGE_NAME}.html")
+
+
+@jinja2.contextfunction
+def page_url(context: jinja2.runtime.Context, node: SchemaNode) -> str:
+    """Jinja global. Get the file of the page documenting node, from the pages being rendered, if any"""
+    return get_page_url(context.get("pages"), node)
@@ -0,0 +1,124 @@
+import hashlib
+import os
+from typing import Dict, List, Optional
+
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.output_files import OutputFiles
+
+ASSETS_CDN = "cdn"
+ASSETS_INLINE = "inline"
+ASSETS_BUNDLE = "bundle"
+ASSETS_MODES = [ASSETS_CDN, ASSETS_INLINE, ASSETS_BUNDLE]
+
+# Trimmed jQuery and Bootstrap files in the template directories, written by scripts/vendor_assets.py
+VENDOR_CSS_FILE_NAME = "vendor.min.css"
+VENDOR_JS_FILE_NAME = "vendor.min.js"
+OWN_CSS_FILE_NAME = "schema_doc.css"
+OWN_JS_FILE_NAME = "schema_doc.min.js"
+BUNDLE_FILE_PREFIX = "schema_doc"
+# Length of the hash of the content put in the name of bundle files
+BUNDLE_HASH_LENGTH = 10
+
+
+class OfflineAssets:
+    """CSS and JS needed by a page of the js or flat template, taken from the package instead of CDNs.
+
+    With the "inline" mode, they are put in the page, that can then be opened without any other file. With the "bundle"
+    mode, they are written to one CSS and one JS file next to the page, named after a hash of their content so that they
+    can be cached forever. In both cases only the vendored assets are used: Bootstrap trimmed to the rules used by the
+    template and jQuery without ajax nor effects. Google Fonts and Font Awesome are not included, the pages fall back
+    to the fonts of the system.
+    """
+
+    def __init__(self, config: GenerationConfiguration) -> None:
+        if config.assets not in ASSETS_MODES:
+            raise ValueError(f"Unknown assets mode {config.assets}, must be one of {', '.join(ASSETS_MODES)}")
+
+        self.mode = config.assets
+        self.enabled = bool(
+            config.assets != ASSETS_CDN
+            and config.template_name != "md"
+            and config.templates_directory == DEFAULT_TEMPLATES_DIRECTORY
+        )
+        self.template_directory = os.path.join(config.templates_directory, config.template_name)
+        self.js_file_names = [VENDOR_JS_FILE_NAME, OWN_JS_FILE_NAME]
+        if config.template_js_options.get("runtime") == "vanilla":
+            # schema_doc.js handles sections and tabs itself, jQuery and Bootstrap JS are not needed
+            self.js_file_names = [OWN_JS_FILE_NAME]
+        self._contents: Optional[Dict[str, str]] = None
+
+    def get_contents(self) -> Dict[str, str]:
+        """Get the content of the assets of the template, by file extension.
+
+        The vendored file comes first, so that the rules of schema_doc.css override the ones of Bootstrap.
+        """
+        if self._contents is None:
+            self._contents = {}
+            for extension, file_names in [
+                (".css", [VENDOR_CSS_FILE_NAME, OWN_CSS_FILE_NAME]),
+                (".js", self.js_file_names),
+            ]:
+                contents = self._read_files(file_names)
+                if contents:
+                    self._contents[extension] = "\n".join(contents)
+
+        return self._contents
+
+    def _read_files(self, file_names: List[str]) -> List[str]:
+        contents = []
+        for file_name in file_names:
+            file_path = os.path.join(self.template_directory, file_name)
+            if os.path.exists(file_path):
+                with open(file_path, encoding="utf-8") as asset_file:
+                    contents.append(asset_file.read().strip())
+        return contents
+
+    def get_bundle_file_names(self) -> Dict[str, str]:
+        """Get the name of each file of the bundle, by file extension"""
+        bundle_file_names = {}
+        for extension, content in self.get_contents().items():
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:BUNDLE_HASH_LENGTH]
+            bundle_file_names[extension] = f"{BUNDLE_FILE_PREFIX}.{content_hash}{extension}"
+        return bundle_file_names
+
+    def render(self) -> str:
+        """Get the HTML including the assets in the page. Meant to be called from a template."""
+        if not self.enabled:
+            return ""
+
+        contents = self.get_contents()
+        if self.mode == ASSETS_INLINE:
+            html = []
+            if ".css" in contents:
+                html.append(f"<style>{contents['.css']}</style>")
+            if ".js" in contents:
+                # A script cannot contain "</script", the escaped slash means the same in JS strings and regexps
+                script = contents[".js"].replace("</script", "<\\/script")
+                html.append(f"<script>{script}</script>")
+            return "".join(html)
+
+        bundle_file_names = self.get_bundle_file_names()
+        html = []
+        if ".css" in bundle_file_names:
+            html.append(f'<link rel="stylesheet" type="text/css" href="{bundle_file_names[".css"]}">')
+        if ".js" in bundle_file_names:
+            html.append(f'<script src="{bundle_file_names[".js"]}"></script>')
+        return "".join(html)
+
+    def write_bundle(self, target_directory: str, output_files: Optional[OutputFiles] = None) -> List[str]:
+        """Write the files of the bundle to target_directory, if they are not there yet. Return the names of the files"""
+        if not self.enabled or self.mode != ASSETS_BUNDLE:
+            return []
+
+        output_files = output_files or OutputFiles()
+        contents = self.get_contents()
+        bundle_file_names = self.get_bundle_file_names()
+        for extension, file_name in bundle_file_names.items():
+            file_path = os.path.join(target_directory, file_name)
+            # The name of the file changes with its content, an existing file is already up to date
+            if os.path.exists(file_path):
+                output_files.add(file_path, False)
+            else:
+                output_files.write_text(file_path, contents[extension])
+
+        return list(bundle_file_names.values())
@@ -0,0 +1,125 @@
+import os
+import secrets
+import shutil
+from typing import IO, List, Optional, Tuple
+
+# Compare files by blocks of this size, to not load big files in memory
+COMPARE_BLOCK_SIZE = 1024 * 1024
+# Random names tried for a temporary file before giving up
+TEMPORARY_FILE_ATTEMPTS = 100
+
+
+def has_same_content(path: str, other_path: str) -> bool:
+    """Check if two files exist and have the same content"""
+    try:
+        if os.path.getsize(path) != os.path.getsize(other_path):
+            return False
+        with open(path, "rb") as file, open(other_path, "rb") as other_file:
+            while True:
+                block = file.read(COMPARE_BLOCK_SIZE)
+                if block != other_file.read(COMPARE_BLOCK_SIZE):
+                    return False
+                if not block:
+                    return True
+    except FileNotFoundError:
+        return False
+
+
+def _create_temporary_file(path: str) -> Tuple[int, str]:
+    """Create a temporary file next to path, with the permissions open() would give to a new file: the system applies
+    the umask, which is not changed, other threads may be creating files.
+    """
+    directory = os.path.dirname(path) or "."
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(TEMPORARY_FILE_ATTEMPTS):
+        temporary_path = os.path.join(directory, f".{os.path.basename(path)}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(temporary_path, flags, 0o666), temporary_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No free temporary file name next to {path}")
+
+
+class OutputFile:
+    """A file being written. The content goes to a temporary file next to it, that replaces the file when closed, only
+    if the content changed.
+
+    Readers of the file never see it half written, and a file that did not change keeps its modification time, so
+    that tools syncing or serving the output do not see it as new.
+    """
+
+    def __init__(self, path: str, mode: str = "w", output_files: Optional["OutputFiles"] = None) -> None:
+        self.path = path
+        self.output_files = output_files
+        self.changed = False
+        file_descriptor, self._temporary_path = _create_temporary_file(path)
+        self._file: IO = os.fdopen(file_descriptor, mode, encoding=None if "b" in mode else "utf-8")
+
+    def write(self, data) -> None:
+        self._file.write(data)
+
+    def close(self) -> bool:
+        """Replace the file with the new content if it changed. Return if the file was written"""
+        self._file.close()
+        self.changed = not has_same_content(self._temporary_path, self.path)
+        if self.changed:
+            try:
+                # The new version keeps the permissions of the file it replaces
+                os.chmod(self._temporary_path, os.stat(self.path).st_mode & 0o777)
+            except FileNotFoundError:
+                pass
+            os.replace(self._temporary_path, self.path)
+        else:
+            os.remove(self._temporary_path)
+        if self.output_files:
+            self.output_files.add(self.path, self.changed)
+        return self.changed
+
+    def discard(self) -> None:
+        """Leave the file as it was, the new content is incomplete"""
+        self._file.close()
+        os.remove(self._temporary_path)
+
+    def __enter__(self) -> "OutputFile":
+        return self
+
+    def __exit__(self, exception_type, *_) -> None:
+        if exception_type:
+            self.discard()
+        else:
+            self.close()
+
+
+class OutputFiles:
+    """The files written by one or several generations. Files whose content did not change are not written again,
+    they are counted as unchanged instead.
+    """
+
+    def __init__(self) -> None:
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+
+    def open(self, path: str, mode: str = "w") -> OutputFile:
+        """Open a file to write, in text mode with UTF-8 by default"""
+        return OutputFile(path, mode, self)
+
+    def add(self, path: str, written: bool) -> None:
+        """Count a file as written or as unchanged"""
+        (self.written if written else self.unchanged).append(path)
+
+    def write_text(self, path: str, content: str) -> bool:
+        """Write the content of a file, return if it was written"""
+        output_file = self.open(path)
+        with output_file:
+            output_file.write(content)
+        return output_file.changed
+
+    def copy(self, source_path: str, target_path: str) -> bool:
+        """Copy a file if the target is missing or different, return if it was copied"""
+        if has_same_content(source_path, target_path):
+            self.add(target_path, False)
+            return False
+
+        with open(source_path, "rb") as source_file, self.open(target_path, "wb") as output_file:
+            shutil.copyfileobj(source_file, output_file)
+        return True
@@ -0,0 +1,132 @@
+import dataclasses
+import logging
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import jinja2
+
+from json_schema_for_humans import jinja_filters
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.schema_node import SchemaNode
+
+# Renders one root property exactly like the loop over root properties of base.html
+PROPERTY_TEMPLATE = (
+    "{%- from 'content.html' import content with context -%}"
+    "{%- from 'section_properties.html' import section_properties with context -%}"
+    "{{ section_properties(schema_node) }}"
+)
+
+
+class ParallelPropertiesRenderer:
+    """Render the properties of the root of a schema in a pool of processes, while the main process renders the rest.
+
+    Each root property is an independent subtree of the documentation: its HTML ids and links only depend on the
+    intermediate representation, so rendering it in another process gives exactly the same fragment. The intermediate
+    representation is pickled once and sent to each worker when it starts, then the workers only receive the position
+    of the property to render. base.html gets the fragments, in order, with {% call %} on render().
+
+    Only the built-in HTML templates are supported, the Markdown template does not render the root properties on
+    their own.
+    """
+
+    def __init__(self, config: GenerationConfiguration, minify: bool) -> None:
+        self.config = config
+        self.minify = minify
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[SchemaNode, "Future[str]"] = {}
+
+    def _can_render(self, schema_node: SchemaNode, properties: List[SchemaNode]) -> bool:
+        if self.config.render_processes <= 1 or len(properties) < 2:
+            return False
+
+        if self.config.template_name == "md" or self.config.templates_directory != DEFAULT_TEMPLATES_DIRECTORY:
+            logging.info("Rendering in parallel is only supported by the built-in js and flat templates")
+            return False
+
+        if self.config.template_js_options.get("lazy_sections"):
+            logging.info("Rendering in parallel is not supported with lazy sections")
+            return False
+
+        # Otherwise the properties are not rendered by base.html but by the content of a referenced node
+        return jinja_filters.is_rendering_own_properties(self.config, schema_node)
+
+    def start(self, schema_node: SchemaNode, pages: Optional[Dict[str, str]] = None) -> None:
+        """Start rendering the root properties of schema_node in the background, if enabled.
+
+        pages is given when the documentation is split in several pages, for the links between them.
+        """
+        self.close()
+        properties = list(schema_node.iterate_properties)
+        if not self._can_render(schema_node, properties):
+            return
+
+        try:
+            pickled_schema_node = pickle.dumps(schema_node)
+        except RecursionError:
+            logging.info("The schema is too deeply nested to be sent to other processes, rendering it in one process")
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.config.render_processes,
+            initializer=_initialize_worker,
+            initargs=(self.config, self.minify, pickled_schema_node, pages),
+        )
+        for property_index, property_node in enumerate(properties):
+            self._futures[property_node] = self._executor.submit(_render_property_in_worker, property_index)
+
+    def render(self, schema_node: SchemaNode, caller: Callable[[], str]) -> str:
+        """Return the fragment rendered in a worker for schema_node, or render it with caller if there is none.
+
+        Meant to be called from a template using {% call %}.
+        """
+        future = self._futures.pop(schema_node, None)
+        if future is None:
+            return caller()
+
+        fragment = future.result()
+        if not self._futures:
+            self.close()
+
+        return fragment
+
+    def close(self) -> None:
+        """Stop the workers, cancelling the fragments that were not used"""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+
+_worker_config: Optional[GenerationConfiguration] = None
+_worker_template: Optional[jinja2.Template] = None
+_worker_schema_node: Optional[SchemaNode] = None
+_worker_properties: List[SchemaNode] = []
+_worker_pages: Optional[Dict[str, str]] = None
+
+
+def _initialize_worker(
+    config: GenerationConfiguration, minify: bool, pickled_schema_node: bytes, pages: Optional[Dict[str, str]]
+) -> None:
+    # Imported here, generate uses this module
+    from json_schema_for_humans.generate import _get_template
+
+    global _worker_config, _worker_template, _worker_schema_node, _worker_properties, _worker_pages
+    _worker_config = dataclasses.replace(config, render_processes=0, pre_render_processes=0)
+    environment = _get_template(_worker_config, minify).environment
+    _worker_template = environment.from_string(PROPERTY_TEMPLATE)
+    _worker_schema_node = pickle.loads(pickled_schema_node)
+    environment.compact_ids.start(_worker_schema_node)
+    _worker_properties = list(_worker_schema_node.iterate_properties)
+    _worker_pages = pages
+
+
+def _render_property_in_worker(property_index: int) -> str:
+    return _worker_template.render(
+        schema=_worker_schema_node,
+        schema_node=_worker_properties[property_index],
+        config=_worker_config,
+        pages=_worker_pages,
+    )
@@ -0,0 +1,94 @@
+import json
+from typing import Callable, Dict, List, Optional
+
+from json_schema_for_humans import jinja_filters
+from json_schema_for_humans.caching import iterate_schema_nodes
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.lazy_sections import LazySections
+from json_schema_for_humans.multi_page import get_page_url
+from json_schema_for_humans.schema_node import SchemaNode
+
+SEARCH_INDEX_FILE_NAME = "search_index.js"
+# Descriptions are only indexed up to this length, to keep the index small
+MAX_DESCRIPTION_LENGTH = 100
+
+
+def build_search_index(
+    schema_node: SchemaNode, get_description: Callable[[SchemaNode], str], pages: Optional[Dict[str, str]] = None
+) -> List[List[str]]:
+    """List the properties documented for schema_node, to search them from the page.
+
+    Each entry is a list [link target, property name, path, title, first line of the description]. The path is the one
+    displayed in the breadcrumbs, which for the properties of a referenced definition goes through the property
+    using it, not through the definitions. Entries are sorted by path.
+    """
+    entries: Dict[str, List[str]] = {}
+    for node in iterate_schema_nodes(schema_node):
+        # Definitions are documented with the HTML ids of the node displaying them, there can be several nodes per id
+        if not node.is_a_property_node or node.html_id in entries:
+            continue
+
+        path = " > ".join(parent.name_for_breadcrumbs for parent in node.nodes_from_root)
+        description = get_description(node)
+        entries[node.html_id] = [
+            f"{get_page_url(pages, node)}#{node.html_id}",
+            node.property_display_name or "",
+            path,
+            node.title or "",
+            jinja_filters.first_line(description, MAX_DESCRIPTION_LENGTH) if description else "",
+        ]
+
+    return sorted(entries.values(), key=lambda entry: entry[2])
+
+
+class SearchIndex:
+    """Index of the properties of the schema being rendered, used by the search box of the js template.
+
+    The index is built from the intermediate representation and not from the rendered page, so that the page does not
+    need to be scanned, and so that properties in sections that are not loaded yet can be found. It is inlined in the
+    page as JSON, or written to its own file along with the lazy sections if they are enabled, so that it does not
+    make the page bigger.
+    """
+
+    def __init__(self, config: GenerationConfiguration, lazy_sections: LazySections) -> None:
+        self.enabled = bool(
+            config.template_name == "js"
+            and config.templates_directory == DEFAULT_TEMPLATES_DIRECTORY
+            and config.template_js_options.get("search")
+        )
+        self.get_description = (
+            jinja_filters.get_description_remove_default
+            if config.default_from_description
+            else jinja_filters.get_description
+        )
+        self.lazy_sections = lazy_sections
+        self._schema_node: Optional[SchemaNode] = None
+        self._pages: Optional[Dict[str, str]] = None
+        self._html: Optional[str] = None
+
+    def start(self, schema_node: SchemaNode, pages: Optional[Dict[str, str]] = None) -> None:
+        """Index schema_node the next time the index is rendered"""
+        self._schema_node = schema_node
+        self._pages = pages
+        self._html = None
+
+    def render(self) -> str:
+        """Get the HTML giving the index to the page. Meant to be called from a template.
+
+        The index is built once per schema, all pages of a documentation split in several pages share it.
+        """
+        if not self.enabled or not self._schema_node:
+            return ""
+
+        if self._html is None:
+            search_index = build_search_index(self._schema_node, self.get_description, self._pages)
+            search_index_json = json.dumps(search_index, separators=(",", ":"))
+            if self.lazy_sections.is_writing:
+                self.lazy_sections.write_file(SEARCH_INDEX_FILE_NAME, f"searchIndexLoaded({search_index_json});\n")
+                self._html = f'<script src="{self.lazy_sections.get_source(SEARCH_INDEX_FILE_NAME)}" defer></script>'
+            else:
+                # Do not let a "</script>" or "<!--" in a description end or break the script
+                search_index_json = search_index_json.replace("<", "\\u003c")
+                self._html = f'<script type="application/json" id="search-index">{search_index_json}</script>'
+
+        return self._html
@@ -0,0 +1,320 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIServer, make_server
+
+import yaml
+
+from json_schema_for_humans.batch import BatchGenerator
+from json_schema_for_humans.generation_configuration import GenerationConfiguration, _apply_config_cli_parameters
+from json_schema_for_humans.manifest import get_config_fingerprint
+from json_schema_for_humans.watch import FileStates
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+# Rendered documents kept in memory
+DEFAULT_CACHE_SIZE = 64
+# Path given to posted schemas, so that their relative references are resolved from the working directory
+POSTED_SCHEMA_FILE_NAME = "posted_schema.json"
+# Files of the template that rendered pages can link to
+ASSET_CONTENT_TYPES = {".css": "text/css; charset=utf-8", ".js": "application/javascript; charset=utf-8"}
+# Options that the config query parameters can change. The others are paths on the server or use its resources
+REQUEST_CONFIG_OPTIONS = [
+    "minify",
+    "description_is_markdown",
+    "deprecated_from_description",
+    "show_breadcrumbs",
+    "collapse_long_descriptions",
+    "default_from_description",
+    "expand_buttons",
+    "link_to_reused_ref",
+    "recursive_detection_depth",
+    "template_name",
+    "markdown_options",
+    "template_md_options",
+    "template_js_options",
+    "deterministic_output",
+    "generation_time",
+]
+
+StartResponse = Callable[..., Any]
+
+
+class HttpError(Exception):
+    """Error answered to a request, with its HTTP status"""
+
+    def __init__(self, status: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class _RenderedDocument:
+    content: str
+    # Local files read to render the document
+    used_files: Set[str]
+
+
+class RenderServer:
+    """WSGI application rendering the documentation of schemas on demand.
+
+    Schemas are either posted to /render, as JSON or YAML, or registered when creating the application and requested
+    at /schemas/<path>. The configuration can be changed for each request with config query parameters, in the same
+    format as the --config option. /metrics gives the counters of the application as JSON.
+
+    For each configuration, the compiled template, with its Markdown and highlighting caches, and the loaded schemas
+    are kept between requests. Rendered documents are cached by hash of the schema and of the configuration, and
+    forgotten when a local file they reference changes.
+
+    Documents are rendered one at a time, the templates keep state while rendering. A document is rendered completely
+    before being sent, so that a slow client does not block the next renders. Cached documents and assets are served
+    while another one is rendered.
+    """
+
+    def __init__(
+        self,
+        config: GenerationConfiguration,
+        schema_files: Iterable[Tuple[str, str]] = (),
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.config = config
+        # Registered schemas by path relative to their input, as found by find_schema_files
+        self.schemas = {relative_path.replace(os.path.sep, "/"): path for path, relative_path in schema_files}
+        self.cache_size = cache_size
+        self.start_time = time.monotonic()
+        self.counters = {"requests": 0, "renders": 0, "errors": 0, "cache_hits": 0, "cache_misses": 0}
+        self.render_seconds = 0.0
+        self._generators: Dict[str, BatchGenerator] = {}
+        self._documents: "OrderedDict[str, _RenderedDocument]" = OrderedDict()
+        self._file_states = FileStates()
+        self._render_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
+        self.counters["requests"] += 1
+        try:
+            return self._handle(environ, start_response)
+        except HttpError as error:
+            self.counters["errors"] += 1
+            start_response(error.status, [("Content-Type", "text/plain; charset=utf-8")])
+            return [f"{error}\n".encode("utf-8")]
+
+    def _handle(self, environ: Dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("PATH_INFO") or "/"
+        config_parameters = parse_qs(environ.get("QUERY_STRING", "")).get("config", [])
+
+        if path == "/render":
+            if method != "POST":
+                raise HttpError("405 Method Not Allowed", "Post the schema to render")
+            config = self.get_config(config_parameters)
+            body = environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0))
+            schema = _read_posted_schema(body)
+            return self.render(os.path.realpath(POSTED_SCHEMA_FILE_NAME), body, config, start_response, schema)
+
+        if method != "GET":
+            raise HttpError("405 Method Not Allowed", f"{method} is not supported")
+        if path == "/metrics":
+            return _respond(start_response, json.dumps(self.get_metrics(), indent=2), "application/json")
+        if path == "/schemas":
+            return _respond(start_response, json.dumps(sorted(self.schemas), indent=2), "application/json")
+        schema_name = path[len("/schemas/") :] if path.startswith("/schemas/") else None
+        if schema_name in self.schemas:
+            config = self.get_config(config_parameters)
+            try:
+                with open(self.schemas[schema_name], "rb") as schema_file:
+                    content = schema_file.read()
+            except FileNotFoundError:
+                raise HttpError("404 Not Found", f"{schema_name} was deleted")
+            return self.render(self.schemas[schema_name], content, config, start_response)
+
+        return self._get_asset(path, start_response)
+
+    def get_config(self, config_parameters: List[str]) -> GenerationConfiguration:
+        """Get the configuration of the application changed by config query parameters.
+
+        Only the options of REQUEST_CONFIG_OPTIONS can be changed, and template_name must be one of the templates of
+        the templates directory of the application.
+        """
+        for parameter in config_parameters:
+            parameter_name = _get_config_parameter_name(parameter)
+            if parameter_name not in REQUEST_CONFIG_OPTIONS:
+                raise HttpError("400 Bad Request", f"Invalid config parameter: {parameter_name} cannot be changed")
+        try:
+            config = _apply_config_cli_parameters(self.config, config_parameters)
+        except (ValueError, TypeError, KeyError) as error:
+            raise HttpError("400 Bad Request", f"Invalid config parameter: {error}")
+
+        if config.template_name != self.config.template_name and config.template_name not in os.listdir(
+            config.templates_directory
+        ):
+            raise HttpError("400 Bad Request", f"Invalid config parameter: unknown template {config.template_name}")
+        return config
+
+    def render(
+        self,
+        schema_path: str,
+        content: bytes,
+        config: GenerationConfiguration,
+        start_response: StartResponse,
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> Iterable[bytes]:
+        """Answer with the documentation of the schema at schema_path, from the cache or rendered.
+
+        content is the content of the schema file, used to find the document in the cache. If given, schema is used
+        instead of reading schema_path.
+        """
+        self._forget_changed_files()
+        fingerprint = get_config_fingerprint(config)
+        key = hashlib.sha256(b"\0".join([schema_path.encode("utf-8"), content, fingerprint.encode("utf-8")]))
+        key = key.hexdigest()
+        content_type = "text/markdown" if config.template_name == "md" else "text/html"
+
+        with self._cache_lock:
+            document = self._documents.get(key)
+            if document:
+                self._documents.move_to_end(key)
+        if document:
+            self.counters["cache_hits"] += 1
+            return _respond(start_response, document.content, content_type, [("X-Cache", "hit")])
+        self.counters["cache_misses"] += 1
+
+        # Before taking the lock, a configuration that cannot be used must not block the next renders
+        generator = self._get_generator(fingerprint, config)
+        used_schemas: Set[str] = set()
+        # A posted schema is not a file, it cannot change
+        posted_schemas = {schema_path} if schema is not None else set()
+        with self._render_lock:
+            start = time.monotonic()
+            if schema is not None:
+                generator.loaded_schemas[schema_path] = schema
+            try:
+                rendered_content = self._render_document(generator, schema_path, used_schemas)
+            finally:
+                generator.forget(posted_schemas)
+                self._file_states.track(used_schemas - posted_schemas)
+                self.counters["renders"] += 1
+                self.render_seconds += time.monotonic() - start
+        document = _RenderedDocument(rendered_content, used_schemas - posted_schemas)
+
+        with self._cache_lock:
+            self._documents[key] = document
+            while len(self._documents) > self.cache_size:
+                self._documents.popitem(last=False)
+        return _respond(start_response, document.content, content_type, [("X-Cache", "miss")])
+
+    @staticmethod
+    def _render_document(generator: BatchGenerator, schema_path: str, used_schemas: Set[str]) -> str:
+        try:
+            # The schemas are loaded before the first chunk, errors in them are reported as bad requests
+            chunks = generator.render(schema_path, used_schemas=used_schemas)
+        except Exception as exception:
+            logging.debug(f"Error documenting {schema_path}", exc_info=True)
+            raise HttpError("400 Bad Request", f"{type(exception).__name__}: {exception}")
+        try:
+            return "".join(chunks)
+        except Exception as exception:
+            logging.exception(f"Error rendering {schema_path}")
+            raise HttpError("500 Internal Server Error", f"{type(exception).__name__}: {exception}")
+
+    def _get_generator(self, fingerprint: str, config: GenerationConfiguration) -> BatchGenerator:
+        """Get the generator kept for a configuration, compiling its template the first time"""
+        generator = self._generators.get(fingerprint)
+        if not generator:
+            try:
+                generator = BatchGenerator(config)
+            except Exception as exception:
+                logging.debug("Error loading the template", exc_info=True)
+                raise HttpError("400 Bad Request", f"Invalid config: {type(exception).__name__}: {exception}")
+            self._generators[fingerprint] = generator
+        return generator
+
+    def _forget_changed_files(self) -> None:
+        """Forget the loaded schemas and the cached documents using local files that changed since they were read"""
+        changed_files = self._file_states.get_changed()
+        if not changed_files:
+            return
+
+        with self._render_lock:
+            for generator in self._generators.values():
+                generator.forget(changed_files)
+        with self._cache_lock:
+            for key in [key for key, document in self._documents.items() if document.used_files & changed_files]:
+                del self._documents[key]
+
+    def _get_asset(self, path: str, start_response: StartResponse) -> List[bytes]:
+        """Answer with a CSS or JS file of the template of the application, linked to by rendered pages"""
+        file_name = path.rsplit("/", 1)[-1]
+        extension = os.path.splitext(file_name)[1]
+        asset_path = os.path.join(self.config.templates_directory, self.config.template_name, file_name)
+        if extension not in ASSET_CONTENT_TYPES or not os.path.isfile(asset_path):
+            raise HttpError("404 Not Found", f"{path} not found")
+
+        with open(asset_path, "rb") as asset_file:
+            content = asset_file.read()
+        start_response(
+            "200 OK", [("Content-Type", ASSET_CONTENT_TYPES[extension]), ("Content-Length", str(len(content)))]
+        )
+        return [content]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get the counters of the application"""
+        return {
+            **self.counters,
+            "render_seconds": round(self.render_seconds, 3),
+            "uptime_seconds": round(time.monotonic() - self.start_time, 3),
+            "cached_documents": len(self._documents),
+            "cache_size": self.cache_size,
+            "configurations": len(self._generators),
+            "loaded_schemas": sum(len(generator.loaded_schemas) for generator in self._generators.values()),
+            "tracked_files": len(self._file_states),
+            "registered_schemas": len(self.schemas),
+        }
+
+
+def _get_config_parameter_name(config_parameter: str) -> str:
+    """Get the name of the option changed by a parameter_name=parameter_value or [no_]parameter_name parameter"""
+    if "=" in config_parameter:
+        return config_parameter.split("=", 1)[0]
+    if config_parameter.startswith("no_") or config_parameter.startswith("no-"):
+        return config_parameter[3:]
+    return config_parameter
+
+
+def _read_posted_schema(body: bytes) -> Dict[str, Any]:
+    try:
+        schema = yaml.safe_load(body.decode("utf-8"))
+    except (UnicodeDecodeError, yaml.YAMLError) as error:
+        raise HttpError("400 Bad Request", f"The schema cannot be read: {error}")
+    if not isinstance(schema, dict):
+        raise HttpError("400 Bad Request", "The schema must be an object")
+    return schema
+
+
+def _respond(
+    start_response: StartResponse, content: str, content_type: str, headers: Optional[List[Tuple[str, str]]] = None
+) -> List[bytes]:
+    encoded_content = content.encode("utf-8")
+    start_response(
+        "200 OK",
+        [("Content-Type", f"{content_type}; charset=utf-8"), ("Content-Length", str(len(encoded_content)))]
+        + (headers or []),
+    )
+    return [encoded_content]
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+def create_http_server(app: RenderServer, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> WSGIServer:
+    """Create an HTTP server of the standard library serving app, answering each request in a thread"""
+    return make_server(host, port, app, server_class=_ThreadingWSGIServer)
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+from json_schema_for_humans.batch import BatchGenerator, copy_assets
+from json_schema_for_humans.generation_configuration import GenerationConfiguration, _apply_config_cli_parameters
+from json_schema_for_humans.manifest import get_config_fingerprint
+from json_schema_for_humans.output_files import OutputFiles
+from json_schema_for_humans.watch import FileStates
+
+# Path given to inline schemas without a schema path, so that their relative references are resolved from the working
+# directory
+INLINE_SCHEMA_FILE_NAME = "inline_schema.json"
+
+# Kept by each process between jobs, by configuration fingerprint
+_generators: Dict[str, BatchGenerator] = {}
+_file_states = FileStates()
+
+
+def _get_job_config(config: GenerationConfiguration, overrides: Any) -> GenerationConfiguration:
+    """Get the configuration changed by the config of a job: an object like a configuration file, or a list of
+    parameters like --config
+    """
+    if overrides is None:
+        return config
+    if isinstance(overrides, list):
+        return _apply_config_cli_parameters(config, overrides)
+    if isinstance(overrides, dict):
+        return GenerationConfiguration.from_dict({**config.to_dict(), **overrides})
+    raise ValueError("config must be an object or a list of parameter_name=parameter_value")
+
+
+def _get_job_schema(job: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Get the path of the schema of a job and its inline content, if given"""
+    schema_path = job.get("schema")
+    inline_schema = job.get("inline_schema")
+    if schema_path is not None and not isinstance(schema_path, str):
+        raise ValueError("schema must be the path to a schema file")
+    if inline_schema is not None and not isinstance(inline_schema, dict):
+        raise ValueError("inline_schema must be an object")
+    if schema_path is None and inline_schema is None:
+        raise ValueError("Either schema or inline_schema is required")
+
+    return os.path.realpath(schema_path or INLINE_SCHEMA_FILE_NAME), inline_schema
+
+
+def run_job(job: Dict[str, Any], config: GenerationConfiguration) -> Dict[str, Any]:
+    """Generate the documentation requested by a job and get its result.
+
+    The job gives the path of the schema file in "schema", or the schema itself in "inline_schema", in which case
+    "schema" is only used to resolve its relative references. "output" is the path of the result file and "config"
+    changes config for this job. The compiled templates and the loaded schemas that did not change are kept between
+    jobs run by the same process.
+    """
+    start = time.monotonic()
+    response: Dict[str, Any] = {"id": job.get("id"), "status": "error", "output": job.get("output")}
+    output_files = OutputFiles()
+    try:
+        if not isinstance(job.get("output"), str):
+            raise ValueError("output must be the path of the result file")
+        job_config = _get_job_config(config, job.get("config"))
+        schema_path, inline_schema = _get_job_schema(job)
+        fingerprint = get_config_fingerprint(job_config)
+        generator = _generators.get(fingerprint)
+        if not generator:
+            generator = _generators[fingerprint] = BatchGenerator(job_config)
+        copy_assets([job["output"]], job_config, output_files)
+    except Exception as exception:
+        response.update(error=f"{type(exception).__name__}: {exception}", duration=round(time.monotonic() - start, 3))
+        return response
+
+    changed_files = _file_states.get_changed()
+    for cached_generator in _generators.values():
+        cached_generator.forget(changed_files)
+    if inline_schema is not None:
+        generator.loaded_schemas[schema_path] = inline_schema
+    try:
+        result = generator.generate(schema_path, job["output"])
+    finally:
+        if inline_schema is not None:
+            generator.forget([schema_path])
+    used_schemas = [path for path in result.used_schemas if inline_schema is None or path != schema_path]
+    _file_states.track(used_schemas)
+
+    response.update(
+        status="error" if result.error else "ok",
+        error=result.error,
+        duration=round(result.duration.total_seconds(), 3),
+        written=output_files.written + result.written,
+        unchanged=output_files.unchanged + result.unchanged,
+        used_schemas=used_schemas,
+    )
+    return response
+
+
+def run_stdio_server(
+    input_stream: TextIO, output_stream: TextIO, config: GenerationConfiguration, jobs: int = 1
+) -> int:
+    """Read jobs from input_stream, one JSON object per line, and write the result of each one to output_stream as a
+    JSON object on one line, until the end of input_stream. Return the number of jobs that failed.
+
+    Each result has the id given to the job, if any, its status ("ok" or "error"), the error message, the time spent
+    generating in duration and since the job was read in elapsed, in seconds, and the files written, left unchanged
+    and used. With several jobs processes, results are written as jobs finish, not in the order of the jobs, and at
+    most jobs are read ahead.
+    """
+    output_lock = threading.Lock()
+    failed_jobs = 0
+
+    def _write_response(response: Dict[str, Any], read_time: float) -> None:
+        nonlocal failed_jobs
+        response["elapsed"] = round(time.monotonic() - read_time, 3)
+        with output_lock:
+            if response["status"] != "ok":
+                failed_jobs += 1
+            output_stream.write(json.dumps(response) + "\n")
+            output_stream.flush()
+
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    slots = threading.BoundedSemaphore(jobs)
+
+    def _on_done(job: Dict[str, Any], read_time: float, future: Future) -> None:
+        try:
+            response = future.result()
+        except Exception as exception:
+            response = {"id": job.get("id"), "status": "error", "error": f"{type(exception).__name__}: {exception}"}
+        _write_response(response, read_time)
+        slots.release()
+
+    try:
+        # Not iterating over the stream, that can wait for more than one line
+        for line in iter(input_stream.readline, ""):
+            if not line.strip():
+                continue
+            read_time = time.monotonic()
+            try:
+                job = json.loads(line)
+            except ValueError as error:
+                _write_response({"id": None, "status": "error", "error": f"Invalid job: {error}"}, read_time)
+                continue
+            if not isinstance(job, dict):
+                _write_response({"id": None, "status": "error", "error": "A job must be an object"}, read_time)
+                continue
+
+            if not executor:
+                _write_response(run_job(job, config), read_time)
+                continue
+            slots.acquire()
+            executor.submit(run_job, job, config).add_done_callback(
+                lambda future, job=job, read_time=read_time: _on_done(job, read_time, future)
+            )
+    finally:
+        if executor:
+            executor.shutdown(wait=True)
+
+    return failed_jobs
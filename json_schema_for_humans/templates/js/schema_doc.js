@@ -1,6 +1,13 @@
-$(document).on('click', 'a[href^="#"]', function(event) {
-  event.preventDefault();
-  history.pushState({}, '', this.href);
+// Collapsible sections and tabs are handled by Bootstrap when the page loads jQuery and Bootstrap JS. Otherwise
+// (template_js_options.runtime "vanilla") they are handled here, using the same data attributes
+const hasBootstrap = typeof jQuery !== "undefined" && typeof jQuery.fn.collapse === "function";
+
+document.addEventListener("click", function(event) {
+    const link = event.target.closest("a[href^='#']");
+    if (link) {
+        event.preventDefault();
+        history.pushState({}, '', link.href);
+    }
 });
 
 function flashElement(elementId) {
@@ -29,38 +36,359 @@ function anchorOnLoad() {
     }
 }
 
-function anchorLink(linkTarget) {
-    const target = $( "#" + linkTarget );
-    // Find the targeted element to expand and all its parents that can be expanded
-    target.parents().addBack().filter(".collapse:not(.show), .tab-pane, [role='tab']").each(
-        function(index) {
-            if($( this ).hasClass("collapse")) {
-                $( this ).collapse("show");
-            } else if ($( this ).hasClass("tab-pane")) {
-                // We have the pane and not the the tab itself, find the tab
-                const tabToShow = $( "a[href='#" + $( this ).attr("id") + "']" );
-                if (tabToShow) {
-                    tabToShow.tab("show");
-                }
-            } else if ($( this ).attr("role") === "tab") {
-                // The tab is not a parent of underlying elements, the tab pane is
-                // However, it can still be linked directly
-                $( this ).tab("show");
+function isSamePageLink(link) {
+    // In a documentation split in pages, links to elements of other pages are followed by the browser
+    return new URL(link.href, window.location.href).pathname === window.location.pathname;
+}
+
+function anchorLink(linkTarget, link) {
+    if (link && !isSamePageLink(link)) {
+        return;
+    }
+
+    // The target may be in sections that are not loaded yet
+    loadSectionsContaining(linkTarget).then(function() {
+        showAnchor(linkTarget);
+    });
+}
+
+function showAnchor(linkTarget) {
+    const target = getElementByAnchor(linkTarget);
+    if (!target) {
+        return;
+    }
+
+    // Find the targeted element to expand and all its parents that can be expanded, outermost first
+    const elements = [];
+    for (let element = target; element !== document.documentElement; element = element.parentElement) {
+        elements.unshift(element);
+    }
+    elements.forEach(function(element) {
+        if (element.matches(".collapse:not(.show)")) {
+            showCollapse(element);
+        } else if (element.classList.contains("tab-pane")) {
+            // We have the pane and not the the tab itself, find the tab
+            const tabToShow = document.querySelector("a[href='#" + element.id + "']");
+            if (tabToShow) {
+                showTab(tabToShow);
             }
+        } else if (element.getAttribute("role") === "tab") {
+            // The tab is not a parent of underlying elements, the tab pane is
+            // However, it can still be linked directly
+            showTab(element);
         }
-    );
+    });
+
+    if (!hasBootstrap) {
+        // Sections are expanded at once, scroll as soon as the browser has laid them out
+        requestAnimationFrame(function() {
+            target.scrollIntoView({ block: "center", behavior:"smooth" });
+            // Flash the element so that the user notices where the link points to
+            flashElement(target.id);
+        });
+        return;
+    }
 
     // Wait a little so the user has time to see the page scroll
     // Or maybe it is to be sure everything is expanded before scrolling and I was not able to bind to the bootstrap
     // events in a way that works all the time, we may never know
     setTimeout(function() {
-        let targetElement = document.getElementById(linkTarget);
+        let targetElement = getElementByAnchor(linkTarget);
         if (targetElement) {
             targetElement.scrollIntoView({ block: "center", behavior:"smooth" });
             // Flash the element so that the user notices where the link points to
             setTimeout(function() {
-                flashElement(linkTarget);
+                flashElement(targetElement.id);
             }, 500);
         }
     }, 1000);
-}
\ No newline at end of file
+}
+
+function showCollapse(element) {
+    if (hasBootstrap) {
+        $( element ).collapse("show");
+        return;
+    }
+
+    // Like Bootstrap accordions, showing a section hides the other sections with the same data-parent
+    const parentSelector = element.getAttribute("data-parent");
+    const parent = parentSelector && document.querySelector(parentSelector);
+    if (parent) {
+        parent.querySelectorAll(".collapse.show").forEach(function(sibling) {
+            if (sibling !== element && sibling.getAttribute("data-parent") === parentSelector) {
+                setCollapseShown(sibling, false);
+            }
+        });
+    }
+    loadSectionsIn(element);
+    setCollapseShown(element, true);
+}
+
+function setCollapseShown(element, shown) {
+    element.classList.toggle("show", shown);
+    const target = CSS.escape("#" + element.id);
+    const triggers = document.querySelectorAll(
+        "[data-toggle='collapse'][data-target=\"" + target + "\"], [data-toggle='collapse'][href=\"" + target + "\"]"
+    );
+    triggers.forEach(function(trigger) {
+        trigger.classList.toggle("collapsed", !shown);
+        trigger.setAttribute("aria-expanded", shown);
+    });
+}
+
+function showTab(tab) {
+    if (hasBootstrap) {
+        $( tab ).tab("show");
+        return;
+    }
+
+    const pane = document.getElementById(getToggleTarget(tab).substr(1));
+    tab.closest(".nav").querySelectorAll(".nav-link.active").forEach(function(activeTab) {
+        activeTab.classList.remove("active");
+        activeTab.setAttribute("aria-selected", false);
+    });
+    tab.classList.add("active");
+    tab.setAttribute("aria-selected", true);
+    if (pane) {
+        loadSectionsIn(pane);
+        Array.from(pane.parentElement.children).forEach(function(otherPane) {
+            otherPane.classList.remove("active", "show");
+        });
+        pane.classList.add("active", "show");
+    }
+}
+
+function getToggleTarget(trigger) {
+    return trigger.getAttribute("data-target") || trigger.getAttribute("href");
+}
+
+if (!hasBootstrap) {
+    // A single listener for all the toggles of the page, including the ones of sections loaded later
+    document.addEventListener("click", function(event) {
+        const trigger = event.target.closest("[data-toggle='collapse'], [data-toggle='tab']");
+        if (!trigger) {
+            return;
+        }
+        if (trigger.tagName === "A") {
+            event.preventDefault();
+        }
+
+        if (trigger.getAttribute("data-toggle") === "tab") {
+            showTab(trigger);
+        } else {
+            document.querySelectorAll(getToggleTarget(trigger)).forEach(function(element) {
+                if (element.classList.contains("show")) {
+                    setCollapseShown(element, false);
+                } else {
+                    showCollapse(element);
+                }
+            });
+        }
+    });
+}
+
+// With template_js_options.compact_ids, the elements of properties and tabs have short ids. Links keep the HTML ids
+// made from paths, the page has a table to find the short id of an element from the HTML id in a link
+let elementIds = null;
+let anchorsByElementId = null;
+
+function getElementIds() {
+    if (elementIds === null) {
+        const table = document.getElementById("element-ids");
+        elementIds = table ? JSON.parse(table.textContent) : {};
+        anchorsByElementId = {};
+        Object.keys(elementIds).forEach(function(anchor) {
+            anchorsByElementId[elementIds[anchor]] = anchor;
+        });
+    }
+    return elementIds;
+}
+
+function getElementByAnchor(linkTarget) {
+    const shortIds = getElementIds();
+    const hasShortId = Object.prototype.hasOwnProperty.call(shortIds, linkTarget);
+    return document.getElementById(hasShortId ? shortIds[linkTarget] : linkTarget);
+}
+
+function getAnchor(elementId) {
+    getElementIds();
+    return Object.prototype.hasOwnProperty.call(anchorsByElementId, elementId) ? anchorsByElementId[elementId] : null;
+}
+
+// Compact pages do not have onclick attributes, the clicks on toggles and links to other properties are handled here
+document.addEventListener("click", function(event) {
+    if (Object.keys(getElementIds()).length === 0) {
+        return;
+    }
+
+    const trigger = event.target.closest("[data-toggle]");
+    if (trigger) {
+        const isTab = trigger.getAttribute("data-toggle") === "tab";
+        const anchor = getAnchor(isTab ? trigger.id : getToggleTarget(trigger).substr(1));
+        if (anchor) {
+            setAnchor("#" + anchor);
+        }
+        return;
+    }
+
+    const link = event.target.closest(".breadcrumbs a, a.ref-link");
+    if (link && isSamePageLink(link)) {
+        anchorLink(link.hash.substr(1));
+    }
+});
+
+// Sections collapsed when the page is loaded can be written to their own files, leaving only a placeholder
+// <div class="lazy-section" data-section="{html id}" data-src="{file}"> in the page. They are loaded when shown.
+const loadedSections = {};
+const pendingSections = {};
+
+function loadSection(placeholder) {
+    // Replace the placeholder by the HTML of its section, loaded with a script tag so that it also works from file://
+    const sectionSource = placeholder.getAttribute("data-src");
+    if (sectionSource in loadedSections) {
+        placeholder.outerHTML = loadedSections[sectionSource];
+        return Promise.resolve();
+    }
+
+    return new Promise(function(resolve) {
+        if (!pendingSections[sectionSource]) {
+            pendingSections[sectionSource] = [];
+            const script = document.createElement("script");
+            script.src = sectionSource;
+            document.head.appendChild(script);
+        }
+        pendingSections[sectionSource].push(resolve);
+    });
+}
+
+function sectionLoaded(sectionSource, html) {
+    // Called by the file of a section once loaded
+    loadedSections[sectionSource] = html;
+    document.querySelectorAll(".lazy-section[data-src='" + sectionSource + "']").forEach(function(placeholder) {
+        placeholder.outerHTML = html;
+    });
+    (pendingSections[sectionSource] || []).forEach(function(resolve) {
+        resolve();
+    });
+    delete pendingSections[sectionSource];
+}
+
+function loadSectionsIn(element) {
+    // Load the sections directly in element, not the ones in collapsed sections or tabs nested in it
+    element.querySelectorAll(".lazy-section").forEach(function(placeholder) {
+        if (placeholder.parentElement.closest(".collapse, .tab-pane") === element) {
+            loadSection(placeholder);
+        }
+    });
+}
+
+function loadSectionsContaining(linkTarget) {
+    // HTML ids of nested elements start with the HTML id of their parents, so only the sections with a HTML id that
+    // is a prefix of the target can contain it
+    if (getElementByAnchor(linkTarget)) {
+        return Promise.resolve();
+    }
+    const placeholders = Array.from(document.querySelectorAll(".lazy-section")).filter(function(placeholder) {
+        const sectionId = placeholder.getAttribute("data-section");
+        return linkTarget === sectionId || linkTarget.startsWith(sectionId + "_");
+    });
+    if (placeholders.length === 0) {
+        return Promise.resolve();
+    }
+
+    return Promise.all(placeholders.map(loadSection)).then(function() {
+        return loadSectionsContaining(linkTarget);
+    });
+}
+
+if (hasBootstrap) {
+    $(document).on("show.bs.collapse", ".collapse", function(event) {
+        // The event bubbles up to the parents, only load the sections of the element being shown
+        if (event.target === this) {
+            loadSectionsIn(this);
+        }
+    });
+
+    $(document).on("show.bs.tab", "a[data-toggle='tab']", function() {
+        loadSectionsIn($( $( this ).attr("href") )[0]);
+    });
+}
+
+// The search index lists the properties as [link target, name, path, title, description]. It is either inlined in the
+// page as JSON or loaded from its own file, which calls searchIndexLoaded()
+const MAX_SEARCH_RESULTS = 50;
+let searchIndex = null;
+
+function searchIndexLoaded(index) {
+    searchIndex = index;
+}
+
+function getSearchIndex() {
+    if (searchIndex === null) {
+        const inlineIndex = document.getElementById("search-index");
+        if (!inlineIndex) {
+            // Not loaded yet
+            return [];
+        }
+        searchIndex = JSON.parse(inlineIndex.textContent);
+    }
+    return searchIndex;
+}
+
+function getSearchRank(entry, query) {
+    // Lower is better, properties named like the query first, then the ones with the query in their description
+    const name = entry[1].toLowerCase();
+    if (name === query) {
+        return 0;
+    }
+    if (name.startsWith(query)) {
+        return 1;
+    }
+    if (name.includes(query)) {
+        return 2;
+    }
+    if ((entry[2] + " " + entry[3] + " " + entry[4]).toLowerCase().includes(query)) {
+        return 3;
+    }
+    return -1;
+}
+
+function searchProperties(query) {
+    const results = document.getElementById("search-results");
+    results.innerHTML = "";
+    query = query.trim().toLowerCase();
+    if (query.length === 0) {
+        return;
+    }
+
+    const matches = [];
+    getSearchIndex().forEach(function(entry) {
+        const rank = getSearchRank(entry, query);
+        if (rank >= 0) {
+            matches.push([rank, entry]);
+        }
+    });
+    matches.sort(function(a, b) {
+        return a[0] - b[0];
+    });
+
+    matches.slice(0, MAX_SEARCH_RESULTS).forEach(function(match) {
+        const entry = match[1];
+        const result = document.createElement("a");
+        result.className = "list-group-item list-group-item-action search-result";
+        result.href = entry[0];
+        result.textContent = entry[3] ? entry[1] + " (" + entry[3] + ")" : entry[1];
+        const path = document.createElement("span");
+        path.className = "search-result-path";
+        path.textContent = entry[4] ? entry[2] + ": " + entry[4] : entry[2];
+        result.appendChild(path);
+        result.addEventListener("click", function() {
+            results.innerHTML = "";
+            if (entry[0][0] === "#") {
+                // Otherwise the property is in another page, which expands it when loaded
+                anchorLink(entry[0].substr(1));
+            }
+        });
+        results.appendChild(result);
+    });
+}
@@ -1 +1,48 @@
-function flashElement(t){myElement=document.getElementById(t),myElement.classList.add("jsfh-animated-property"),setTimeout(function(){myElement.classList.remove("jsfh-animated-property")},1e3)}function setAnchor(t){history.pushState({},"",t)}function anchorOnLoad(){let t=window.location.hash.split("?")[0].split("&")[0];"#"===t[0]&&(t=t.substr(1)),t.length>0&&anchorLink(t)}function anchorLink(t){$("#"+t).parents().addBack().filter(".collapse:not(.show), .tab-pane, [role='tab']").each(function(t){if($(this).hasClass("collapse"))$(this).collapse("show");else if($(this).hasClass("tab-pane")){const t=$("a[href='#"+$(this).attr("id")+"']");t&&t.tab("show")}else"tab"===$(this).attr("role")&&$(this).tab("show")}),setTimeout(function(){let e=document.getElementById(t);e&&(e.scrollIntoView({block:"center",behavior:"smooth"}),setTimeout(function(){flashElement(t)},500))},1e3)}$(document).on("click",'a[href^="#"]',function(t){t.preventDefault(),history.pushState({},"",this.href)});
\ No newline at end of file
+const hasBootstrap=typeof jQuery!=="undefined"&&typeof jQuery.fn.collapse==="function";document.addEventListener("click",function(event){const link=event.target.closest("a[href^='#']");if(link){event.preventDefault();history.pushState({},'',link.href);}});function flashElement(elementId){myElement=document.getElementById(elementId);myElement.classList.add("jsfh-animated-property");setTimeout(function(){myElement.classList.remove("jsfh-animated-property");},1000);}
+function setAnchor(anchorLinkDestination){history.pushState({},'',anchorLinkDestination);}
+function anchorOnLoad(){let linkTarget=window.location.hash.split("?")[0].split("&")[0];if(linkTarget[0]==="#"){linkTarget=linkTarget.substr(1);}
+if(linkTarget.length>0){anchorLink(linkTarget);}}
+function isSamePageLink(link){return new URL(link.href,window.location.href).pathname===window.location.pathname;}
+function anchorLink(linkTarget,link){if(link&&!isSamePageLink(link)){return;}
+loadSectionsContaining(linkTarget).then(function(){showAnchor(linkTarget);});}
+function showAnchor(linkTarget){const target=getElementByAnchor(linkTarget);if(!target){return;}
+const elements=[];for(let element=target;element!==document.documentElement;element=element.parentElement){elements.unshift(element);}
+elements.forEach(function(element){if(element.matches(".collapse:not(.show)")){showCollapse(element);}else if(element.classList.contains("tab-pane")){const tabToShow=document.querySelector("a[href='#"+element.id+"']");if(tabToShow){showTab(tabToShow);}}else if(element.getAttribute("role")==="tab"){showTab(element);}});if(!hasBootstrap){requestAnimationFrame(function(){target.scrollIntoView({block:"center",behavior:"smooth"});flashElement(target.id);});return;}
+setTimeout(function(){let targetElement=getElementByAnchor(linkTarget);if(targetElement){targetElement.scrollIntoView({block:"center",behavior:"smooth"});setTimeout(function(){flashElement(targetElement.id);},500);}},1000);}
+function showCollapse(element){if(hasBootstrap){$(element).collapse("show");return;}
+const parentSelector=element.getAttribute("data-parent");const parent=parentSelector&&document.querySelector(parentSelector);if(parent){parent.querySelectorAll(".collapse.show").forEach(function(sibling){if(sibling!==element&&sibling.getAttribute("data-parent")===parentSelector){setCollapseShown(sibling,false);}});}
+loadSectionsIn(element);setCollapseShown(element,true);}
+function setCollapseShown(element,shown){element.classList.toggle("show",shown);const target=CSS.escape("#"+element.id);const triggers=document.querySelectorAll("[data-toggle='collapse'][data-target=\""+target+"\"], [data-toggle='collapse'][href=\""+target+"\"]");triggers.forEach(function(trigger){trigger.classList.toggle("collapsed",!shown);trigger.setAttribute("aria-expanded",shown);});}
+function showTab(tab){if(hasBootstrap){$(tab).tab("show");return;}
+const pane=document.getElementById(getToggleTarget(tab).substr(1));tab.closest(".nav").querySelectorAll(".nav-link.active").forEach(function(activeTab){activeTab.classList.remove("active");activeTab.setAttribute("aria-selected",false);});tab.classList.add("active");tab.setAttribute("aria-selected",true);if(pane){loadSectionsIn(pane);Array.from(pane.parentElement.children).forEach(function(otherPane){otherPane.classList.remove("active","show");});pane.classList.add("active","show");}}
+function getToggleTarget(trigger){return trigger.getAttribute("data-target")||trigger.getAttribute("href");}
+if(!hasBootstrap){document.addEventListener("click",function(event){const trigger=event.target.closest("[data-toggle='collapse'], [data-toggle='tab']");if(!trigger){return;}
+if(trigger.tagName==="A"){event.preventDefault();}
+if(trigger.getAttribute("data-toggle")==="tab"){showTab(trigger);}else{document.querySelectorAll(getToggleTarget(trigger)).forEach(function(element){if(element.classList.contains("show")){setCollapseShown(element,false);}else{showCollapse(element);}});}});}
+let elementIds=null;let anchorsByElementId=null;function getElementIds(){if(elementIds===null){const table=document.getElementById("element-ids");elementIds=table?JSON.parse(table.textContent):{};anchorsByElementId={};Object.keys(elementIds).forEach(function(anchor){anchorsByElementId[elementIds[anchor]]=anchor;});}
+return elementIds;}
+function getElementByAnchor(linkTarget){const shortIds=getElementIds();const hasShortId=Object.prototype.hasOwnProperty.call(shortIds,linkTarget);return document.getElementById(hasShortId?shortIds[linkTarget]:linkTarget);}
+function getAnchor(elementId){getElementIds();return Object.prototype.hasOwnProperty.call(anchorsByElementId,elementId)?anchorsByElementId[elementId]:null;}
+document.addEventListener("click",function(event){if(Object.keys(getElementIds()).length===0){return;}
+const trigger=event.target.closest("[data-toggle]");if(trigger){const isTab=trigger.getAttribute("data-toggle")==="tab";const anchor=getAnchor(isTab?trigger.id:getToggleTarget(trigger).substr(1));if(anchor){setAnchor("#"+anchor);}
+return;}
+const link=event.target.closest(".breadcrumbs a, a.ref-link");if(link&&isSamePageLink(link)){anchorLink(link.hash.substr(1));}});const loadedSections={};const pendingSections={};function loadSection(placeholder){const sectionSource=placeholder.getAttribute("data-src");if(sectionSource in loadedSections){placeholder.outerHTML=loadedSections[sectionSource];return Promise.resolve();}
+return new Promise(function(resolve){if(!pendingSections[sectionSource]){pendingSections[sectionSource]=[];const script=document.createElement("script");script.src=sectionSource;document.head.appendChild(script);}
+pendingSections[sectionSource].push(resolve);});}
+function sectionLoaded(sectionSource,html){loadedSections[sectionSource]=html;document.querySelectorAll(".lazy-section[data-src='"+sectionSource+"']").forEach(function(placeholder){placeholder.outerHTML=html;});(pendingSections[sectionSource]||[]).forEach(function(resolve){resolve();});delete pendingSections[sectionSource];}
+function loadSectionsIn(element){element.querySelectorAll(".lazy-section").forEach(function(placeholder){if(placeholder.parentElement.closest(".collapse, .tab-pane")===element){loadSection(placeholder);}});}
+function loadSectionsContaining(linkTarget){if(getElementByAnchor(linkTarget)){return Promise.resolve();}
+const placeholders=Array.from(document.querySelectorAll(".lazy-section")).filter(function(placeholder){const sectionId=placeholder.getAttribute("data-section");return linkTarget===sectionId||linkTarget.startsWith(sectionId+"_");});if(placeholders.length===0){return Promise.resolve();}
+return Promise.all(placeholders.map(loadSection)).then(function(){return loadSectionsContaining(linkTarget);});}
+if(hasBootstrap){$(document).on("show.bs.collapse",".collapse",function(event){if(event.target===this){loadSectionsIn(this);}});$(document).on("show.bs.tab","a[data-toggle='tab']",function(){loadSectionsIn($($(this).attr("href"))[0]);});}
+const MAX_SEARCH_RESULTS=50;let searchIndex=null;function searchIndexLoaded(index){searchIndex=index;}
+function getSearchIndex(){if(searchIndex===null){const inlineIndex=document.getElementById("search-index");if(!inlineIndex){return[];}
+searchIndex=JSON.parse(inlineIndex.textContent);}
+return searchIndex;}
+function getSearchRank(entry,query){const name=entry[1].toLowerCase();if(name===query){return 0;}
+if(name.startsWith(query)){return 1;}
+if(name.includes(query)){return 2;}
+if((entry[2]+" "+entry[3]+" "+entry[4]).toLowerCase().includes(query)){return 3;}
+return-1;}
+function searchProperties(query){const results=document.getElementById("search-results");results.innerHTML="";query=query.trim().toLowerCase();if(query.length===0){return;}
+const matches=[];getSearchIndex().forEach(function(entry){const rank=getSearchRank(entry,query);if(rank>=0){matches.push([rank,entry]);}});matches.sort(function(a,b){return a[0]-b[0];});matches.slice(0,MAX_SEARCH_RESULTS).forEach(function(match){const entry=match[1];const result=document.createElement("a");result.className="list-group-item list-group-item-action search-result";result.href=entry[0];result.textContent=entry[3]?entry[1]+" ("+entry[3]+")":entry[1];const path=document.createElement("span");path.className="search-result-path";path.textContent=entry[4]?entry[2]+": "+entry[4]:entry[2];result.appendChild(path);result.addEventListener("click",function(){results.innerHTML="";if(entry[0][0]==="#"){anchorLink(entry[0].substr(1));}});results.appendChild(result);});}
\ No newline at end of file
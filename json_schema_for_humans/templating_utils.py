@@ -20,10 +20,12 @@ def get_type_name(schema_node: "SchemaNode") -> Optional[str]:
         }.get(python_type, const.TYPE_STRING)
 
     def _enum_type(enum_values: List["SchemaNode"]) -> str:
-        enum_type_names = [
-            _python_type_to_json_type(python_type_name)
-            for python_type_name in set(type(v.literal) for v in enum_values)
-        ]
+        # In the order of the values, a set would give a different order on each run
+        enum_type_names = []
+        for enum_value in enum_values:
+            type_name = _python_type_to_json_type(type(enum_value.literal))
+            if type_name not in enum_type_names:
+                enum_type_names.append(type_name)
         if enum_type_names:
             return f"{const.TYPE_ENUM} (of {' or '.join(enum_type_names)})"
 
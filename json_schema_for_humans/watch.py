@@ -0,0 +1,118 @@
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from json_schema_for_humans.batch import BatchGenerator, BatchResult, copy_assets, generate_all
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.output_files import OutputFiles
+
+# Seconds between 2 checks for changed files
+POLL_INTERVAL = 0.5
+
+FileState = Optional[Tuple[int, int]]
+
+
+def _get_file_state(path: str) -> FileState:
+    """Get what changes when a file is written: its modification time and its size. None if it does not exist"""
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+class FileStates:
+    """Modification time and size of local files, to find the ones that changed since they were first tracked"""
+
+    def __init__(self) -> None:
+        self._states: Dict[str, FileState] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def paths(self) -> List[str]:
+        return sorted(self._states)
+
+    def track(self, paths: Iterable[str]) -> None:
+        """Start tracking the files at paths that are not tracked yet, URLs cannot be tracked"""
+        for path in paths:
+            if not path.startswith("http") and path not in self._states:
+                self._states[path] = _get_file_state(path)
+
+    def get_changed(self) -> Set[str]:
+        """Get the files that changed since the last call, or since they were tracked"""
+        changed_files = set()
+        for path, state in self._states.items():
+            new_state = _get_file_state(path)
+            if new_state != state:
+                changed_files.add(path)
+                self._states[path] = new_state
+        return changed_files
+
+
+class Watcher:
+    """Generate the documentation of schemas, then generate it again each time the schema or one of the files it
+    references changes.
+
+    The files used by each result are the ones read while building its documentation, including the ones referenced
+    by referenced files. Only the results using a changed file are generated again. The compiled template and the
+    loaded schemas that did not change are kept between generations.
+
+    Files are checked for changes by polling their modification time and size, which works the same on all systems
+    and file systems, including mounted volumes where file system events are not reported.
+    """
+
+    def __init__(
+        self,
+        tasks: List[Tuple[str, str]],
+        config: GenerationConfiguration,
+        jobs: int = 1,
+        output_files: Optional[OutputFiles] = None,
+    ) -> None:
+        self.tasks = tasks
+        self.config = config
+        self.jobs = jobs
+        self.output_files = output_files or OutputFiles()
+        self.generator = BatchGenerator(config)
+        # Files used by each result path
+        self._used_files: Dict[str, Set[str]] = {}
+        self._file_states = FileStates()
+
+    @property
+    def watched_files(self) -> List[str]:
+        return self._file_states.paths
+
+    def build(self) -> List[BatchResult]:
+        """Generate the documentation of all the schemas"""
+        copy_assets([result_path for _, result_path in self.tasks], self.config, self.output_files)
+        results = generate_all(self.tasks, self.config, self.jobs, self.output_files, self.generator)
+        self._record(results)
+        return results
+
+    def check(self) -> List[BatchResult]:
+        """Generate again the documentation using files that changed since the last check, if any"""
+        changed_files = self._file_states.get_changed()
+        if not changed_files:
+            return []
+
+        self.generator.forget(changed_files)
+        tasks = [task for task in self.tasks if self._used_files[task[1]] & changed_files]
+        results = generate_all(tasks, self.config, 1, self.output_files, self.generator)
+        self._record(results)
+        return results
+
+    def run(self, on_results: Callable[[List[BatchResult]], None], poll_interval: float = POLL_INTERVAL) -> None:
+        """Check for changes until interrupted, calling on_results after each new generation"""
+        while True:
+            time.sleep(poll_interval)
+            results = self.check()
+            if results:
+                on_results(results)
+
+    def _record(self, results: List[BatchResult]) -> None:
+        for result in results:
+            # URLs cannot be watched
+            used_files = {path for path in result.used_schemas if not path.startswith("http")}
+            self._used_files[result.result_path] = used_files
+            self._file_states.track(used_files)
@@ -0,0 +1,158 @@
+"""Run this to update the vendored jQuery and Bootstrap files used by the offline assets of the HTML templates.
+
+The files are downloaded from the XStatic packages on PyPI, checked against their known hashes, and trimmed: the
+Bootstrap stylesheet only keeps the rules for the classes that the templates and their scripts actually use. The
+result is written to vendor.min.css and vendor.min.js in the directories of the js and flat templates.
+
+Run it from the root folder, after changing the classes used by a template: python3 scripts/vendor_assets.py
+"""
+
+import hashlib
+import io
+import os
+import re
+import sys
+import tarfile
+import urllib.request
+import zipfile
+from typing import Iterable, List, Set
+
+current_dir = os.path.abspath(os.path.dirname(__file__))
+parent_dir = os.path.abspath(os.path.dirname(current_dir))
+sys.path.insert(0, parent_dir)
+
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY
+from json_schema_for_humans.offline_assets import VENDOR_CSS_FILE_NAME, VENDOR_JS_FILE_NAME
+
+PYPI_PACKAGES_URL = "https://files.pythonhosted.org/packages/"
+JQUERY_PACKAGE = (
+    "90/1d/0fcbe1089041e7ad5904001fd6a6f89bd5c4d2763db8ef9921811fcc4386/XStatic-jQuery-3.4.1.0.tar.gz",
+    "3fccac7eb265f95430c62eb652cdaeb671785267c77413df926d9facd5825978",
+)
+# Bootstrap 4.3.1, used by the CDN links of the templates, is not packaged on PyPI. 4.5.3 is the closest 4.x release.
+BOOTSTRAP_PACKAGE = (
+    "ba/3d/b67ae4343336beb54a030366ea0929f350670ca210e228523d7dc96db84b/xstatic_bootstrap-4.5.3.1-py3-none-any.whl",
+    "c869fa0293d7c8690fb83190478c35e24ce3f23a2c8a6d764ad0e48ca9fb8c6c",
+)
+# The slim build leaves out ajax and effects, that neither Bootstrap nor schema_doc.js use
+JQUERY_JS_PATH = "XStatic-jQuery-3.4.1.0/xstatic/pkg/jquery/data/jquery.slim.min.js"
+BOOTSTRAP_CSS_PATH = "xstatic/pkg/bootstrap/data/css/bootstrap.min.css"
+# Collapse and tabs, the only plugins used, do not need Popper.js
+BOOTSTRAP_JS_PATH = "xstatic/pkg/bootstrap/data/js/bootstrap.min.js"
+
+TEMPLATE_NAMES = ["js", "flat"]
+# Classes that are not in the templates: added by Bootstrap plugins, or to the HTML generated from Markdown
+RUNTIME_CLASSES = {"show", "collapsing", "collapsed", "active", "fade", "disabled", "highlight", "jumbotron"}
+
+CLASS_ATTRIBUTE_REGEXP = re.compile(r'class="([^"]*)"')
+JS_STRING_REGEXP = re.compile(r"\"([^\"\n]*)\"|'([^'\n]*)'")
+WORD_REGEXP = re.compile(r"-?[A-Za-z_][\w-]*")
+CLASS_SELECTOR_REGEXP = re.compile(r"\.(-?[A-Za-z_][\w-]*)")
+NOT_SELECTOR_REGEXP = re.compile(r":not\([^)]*\)")
+LICENSE_COMMENT_REGEXP = re.compile(r"/\*!.*?\*/\n?", re.DOTALL)
+
+
+def _download(package_path: str, sha256: str) -> bytes:
+    with urllib.request.urlopen(PYPI_PACKAGES_URL + package_path) as response:
+        content = response.read()
+    if hashlib.sha256(content).hexdigest() != sha256:
+        raise ValueError(f"Unexpected hash for {package_path}")
+    return content
+
+
+def _get_used_classes(template_directory: str) -> Set[str]:
+    """Get the classes that can be in a page rendered with a template: in its HTML files and its script"""
+    used_classes = set(RUNTIME_CLASSES)
+    for file_name in os.listdir(template_directory):
+        with open(os.path.join(template_directory, file_name), encoding="utf-8") as template_file:
+            content = template_file.read()
+        if file_name.endswith(".html"):
+            for class_attribute in CLASS_ATTRIBUTE_REGEXP.findall(content):
+                used_classes.update(WORD_REGEXP.findall(class_attribute))
+        elif file_name == "schema_doc.js":
+            # Any word in a string could be a class name or a selector
+            for string in JS_STRING_REGEXP.findall(content):
+                used_classes.update(WORD_REGEXP.findall("".join(string)))
+    return used_classes
+
+
+def _split_blocks(css: str) -> Iterable[List[str]]:
+    """Split minified CSS in [prelude, body] blocks, a body being the text between the braces following the prelude"""
+    position = 0
+    while position < len(css):
+        opening = css.find("{", position)
+        if opening == -1:
+            break
+        depth = 0
+        quote = None
+        for index in range(opening, len(css)):
+            character = css[index]
+            if quote:
+                if character == quote:
+                    quote = None
+            elif character in "\"'":
+                quote = character
+            elif character == "{":
+                depth += 1
+            elif character == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+        yield [css[position:opening], css[opening + 1 : index]]
+        position = index + 1
+
+
+def _is_selector_used(selector: str, used_classes: Set[str]) -> bool:
+    # A class in :not() does not need to be in the page for the selector to match
+    required_classes = CLASS_SELECTOR_REGEXP.findall(NOT_SELECTOR_REGEXP.sub("", selector))
+    return all(class_name in used_classes for class_name in required_classes)
+
+
+def purge_css(css: str, used_classes: Set[str]) -> str:
+    """Remove the rules of a minified stylesheet that only apply to classes that are not used"""
+    output = []
+    for prelude, body in _split_blocks(css):
+        prelude = prelude.strip()
+        if prelude.startswith("@media") or prelude.startswith("@supports"):
+            purged_body = purge_css(body, used_classes)
+            if purged_body:
+                output.append(f"{prelude}{{{purged_body}}}")
+        elif prelude.startswith("@"):
+            output.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [selector for selector in prelude.split(",") if _is_selector_used(selector, used_classes)]
+            if selectors:
+                output.append(f"{','.join(selectors)}{{{body}}}")
+    return "".join(output)
+
+
+def main() -> None:
+    with tarfile.open(fileobj=io.BytesIO(_download(*JQUERY_PACKAGE))) as jquery_package:
+        jquery_js = jquery_package.extractfile(JQUERY_JS_PATH).read().decode("utf-8")
+    with zipfile.ZipFile(io.BytesIO(_download(*BOOTSTRAP_PACKAGE))) as bootstrap_package:
+        bootstrap_css = bootstrap_package.read(BOOTSTRAP_CSS_PATH).decode("utf-8")
+        bootstrap_js = bootstrap_package.read(BOOTSTRAP_JS_PATH).decode("utf-8")
+
+    bootstrap_license = LICENSE_COMMENT_REGEXP.match(bootstrap_css).group(0).strip()
+    bootstrap_css = LICENSE_COMMENT_REGEXP.sub("", bootstrap_css)
+    # Source maps are not vendored
+    bootstrap_css = re.sub(r"/\*# sourceMappingURL=.*?\*/", "", bootstrap_css).strip()
+    bootstrap_js = re.sub(r"//# sourceMappingURL=.*", "", bootstrap_js).strip()
+    jquery_js = re.sub(r"//# sourceMappingURL=.*", "", jquery_js).strip()
+
+    for template_name in TEMPLATE_NAMES:
+        template_directory = os.path.join(DEFAULT_TEMPLATES_DIRECTORY, template_name)
+        used_classes = _get_used_classes(template_directory)
+
+        purged_css = purge_css(bootstrap_css, used_classes)
+        with open(os.path.join(template_directory, VENDOR_CSS_FILE_NAME), "w", encoding="utf-8") as css_file:
+            css_file.write(f"{bootstrap_license}\n{purged_css}\n")
+        print(f"{template_name}: kept {len(purged_css)} of {len(bootstrap_css)} characters of Bootstrap CSS")
+
+        if os.path.exists(os.path.join(template_directory, "schema_doc.js")):
+            with open(os.path.join(template_directory, VENDOR_JS_FILE_NAME), "w", encoding="utf-8") as js_file:
+                js_file.write(f"{jquery_js}\n{bootstrap_js}\n")
+
+
+if __name__ == "__main__":
+    main()
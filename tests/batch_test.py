@@ -0,0 +1,125 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from json_schema_for_humans.batch import find_schema_files, generate_batch, get_result_paths
+from json_schema_for_humans.generate import CSS_FILE_NAME, JS_FILE_NAME, generate_from_schema, main
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.output_files import OutputFiles
+from tests.cli_test import assert_cli_runner_result
+from tests.test_utils import get_test_case_path
+
+CASE_NAMES = ["basic", "with_definitions", "combining_oneOf", "recursive"]
+
+
+@pytest.fixture
+def schemas_directory(tmp_path: Path) -> Path:
+    """Directory with a few test cases, one of them in a sub directory"""
+    directory = tmp_path / "schemas"
+    (directory / "nested").mkdir(parents=True)
+    for case_name in CASE_NAMES:
+        shutil.copy(get_test_case_path(case_name), directory / f"{case_name}.json")
+    shutil.move(str(directory / "basic.json"), str(directory / "nested" / "basic.json"))
+    (directory / "notes.txt").write_text("Not a schema", encoding="utf-8")
+    return directory
+
+
+def test_find_schema_files(schemas_directory: Path) -> None:
+    """Test finding schema files in directories, with patterns and from paths, relative to their input"""
+    from_directory = find_schema_files([str(schemas_directory)])
+    from_pattern = find_schema_files([str(schemas_directory / "**" / "b*.json")])
+    from_file = find_schema_files([str(schemas_directory / "nested" / "basic.json")])
+
+    assert [relative_path for _, relative_path in from_directory] == [
+        "combining_oneOf.json",
+        os.path.join("nested", "basic.json"),
+        "recursive.json",
+        "with_definitions.json",
+    ]
+    assert from_pattern == [(str(schemas_directory / "nested" / "basic.json"), os.path.join("nested", "basic.json"))]
+    assert from_file == [(str(schemas_directory / "nested" / "basic.json"), "basic.json")]
+
+
+def test_find_schema_files_nothing_found(tmp_path: Path) -> None:
+    """Test that an input without schemas is an error"""
+    with pytest.raises(ValueError, match="No schema file found"):
+        find_schema_files([str(tmp_path / "*.json")])
+
+
+def test_result_paths(schemas_directory: Path) -> None:
+    """Test naming result files with a pattern, and that 2 schemas cannot have the same result file"""
+    schema_files = find_schema_files([str(schemas_directory)])
+    config = GenerationConfiguration(template_name="md")
+
+    result_paths = get_result_paths(schema_files, "docs", "{name}/README.{extension}", config)
+
+    assert result_paths[1] == os.path.join("docs", "basic", "README.md")
+    with pytest.raises(ValueError, match="would both be documented"):
+        get_result_paths(schema_files, "docs", "schema.{extension}", config)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_generate_batch(schemas_directory: Path, tmp_path: Path, jobs: int) -> None:
+    """Test that each schema of a batch is documented like on its own, with CSS and JS once per directory"""
+    config = GenerationConfiguration(deterministic_output=True)
+    output_directory = tmp_path / "docs"
+
+    results = generate_batch(
+        find_schema_files([str(schemas_directory)]), str(output_directory), config=config, jobs=jobs
+    )
+
+    assert [result.error for result in results] == [None] * len(CASE_NAMES)
+    for result in results:
+        expected = generate_from_schema(result.schema_path, config=config)
+        assert Path(result.result_path).read_text(encoding="utf-8") == expected
+    for directory in [output_directory, output_directory / "nested"]:
+        assert (directory / CSS_FILE_NAME).exists()
+        assert (directory / JS_FILE_NAME).exists()
+
+
+def test_generate_batch_error(schemas_directory: Path, tmp_path: Path) -> None:
+    """Test that a schema that cannot be documented does not stop the others"""
+    (schemas_directory / "broken.json").write_text("{", encoding="utf-8")
+    output_files = OutputFiles()
+
+    results = generate_batch(
+        find_schema_files([str(schemas_directory)]), str(tmp_path / "docs"), jobs=2, output_files=output_files
+    )
+
+    assert [Path(result.schema_path).name for result in results if result.error] == ["broken.json"]
+    assert len([path for path in output_files.written if path.endswith(".html")]) == len(CASE_NAMES)
+
+
+def test_generate_batch_using_cli(schemas_directory: Path) -> None:
+    """Test the summary and exit code of a batch generated with the CLI"""
+    (schemas_directory / "broken.json").write_text("{", encoding="utf-8")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(main, [str(schemas_directory), "--output-directory", "docs", "--jobs", "2"])
+
+        assert result.exit_code == 1
+        assert f"FAILED {schemas_directory / 'broken.json'}: JSONDecodeError" in result.output
+        assert f"Generated {len(CASE_NAMES)} of {len(CASE_NAMES) + 1} schemas" in result.output
+        assert Path("docs", "nested", "basic.html").exists()
+
+
+def test_several_schemas_without_output_directory() -> None:
+    """Test that several schemas can only be given with --output-directory"""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(main, [get_test_case_path("basic"), "doc.html", get_test_case_path("recursive")])
+
+        assert result.exit_code == 2
+        assert "--output-directory" in result.output
+
+
+def test_single_schema_using_cli() -> None:
+    """Test that a single schema is still documented to RESULT_FILE"""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        assert_cli_runner_result(runner.invoke(main, [get_test_case_path("basic"), "doc.html"]))
+
+        assert Path("doc.html").exists()
@@ -0,0 +1,174 @@
+from pathlib import Path
+
+import pytest
+
+from json_schema_for_humans.caching import ExampleHighlighter, LruCache, MarkdownConverter, PersistentCache
+from json_schema_for_humans.generate import (
+    _get_intermediate_representation,
+    _get_template,
+    _pre_render,
+    generate_from_schema,
+)
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
+from tests.test_utils import get_test_case_path
+
+MARKDOWN_OPTIONS = {"break-on-newline": True, "tables": None}
+
+
+class CountingMarkdownConverter(MarkdownConverter):
+    """Markdown converter counting actual conversions"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.converted_texts = []
+
+    def _convert(self, text: str) -> str:
+        self.converted_texts.append(text)
+        return super()._convert(text)
+
+
+def _generate(case_name: str, template_name: str, **config_options) -> str:
+    config = GenerationConfiguration(template_name=template_name, **config_options)
+    return GENERATED_TIMESTAMP_REGEXP.sub("", generate_from_schema(get_test_case_path(case_name), config=config))
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """Test that the LRU cache forgets the entry that was used the longest time ago"""
+    cache = LruCache(2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_lru_cache_disabled() -> None:
+    """Test that nothing is stored in a cache of size 0"""
+    cache = LruCache(0)
+    cache.put("a", "A")
+
+    assert cache.get("a") is None
+
+
+def test_persistent_cache(tmp_path: Path) -> None:
+    """Test that entries are shared between instances with the same key prefix only"""
+    PersistentCache(str(tmp_path), "v1").put("text", "converted\r\ntext")
+
+    assert PersistentCache(str(tmp_path), "v1").get("text") == "converted\r\ntext"
+    assert PersistentCache(str(tmp_path), "v2").get("text") is None
+    assert PersistentCache(str(tmp_path), "v1").get("other text") is None
+
+
+def test_markdown_converter_converts_each_text_once() -> None:
+    """Test that the same description is only converted once"""
+    converter = CountingMarkdownConverter(MARKDOWN_OPTIONS, cache_size=10)
+
+    first_conversion = converter.convert("Some *text*")
+    second_conversion = converter.convert("Some *text*")
+
+    assert first_conversion == second_conversion == "<p>Some <em>text</em></p>\n"
+    assert converter.converted_texts == ["Some *text*"]
+
+
+def test_markdown_converter_persistent_cache(tmp_path: Path) -> None:
+    """Test that a conversion done by one converter is reused by another one using the same cache directory"""
+    MarkdownConverter(MARKDOWN_OPTIONS, cache_directory=str(tmp_path)).convert("Some *text*")
+    converter = CountingMarkdownConverter(MARKDOWN_OPTIONS, cache_directory=str(tmp_path))
+
+    assert converter.convert("Some *text*") == "<p>Some <em>text</em></p>\n"
+    assert converter.converted_texts == []
+
+    other_options_converter = CountingMarkdownConverter({"tables": None}, cache_directory=str(tmp_path))
+    other_options_converter.convert("Some *text*")
+    assert other_options_converter.converted_texts == ["Some *text*"]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_markdown_converter_pre_convert(processes: int) -> None:
+    """Test that all distinct texts are converted ahead of time and kept even if the LRU cache is smaller"""
+    texts = [f"Text *{i % 60}*" for i in range(120)]
+    converter = CountingMarkdownConverter(MARKDOWN_OPTIONS, cache_size=1)
+
+    converter.pre_convert(texts, processes)
+    results = [converter.convert(text) for text in texts]
+
+    assert results == [f"<p>Text <em>{i % 60}</em></p>\n" for i in range(120)]
+    # With several processes, the conversions are done in the workers
+    assert converter.converted_texts == ([] if processes > 1 else texts[:60])
+
+
+def test_pre_converted_texts_are_forgotten_between_renders() -> None:
+    """Test that the texts converted ahead of a render are not kept for the next renders with the same template"""
+    config = GenerationConfiguration(pre_render_processes=1, description_is_markdown=True, markdown_cache_size=1)
+    template = _get_template(config, config.minify)
+    converter = template.environment.markdown_converter
+    intermediate_representation = _get_intermediate_representation(
+        get_test_case_path("description_markdown"), config, None
+    )
+
+    _pre_render(template, intermediate_representation, config)
+    assert converter._pre_converted
+    _pre_render(template, intermediate_representation, GenerationConfiguration(pre_render_processes=0))
+
+    assert not converter._pre_converted
+
+
+def test_example_highlighter(tmp_path: Path) -> None:
+    """Test that examples are highlighted once, also across highlighters sharing a cache directory"""
+    highlighter = ExampleHighlighter(None, cache_size=10, cache_directory=str(tmp_path))
+    highlighted = highlighter.convert('{"a": 1}')
+
+    assert highlighted.startswith('<div class="highlight"><pre>')
+    assert highlighter.convert('{"a": 1}') == highlighted
+    assert highlighter.cache.hits == 1
+    assert ExampleHighlighter(None, cache_directory=str(tmp_path)).persistent_cache.get('{"a": 1}') == highlighted
+
+
+@pytest.mark.parametrize("template_name", ["js", "flat"])
+def test_generate_with_caches(tmp_path: Path, template_name: str) -> None:
+    """Test that the documentation is the same whatever the caching options"""
+    for case_name in ["with_descriptions", "with_examples"]:
+        expected = _generate(case_name, template_name, markdown_cache_size=0, highlight_cache_size=0)
+
+        assert _generate(case_name, template_name, pre_render_processes=1) == expected
+        assert _generate(case_name, template_name, cache_directory=str(tmp_path)) == expected
+        assert _generate(case_name, template_name, cache_directory=str(tmp_path)) == expected
+
+    assert {path.name for path in tmp_path.iterdir()} == {"markdown", "examples"}
+
+
+@pytest.mark.parametrize("template_name", ["js", "flat"])
+@pytest.mark.parametrize("link_to_reused_ref", [True, False])
+def test_generate_with_fragment_cache(template_name: str, link_to_reused_ref: bool) -> None:
+    """Test that reusing the rendered content of definitions gives the same documentation"""
+    for case_name in ["with_definitions", "recursive", "references", "ref_merge", "description_with_ref"]:
+        expected = _generate(case_name, template_name, link_to_reused_ref=link_to_reused_ref, cache_fragments=False)
+
+        assert _generate(case_name, template_name, link_to_reused_ref=link_to_reused_ref) == expected
+
+
+def test_fragment_cache_reuses_rendered_definition() -> None:
+    """Test that a definition referenced several times is rendered only once"""
+    config = GenerationConfiguration(link_to_reused_ref=False)
+    template = _get_template(config, True)
+    intermediate_representation = _get_intermediate_representation(get_test_case_path("with_definitions"), config, None)
+    _pre_render(template, intermediate_representation, config)
+
+    "".join(template.generate(schema=intermediate_representation, config=config))
+
+    fragment_cache = template.environment.fragment_cache
+    assert (fragment_cache.hits, fragment_cache.misses) == (1, 1)
+
+
+def test_generate_description_is_not_markdown() -> None:
+    """Test that descriptions are rendered as-is when description_is_markdown is false"""
+    generated = _generate("with_descriptions", "js", description_is_markdown=False)
+
+    assert "Exact address" in generated
+    assert "<function" not in generated
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from json_schema_for_humans.compact_ids import to_base36
+from json_schema_for_humans.generate import generate_from_schema, generate_pages_from_schema
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
+from tests.test_utils import get_test_case_path
+
+COMPACT_CONFIG = {"template_js_options": {"compact_ids": True}}
+
+
+def _get_element_ids(page: BeautifulSoup) -> dict:
+    return json.loads(page.find(id="element-ids").string)
+
+
+def test_to_base36() -> None:
+    """Test writing numbers in base 36"""
+    assert [to_base36(number) for number in [0, 9, 10, 35, 36, 1295, 1296]] == ["0", "9", "a", "z", "10", "zz", "100"]
+
+
+@pytest.mark.parametrize(
+    "case_name", ["with_definitions", "combining_oneOf", "conditional_subschema", "recursive", "pattern_properties"]
+)
+def test_compact_ids(case_name: str) -> None:
+    """Test that elements have short ids, that the table of short ids resolves, and that there are no inline handlers"""
+    page_html = generate_from_schema(get_test_case_path(case_name), config=GenerationConfiguration(**COMPACT_CONFIG))
+    page = BeautifulSoup(page_html, "html.parser")
+
+    element_ids = _get_element_ids(page)
+    assert element_ids
+    for html_id, short_id in element_ids.items():
+        assert short_id.startswith("_")
+        assert page.find(id=short_id), html_id
+        assert not page.find(id=html_id)
+    for toggle in page.find_all(attrs={"data-toggle": "collapse"}):
+        if toggle.get("data-target", "").startswith("#"):
+            assert page.find(id=toggle["data-target"][1:])
+    assert "onclick=" not in page_html.replace('onclick="anchorOnLoad', "")
+
+
+def test_compact_ids_links_keep_html_ids() -> None:
+    """Test that links to properties still use the HTML ids made from paths"""
+    page = BeautifulSoup(
+        generate_from_schema(get_test_case_path("with_definitions"), config=GenerationConfiguration(**COMPACT_CONFIG)),
+        "html.parser",
+    )
+
+    breadcrumb_targets = {link["href"][1:] for link in page.select(".breadcrumbs a")}
+    assert "billing_address_street_address" in breadcrumb_targets
+    assert breadcrumb_targets <= set(_get_element_ids(page))
+
+
+def test_compact_ids_in_parallel() -> None:
+    """Test that short ids are the same when root properties are rendered in other processes"""
+    case_path = get_test_case_path("with_definitions")
+    expected = generate_from_schema(case_path, config=GenerationConfiguration(**COMPACT_CONFIG))
+
+    result = generate_from_schema(case_path, config=GenerationConfiguration(render_processes=2, **COMPACT_CONFIG))
+
+    assert GENERATED_TIMESTAMP_REGEXP.sub("", result) == GENERATED_TIMESTAMP_REGEXP.sub("", expected)
+
+
+def test_compact_ids_in_pages(tmp_path: Path) -> None:
+    """Test that each page only has the short ids of the elements it contains"""
+    config = GenerationConfiguration(**COMPACT_CONFIG)
+    pages = generate_pages_from_schema(get_test_case_path("with_definitions"), str(tmp_path), config=config)
+
+    for page_name in pages:
+        page = BeautifulSoup((tmp_path / page_name).read_text(encoding="utf-8"), "html.parser")
+        element_ids = _get_element_ids(page) if page.find(id="element-ids") else {}
+        for short_id in element_ids.values():
+            assert page.find(id=short_id)
+    billing_page = BeautifulSoup((tmp_path / "billing_address.html").read_text(encoding="utf-8"), "html.parser")
+    assert "shipping_address" not in _get_element_ids(billing_page)
+
+
+def test_compact_ids_disabled() -> None:
+    """Test that elements have the HTML ids made from paths by default"""
+    page = BeautifulSoup(
+        generate_from_schema(get_test_case_path("with_definitions"), config=GenerationConfiguration()), "html.parser"
+    )
+
+    assert not page.find(id="element-ids")
+    assert page.find(id="billing_address_street_address")
@@ -0,0 +1,94 @@
+import gzip
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from json_schema_for_humans.compression import (
+    BROTLI_EXTENSION,
+    GZIP_EXTENSION,
+    CompressedSidecars,
+    get_sidecar_extensions,
+)
+from json_schema_for_humans.generate import generate_from_filename, generate_pages_from_schema, main
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from tests.cli_test import assert_cli_runner_result
+from tests.test_utils import get_test_case_path
+
+
+def _decompress(path: Path) -> bytes:
+    if path.suffix == GZIP_EXTENSION:
+        return gzip.decompress(path.read_bytes())
+
+    import brotli
+
+    return brotli.decompress(path.read_bytes())
+
+
+def _assert_sidecars(path: Path) -> None:
+    for extension in get_sidecar_extensions():
+        assert _decompress(Path(str(path) + extension)) == path.read_bytes(), extension
+
+
+def test_compressed_sidecars(tmp_path: Path) -> None:
+    """Test that compressed copies of the result and of the copied files are written next to them"""
+    config = GenerationConfiguration(compress_output=True)
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"), config=config)
+
+    for file_name in ["schema_doc.html", "schema_doc.css", "schema_doc.min.js"]:
+        _assert_sidecars(tmp_path / file_name)
+
+
+def test_brotli_sidecar(tmp_path: Path) -> None:
+    """Test that a .br copy is written when the optional brotli package is installed"""
+    brotli = pytest.importorskip("brotli")
+    config = GenerationConfiguration(compress_output=True)
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"), config=config)
+
+    brotli_path = tmp_path / ("schema_doc.html" + BROTLI_EXTENSION)
+    assert brotli.decompress(brotli_path.read_bytes()) == (tmp_path / "schema_doc.html").read_bytes()
+
+
+def test_compressed_sidecars_of_pages(tmp_path: Path) -> None:
+    """Test that each page of a documentation split in pages has its compressed copies"""
+    config = GenerationConfiguration(compress_output=True, assets="bundle")
+    pages = generate_pages_from_schema(get_test_case_path("with_definitions"), str(tmp_path), config=config)
+
+    for page in pages:
+        _assert_sidecars(Path(page))
+    for bundle_file in tmp_path.glob("schema_doc.*.*s"):
+        _assert_sidecars(bundle_file)
+
+
+def test_compressed_sidecars_are_reproducible(tmp_path: Path) -> None:
+    """Test that compressing the same content gives the same files, so that they can be cached"""
+    contents = []
+    for directory_name in ["first", "second"]:
+        (tmp_path / directory_name).mkdir()
+        with CompressedSidecars(str(tmp_path / directory_name / "file.html"), 9) as sidecars:
+            sidecars.write(b"<html></html>" * 100)
+        contents.append((tmp_path / directory_name / "file.html.gz").read_bytes())
+
+    assert contents[0] == contents[1]
+
+
+def test_no_compressed_sidecars_by_default(tmp_path: Path) -> None:
+    """Test that no compressed copies are written by default"""
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"))
+
+    assert not list(tmp_path.glob("*" + GZIP_EXTENSION))
+    assert not list(tmp_path.glob("*" + BROTLI_EXTENSION))
+
+
+@pytest.mark.parametrize("level", ["1", "9"])
+def test_compress_using_cli(level: str) -> None:
+    """Test writing compressed copies from the CLI"""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(
+            main, ["--compress", "--compression-level", level, get_test_case_path("basic"), "schema_doc.html"]
+        )
+        assert_cli_runner_result(result)
+
+        _assert_sidecars(Path("schema_doc.html"))
+        _assert_sidecars(Path("schema_doc.min.js"))
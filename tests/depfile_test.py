@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from json_schema_for_humans.depfile import format_depfile
+from json_schema_for_humans.generate import main
+from tests.cli_test import assert_cli_runner_result
+
+
+def test_format_depfile() -> None:
+    """Test that paths are escaped and that URLs are listed apart from the rules"""
+    depfile = format_depfile(
+        {
+            "docs/my schema.html": ["/schemas/my schema.json", "https://example.com/common.json", "/schemas/$id.json"],
+            "docs/other.html": ["/schemas/other.json"],
+        }
+    )
+
+    assert depfile == (
+        "docs/my\\ schema.html: \\\n  /schemas/$$id.json \\\n  /schemas/my\\ schema.json\n"
+        "docs/other.html: \\\n  /schemas/other.json\n"
+        "\n# Schemas loaded from URLs\n# docs/my schema.html: https://example.com/common.json\n"
+    )
+
+
+def test_depfile_using_cli(tmp_path: Path) -> None:
+    """Test that the dependency file lists the referenced files, including when results were up to date"""
+    (tmp_path / "common.json").write_text(json.dumps({"type": "string"}), encoding="utf-8")
+    (tmp_path / "schema.json").write_text(json.dumps({"properties": {"name": {"$ref": "common.json"}}}), "utf-8")
+    runner = CliRunner()
+    depfile_path = tmp_path / "schema.d"
+    result_path = tmp_path / "schema.html"
+
+    assert_cli_runner_result(
+        runner.invoke(main, [str(tmp_path / "schema.json"), str(result_path), "--depfile", str(depfile_path)])
+    )
+    expected = f"{result_path}: \\\n  {tmp_path / 'common.json'} \\\n  {tmp_path / 'schema.json'}\n"
+    assert depfile_path.read_text(encoding="utf-8") == expected
+
+    depfile_path.unlink()
+    arguments = [str(tmp_path / "schema.json"), "--output-directory", str(tmp_path / "docs"), "--depfile"]
+    assert_cli_runner_result(runner.invoke(main, arguments + [str(depfile_path), "--incremental"]))
+    assert_cli_runner_result(runner.invoke(main, arguments + [str(tmp_path / "again.d"), "--incremental"]))
+    assert (tmp_path / "again.d").read_text(encoding="utf-8") == depfile_path.read_text(encoding="utf-8")
+    assert str(tmp_path / "common.json") in depfile_path.read_text(encoding="utf-8")
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from json_schema_for_humans import jinja_filters, templating_utils
+from json_schema_for_humans.generate import generate_from_schema
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.intermediate_representation import build_intermediate_representation
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
+from tests.test_utils import get_test_case_path
+
+# 2021-02-03 at 04:05:06 UTC
+FIXED_TIME = 1612325106
+
+
+def _write_schema(tmp_path: Path, schema: dict) -> str:
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(schema), encoding="utf-8")
+    return str(schema_path)
+
+
+@pytest.mark.parametrize("template_name", ["js", "flat", "md"])
+def test_deterministic_output(template_name: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the time is not written in the footer with deterministic_output"""
+    monkeypatch.delenv(jinja_filters.SOURCE_DATE_EPOCH_VARIABLE, raising=False)
+    config = GenerationConfiguration(template_name=template_name, deterministic_output=True)
+
+    result = generate_from_schema(get_test_case_path("with_definitions"), config=config)
+
+    assert not GENERATED_TIMESTAMP_REGEXP.search(result)
+    assert "json-schema-for-humans" in result
+    assert result == generate_from_schema(get_test_case_path("with_definitions"), config=config)
+
+
+@pytest.mark.parametrize("template_name", ["js", "md"])
+def test_generation_time(template_name: str) -> None:
+    """Test that the time of the footer can be fixed in the configuration"""
+    config = GenerationConfiguration(template_name=template_name, generation_time=FIXED_TIME)
+
+    result = generate_from_schema(get_test_case_path("basic"), config=config)
+
+    assert "on 2021-02-03 at 04:05:06 +0000" in result
+
+
+def test_source_date_epoch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the time of the footer is taken from SOURCE_DATE_EPOCH, unless it is fixed in the configuration"""
+    monkeypatch.setenv(jinja_filters.SOURCE_DATE_EPOCH_VARIABLE, str(FIXED_TIME))
+
+    assert jinja_filters.get_generation_time(GenerationConfiguration()) == "2021-02-03 at 04:05:06 +0000"
+    assert jinja_filters.get_generation_time(GenerationConfiguration(deterministic_output=True)).startswith("2021")
+    assert jinja_filters.get_generation_time(GenerationConfiguration(generation_time=0)).startswith("1970-01-01")
+
+
+def test_source_date_epoch_invalid(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an invalid SOURCE_DATE_EPOCH is an error instead of being ignored"""
+    monkeypatch.setenv(jinja_filters.SOURCE_DATE_EPOCH_VARIABLE, "yesterday")
+
+    with pytest.raises(ValueError, match="SOURCE_DATE_EPOCH"):
+        jinja_filters.get_generation_time(GenerationConfiguration())
+
+
+def test_undocumented_required_properties_order(tmp_path: Path) -> None:
+    """Test that undocumented required properties are in the order they are required"""
+    schema_path = _write_schema(
+        tmp_path, {"type": "object", "properties": {"b": {}}, "required": ["d", "b", "a", "c", "a"]}
+    )
+    schema_node = build_intermediate_representation(schema_path, GenerationConfiguration())
+
+    assert jinja_filters.get_undocumented_required_properties(schema_node) == ["d", "a", "c"]
+
+
+def test_enum_type_name_order(tmp_path: Path) -> None:
+    """Test that the types of an enum are in the order of the values"""
+    schema_path = _write_schema(tmp_path, {"enum": [3, "a", True, 4, "b", None]})
+    schema_node = build_intermediate_representation(schema_path, GenerationConfiguration())
+
+    assert templating_utils.get_type_name(schema_node) == "enum (of integer or string or boolean)"
@@ -12,9 +12,11 @@ from json_schema_for_humans.generate import (
     generate_from_file_object,
     generate_from_filename,
     generate_from_schema,
+    generate_stream_from_schema,
 )
 from json_schema_for_humans.generation_configuration import GenerationConfiguration, CONFIG_DEPRECATION_MESSAGE
 from tests.html_schema_doc_asserts import assert_basic_case
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
 from tests.test_utils import assert_css_and_js_not_copied, get_test_case_path
 
 
@@ -173,3 +175,15 @@ def test_generate_from_schema_config_object(tmp_path: Path, caplog: LogCaptureFi
 
     _assert_deprecation_message(caplog, False)
     assert_css_and_js_not_copied(tmp_path)
+
+
+@pytest.mark.parametrize("template_name", ["js", "flat", "md"])
+@pytest.mark.parametrize("minify", [True, False])
+def test_generate_stream_from_schema(template_name: str, minify: bool) -> None:
+    """Test that streaming the documentation gives the same result as rendering it all at once"""
+    config = GenerationConfiguration(template_name=template_name, minify=minify)
+
+    rendered = generate_from_schema(get_test_case_path("references"), minify=minify, config=config)
+    streamed = "".join(generate_stream_from_schema(get_test_case_path("references"), config=config))
+
+    assert GENERATED_TIMESTAMP_REGEXP.sub("", streamed) == GENERATED_TIMESTAMP_REGEXP.sub("", rendered)
@@ -0,0 +1,21 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from json_schema_for_humans.generate import generate_from_schema
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from tests.test_utils import get_test_case_path
+
+
+@pytest.mark.parametrize("runtime, expected_scripts", [("bootstrap", 4), ("vanilla", 2)])
+def test_js_runtime_scripts(runtime: str, expected_scripts: int) -> None:
+    """Test that jQuery and Bootstrap JS are only loaded by the page with the bootstrap runtime"""
+    config = GenerationConfiguration(template_js_options={"runtime": runtime})
+    page = BeautifulSoup(generate_from_schema(get_test_case_path("combining_oneOf"), config=config), "html.parser")
+
+    scripts = [script["src"] for script in page.find_all("script", src=True)]
+    assert len(scripts) == expected_scripts
+    assert "schema_doc.min.js" in scripts
+    assert any("jquery" in script for script in scripts) == (runtime == "bootstrap")
+    assert page.find("link", href=lambda href: "bootstrap.min.css" in href)
+    # The data attributes are the same with both runtimes
+    assert page.find(attrs={"data-toggle": "tab"})
@@ -0,0 +1,130 @@
+import gzip
+import json
+import re
+from pathlib import Path
+from typing import Match
+
+import pytest
+
+from json_schema_for_humans.generate import generate_from_filename, generate_from_schema
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.output_files import OutputFiles
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
+from tests.test_utils import get_test_case_path
+
+LAZY_SECTION_REGEXP = re.compile(r'<div class="lazy-section" data-section="[^"]*" data-src="([^"]*)"></div>')
+LAZY_CONFIG = {"template_js_options": {"lazy_sections": True}}
+
+
+def _load_sections(page: str, directory: Path) -> str:
+    """Replace the placeholders of lazy sections by their content, like schema_doc.js does once they are all shown"""
+
+    def _load_section(match: Match) -> str:
+        section_script = (directory / match.group(1)).read_text(encoding="utf-8")
+        section_source, html = json.loads("[" + section_script[len("sectionLoaded(") : -len(");\n")] + "]")
+        assert section_source == match.group(1)
+        return html
+
+    while LAZY_SECTION_REGEXP.search(page):
+        page = LAZY_SECTION_REGEXP.sub(_load_section, page)
+
+    return page
+
+
+@pytest.mark.parametrize("case_name", ["with_definitions", "combining_oneOf", "recursive", "array_advanced"])
+def test_lazy_sections(tmp_path: Path, case_name: str) -> None:
+    """Test that the page has the same content as when lazy sections are disabled, once all sections are loaded"""
+    lazy_config = GenerationConfiguration(minify=False, **LAZY_CONFIG)
+    generate_from_filename(get_test_case_path(case_name), str(tmp_path / "schema_doc.html"), config=lazy_config)
+
+    page = (tmp_path / "schema_doc.html").read_text(encoding="utf-8")
+    assert LAZY_SECTION_REGEXP.search(page)
+    assert (tmp_path / "schema_doc_sections" / "1.js").exists()
+
+    expected = generate_from_schema(get_test_case_path(case_name), minify=False, config=GenerationConfiguration())
+    assert GENERATED_TIMESTAMP_REGEXP.sub("", _load_sections(page, tmp_path)) == GENERATED_TIMESTAMP_REGEXP.sub(
+        "", expected
+    )
+
+
+def test_lazy_sections_minified(tmp_path: Path) -> None:
+    """Test that the content of lazy sections is minified along with the page"""
+    generate_from_filename(
+        get_test_case_path("with_definitions"),
+        str(tmp_path / "schema_doc.html"),
+        config=GenerationConfiguration(**LAZY_CONFIG),
+    )
+
+    for section_path in (tmp_path / "schema_doc_sections").glob("*.js"):
+        assert "\\n " not in section_path.read_text(encoding="utf-8")
+
+
+def test_lazy_sections_of_previous_render_removed(tmp_path: Path) -> None:
+    """Test that section files written by a previous render of a page that had more sections are removed"""
+    config = GenerationConfiguration(**LAZY_CONFIG)
+    generate_from_filename(get_test_case_path("array_advanced"), str(tmp_path / "schema_doc.html"), config=config)
+    sections_directory = tmp_path / "schema_doc_sections"
+    (sections_directory / "999.js").write_text("sectionLoaded();\n", encoding="utf-8")
+    (sections_directory / "999.js.gz").write_bytes(b"")
+    (sections_directory / "notes.txt").write_text("Not a section", encoding="utf-8")
+
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"), config=config)
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "fresh.html"), config=config)
+
+    section_files = {path.name for path in sections_directory.iterdir()}
+    assert section_files == {path.name for path in (tmp_path / "fresh_sections").iterdir()} | {"notes.txt"}
+    assert "999.js" not in section_files
+
+
+def test_lazy_sections_unchanged(tmp_path: Path) -> None:
+    """Test that section files are counted with the written files, and not written again when they did not change"""
+    config = GenerationConfiguration(**LAZY_CONFIG)
+    output_files = OutputFiles()
+    result_path = str(tmp_path / "schema_doc.html")
+    generate_from_filename(
+        get_test_case_path("with_definitions"), result_path, config=config, output_files=output_files
+    )
+    section_paths = sorted(str(path) for path in (tmp_path / "schema_doc_sections").glob("*.js"))
+    assert section_paths
+    assert set(section_paths) <= set(output_files.written)
+
+    output_files = OutputFiles()
+    generate_from_filename(
+        get_test_case_path("with_definitions"), result_path, config=config, output_files=output_files
+    )
+    assert set(section_paths) <= set(output_files.unchanged)
+    assert not set(section_paths) & set(output_files.written)
+
+
+def test_lazy_sections_compressed(tmp_path: Path) -> None:
+    """Test that section files get compressed copies, removed along with them when they are not written anymore"""
+    config = GenerationConfiguration(compress_output=True, **LAZY_CONFIG)
+    generate_from_filename(get_test_case_path("array_advanced"), str(tmp_path / "schema_doc.html"), config=config)
+    sections_directory = tmp_path / "schema_doc_sections"
+    section_file_names = {path.name for path in sections_directory.glob("*.js")}
+    assert {path.name[: -len(".gz")] for path in sections_directory.glob("*.js.gz")} == section_file_names
+    section_path = next(sections_directory.glob("*.js"))
+    assert gzip.decompress((sections_directory / f"{section_path.name}.gz").read_bytes()) == section_path.read_bytes()
+
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"), config=config)
+    section_file_names = {path.name for path in sections_directory.glob("*.js")}
+    assert {path.name[: -len(".gz")] for path in sections_directory.glob("*.js.gz")} == section_file_names
+
+
+def test_lazy_sections_without_result_file() -> None:
+    """Test that sections are rendered in the page when there is no result file to write them next to"""
+    case_path = get_test_case_path("with_definitions")
+
+    lazy_result = generate_from_schema(case_path, config=GenerationConfiguration(**LAZY_CONFIG))
+
+    assert GENERATED_TIMESTAMP_REGEXP.sub("", lazy_result) == GENERATED_TIMESTAMP_REGEXP.sub(
+        "", generate_from_schema(case_path, config=GenerationConfiguration())
+    )
+
+
+def test_lazy_sections_disabled(tmp_path: Path) -> None:
+    """Test that no section is written by default"""
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"))
+
+    assert not LAZY_SECTION_REGEXP.search((tmp_path / "schema_doc.html").read_text(encoding="utf-8"))
+    assert not (tmp_path / "schema_doc_sections").exists()
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from json_schema_for_humans.batch import BatchGenerator
+from json_schema_for_humans.generate import main
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.manifest import MANIFEST_FILE_NAME, BuildManifest, get_config_fingerprint
+from tests.cli_test import assert_cli_runner_result
+
+
+@pytest.fixture
+def schema_path(tmp_path: Path) -> str:
+    """Schema referencing another file"""
+    (tmp_path / "common.json").write_text(json.dumps({"type": "string", "description": "Name"}), encoding="utf-8")
+    (tmp_path / "schema.json").write_text(json.dumps({"properties": {"name": {"$ref": "common.json"}}}), "utf-8")
+    return str(tmp_path / "schema.json")
+
+
+def _generate(schema_path: str, result_path: str, config: GenerationConfiguration, manifest: BuildManifest) -> None:
+    result = BatchGenerator(config).generate(schema_path, result_path)
+    manifest.record(schema_path, result_path, result.used_schemas)
+    manifest.save()
+
+
+def test_manifest(schema_path: str, tmp_path: Path) -> None:
+    """Test that a result is up to date until a schema it references, the result or the configuration changes"""
+    config = GenerationConfiguration()
+    result_path = str(tmp_path / "docs" / "schema.html")
+    (tmp_path / "docs").mkdir()
+    _generate(schema_path, result_path, config, BuildManifest(str(tmp_path / "docs"), config))
+
+    assert BuildManifest(str(tmp_path / "docs"), config).is_up_to_date(schema_path, result_path)
+    assert not BuildManifest(str(tmp_path / "docs"), config).is_up_to_date(schema_path, result_path + ".other")
+    assert not BuildManifest(str(tmp_path / "docs"), GenerationConfiguration(expand_buttons=True)).is_up_to_date(
+        schema_path, result_path
+    )
+    assert not BuildManifest(str(tmp_path / "docs"), GenerationConfiguration(template_name="flat")).is_up_to_date(
+        schema_path, result_path
+    )
+
+    (tmp_path / "common.json").write_text(json.dumps({"type": "integer"}), encoding="utf-8")
+    assert not BuildManifest(str(tmp_path / "docs"), config).is_up_to_date(schema_path, result_path)
+
+
+def test_manifest_result_changed(schema_path: str, tmp_path: Path) -> None:
+    """Test that a result that was changed or deleted is out of date"""
+    config = GenerationConfiguration()
+    result_path = tmp_path / "schema.html"
+    _generate(schema_path, str(result_path), config, BuildManifest(str(tmp_path), config))
+
+    result_path.write_text("Edited", encoding="utf-8")
+    assert not BuildManifest(str(tmp_path), config).is_up_to_date(schema_path, str(result_path))
+    result_path.unlink()
+    assert not BuildManifest(str(tmp_path), config).is_up_to_date(schema_path, str(result_path))
+
+
+def test_config_fingerprint() -> None:
+    """Test that options that do not change the result do not change the fingerprint of the configuration"""
+    fingerprint = get_config_fingerprint(GenerationConfiguration())
+
+    assert get_config_fingerprint(GenerationConfiguration(render_processes=4, markdown_cache_size=0)) == fingerprint
+    assert get_config_fingerprint(GenerationConfiguration(minify=False)) != fingerprint
+
+
+def test_incremental_using_cli(schema_path: str, tmp_path: Path) -> None:
+    """Test that --incremental only generates out of date results, and that --check reports them"""
+    arguments = [str(tmp_path / "*.json"), "--output-directory", str(tmp_path / "docs")]
+    runner = CliRunner()
+
+    result = runner.invoke(main, arguments + ["--check"])
+    assert result.exit_code == 1
+    assert "2 of 2 results are out of date" in result.output
+
+    assert_cli_runner_result(runner.invoke(main, arguments + ["--incremental"]))
+    assert (tmp_path / "docs" / MANIFEST_FILE_NAME).exists()
+    result = runner.invoke(main, arguments + ["--incremental"])
+    assert_cli_runner_result(result)
+    assert "2 of 2 results were up to date" in result.output
+    assert_cli_runner_result(runner.invoke(main, arguments + ["--check"]))
+
+    (tmp_path / "common.json").write_text(json.dumps({"type": "integer"}), encoding="utf-8")
+    result = runner.invoke(main, arguments + ["--check"])
+    assert result.exit_code == 1
+    assert f"Out of date: {tmp_path / 'docs' / 'common.html'}" in result.output
+    assert f"Out of date: {tmp_path / 'docs' / 'schema.html'}" in result.output
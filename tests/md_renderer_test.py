@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from json_schema_for_humans.generate import generate_from_schema
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
+from tests.test_utils import get_test_case_path
+
+current_dir = os.path.abspath(os.path.dirname(__file__))
+cases_dir = os.path.join(os.path.dirname(current_dir), "docs", "examples", "cases")
+CASE_NAMES = sorted(
+    os.path.splitext(file_name)[0]
+    for file_name in os.listdir(cases_dir)
+    if file_name.endswith(".json") and "url" not in file_name
+)
+
+
+def _generate(case_name: str, **config_options) -> str:
+    config = GenerationConfiguration(**config_options)
+    return GENERATED_TIMESTAMP_REGEXP.sub(
+        "", generate_from_schema(get_test_case_path(case_name), config=config, minify=config.minify)
+    )
+
+
+@pytest.mark.parametrize("case_name", CASE_NAMES)
+@pytest.mark.parametrize(
+    "config_options",
+    [
+        {},
+        {"minify": False, "show_breadcrumbs": False, "link_to_reused_ref": False},
+        {
+            "deprecated_from_description": True,
+            "default_from_description": True,
+            "template_md_options": {"badge_as_image": True},
+        },
+    ],
+)
+def test_python_renderer(case_name: str, config_options: dict) -> None:
+    """Test that the python renderer gives the same documentation as the md template"""
+    expected = _generate(case_name, template_name="md", **config_options)
+
+    assert _generate(case_name, template_name="md", renderer="python", **config_options) == expected
+
+
+def test_python_renderer_other_templates() -> None:
+    """Test that templates other than md are still rendered with Jinja"""
+    assert _generate("basic", template_name="js", renderer="python") == _generate("basic", template_name="js")
@@ -0,0 +1,83 @@
+from json_schema_for_humans.generate import _get_intermediate_representation
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.md_template import MarkdownTemplate
+from tests.test_utils import get_test_case_path
+
+
+def _plan_headings(case_name: str):
+    config = GenerationConfiguration(template_name="md")
+    md_template = MarkdownTemplate(config)
+    intermediate_representation = _get_intermediate_representation(get_test_case_path(case_name), config, None)
+
+    return md_template, md_template.plan_headings(intermediate_representation), intermediate_representation
+
+
+def test_plan_headings_toc() -> None:
+    """Test that the table of contents is known before anything is rendered"""
+    md_template, _, _ = _plan_headings("with_definitions")
+
+    assert md_template.get_toc() == (
+        "- [1. [Optional] Property `root > billing_address`](#billing_address)\n"
+        "  - [1.1. [Required] Property `root > billing_address > street_address`](#billing_address_street_address)\n"
+        "  - [1.2. [Required] Property `root > billing_address > city`](#billing_address_city)\n"
+        "  - [1.3. [Required] Property `root > billing_address > state`](#billing_address_state)\n"
+        "  - [1.4. [Optional] Property `root > billing_address > futureProperty`](#billing_address_futureProperty)\n"
+        "- [2. [Optional] Property `root > shipping_address`](#shipping_address)\n"
+    )
+
+
+def test_heading_lookup_in_any_order() -> None:
+    """Test that headings can be looked up in any order, as many times as needed"""
+    md_template, headings, intermediate_representation = _plan_headings("with_definitions")
+    billing_address = intermediate_representation.properties["billing_address"]
+    shipping_address = intermediate_representation.properties["shipping_address"]
+    city = billing_address.refers_to_merged.properties["city"]
+
+    billing_address_headings = md_template.nested_headings(headings, "property", billing_address)
+    assert md_template.heading(billing_address_headings, "property", city) == (
+        '### <a name="billing_address_city"></a>1.2. [Required] Property `root > billing_address > city`'
+    )
+    assert md_template.heading(headings, "property", shipping_address) == (
+        '## <a name="shipping_address"></a>2. [Optional] Property `root > shipping_address`'
+    )
+    assert md_template.heading(headings, "property", billing_address) == (
+        '## <a name="billing_address"></a>1. [Optional] Property `root > billing_address`'
+    )
+    assert md_template.heading(headings, "title") == "# Schema Docs"
+    assert md_template.heading(headings, "property", shipping_address) == (
+        '## <a name="shipping_address"></a>2. [Optional] Property `root > shipping_address`'
+    )
+
+
+def test_generate_table() -> None:
+    """Test that columns are padded to the longest cell, unless tables are compact"""
+    table = [["Property", "Type"], ["+ [a](#a)", "string"], ["- [long_name](#long_name)", "integer"]]
+
+    assert MarkdownTemplate(GenerationConfiguration(template_name="md")).generate_table(table) == (
+        "| Property                  | Type    |\n"
+        "| ------------------------- | ------- |\n"
+        "| + [a](#a)                 | string  |\n"
+        "| - [long_name](#long_name) | integer |\n"
+        "|                           |         |\n"
+    )
+    compact_config = GenerationConfiguration(template_name="md", template_md_options={"compact_tables": True})
+    assert MarkdownTemplate(compact_config).generate_table(table) == (
+        "| Property | Type |\n"
+        "| --- | --- |\n"
+        "| + [a](#a) | string |\n"
+        "| - [long_name](#long_name) | integer |\n"
+        "|  |  |\n"
+    )
+
+
+def test_properties_table_required() -> None:
+    """Test that required properties are the same as when asking each property if it is required"""
+    md_template, _, intermediate_representation = _plan_headings("with_definitions")
+    billing_address = intermediate_representation.properties["billing_address"].refers_to_merged
+
+    properties_table = md_template.properties_table(billing_address)
+
+    assert [row[0][0] for row in properties_table[1:]] == [
+        "+" if sub_property.is_required_property else "-" for sub_property in billing_address.iterate_properties
+    ]
+    assert [row[0][0] for row in properties_table[1:]] == ["+", "+", "+", "-"]
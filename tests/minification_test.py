@@ -0,0 +1,140 @@
+import os
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+from json_schema_for_humans.generate import _get_intermediate_representation, _get_template, generate_from_schema
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.minification import BlankLinesCollapser, HtmlMinifier, minify_chunks
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
+from tests.test_utils import get_test_case_path
+
+HTML_DOCUMENT = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <title>  A   title </title>
+</head>
+<body>
+    <div class="a   b"   id="first">
+        Some    text
+        <span>with</span>   <span>spaces</span>
+    </div>
+    <pre>
+  keep    this
+    </pre>
+    <p>a  <!-- a   comment -->  b<br  /></p>
+    <script>
+        if (a  <b) {}
+    </script>
+    <textarea>  some  input  </textarea>
+</body>
+</html>"""
+
+MD_DOCUMENT = "# Title\n\n\n   \nSome text  \n  \n\n- item\n    \n\n\n"
+
+
+def _split(text: str, chunk_size: int):
+    return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_blank_lines_collapser_same_as_whole_document(chunk_size: int) -> None:
+    """Test that collapsing empty lines chunk by chunk gives the same result as on the whole document"""
+    collapser = BlankLinesCollapser()
+    result = "".join(collapser.input(chunk) for chunk in _split(MD_DOCUMENT, chunk_size)) + collapser.finalize()
+
+    assert result == re.sub(r"\n\s*\n", "\n\n", MD_DOCUMENT)
+
+
+def _minify_html(html: str, chunk_size: int) -> str:
+    minifier = HtmlMinifier()
+    return "".join(minifier.input(chunk) for chunk in _split(html, chunk_size)) + minifier.finalize()
+
+
+def _assert_same_dom(html: str, expected_html: str) -> None:
+    assert BeautifulSoup(html, "html.parser") == BeautifulSoup(expected_html, "html.parser")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_html_minifier_same_as_whole_document(chunk_size: int) -> None:
+    """Test that minifying HTML chunk by chunk gives the same result as on the whole document"""
+    assert _minify_html(HTML_DOCUMENT, chunk_size) == _minify_html(HTML_DOCUMENT, len(HTML_DOCUMENT))
+
+
+def test_html_minifier() -> None:
+    """Test that whitespace is collapsed except where it matters"""
+    assert _minify_html(HTML_DOCUMENT, 1000) == (
+        "<!DOCTYPE html><html lang=en> <head><title>A title</title></head> "
+        '<body> <div class="a   b" id=first> Some text <span>with</span> <span>spaces</span> </div> '
+        "<pre>\n  keep    this\n    </pre> <p>a <!-- a   comment --> b<br></p> "
+        "<script>\n        if (a  <b) {}\n    </script> <textarea>  some  input  </textarea> </body> </html>"
+    )
+
+
+def test_html_minifier_attribute_quotes() -> None:
+    """Test that quotes are only removed from attribute values that do not need them, like htmlmin does"""
+    html = (
+        """<a href="page.html#id" title="a b" data-x='"' data-y="a=b" data-z="" onclick="f('x')" id="a"/>"""
+        """<input value="x"disabled><br class="c"/><p class='d'><img src=a/>"""
+    )
+
+    assert _minify_html(html, 1000) == (
+        """<a href=page.html#id title="a b" data-x='"' data-y="a=b" data-z onclick="f('x')" id="a"/>"""
+        """<input value="x"disabled><br class=c><p class=d><img src=a/>"""
+    )
+    _assert_same_dom(_minify_html(html, 3), html)
+
+
+def test_html_minifier_same_dom_as_htmlmin() -> None:
+    """Test that the minified document is the same as the one htmlmin, which was used before, produces"""
+    htmlmin = pytest.importorskip("htmlmin")
+
+    _assert_same_dom(_minify_html(HTML_DOCUMENT, 7), htmlmin.minify(HTML_DOCUMENT))
+
+
+@pytest.mark.parametrize("template_name", ["js", "flat"])
+@pytest.mark.parametrize(
+    "case_name",
+    [
+        "with_definitions",
+        "with_examples",
+        "with_descriptions",
+        "recursive",
+        "combining_oneOf",
+        "with_keywords",
+        "array_advanced",
+    ],
+)
+def test_generated_documentation_same_dom_as_htmlmin(template_name: str, case_name: str) -> None:
+    """Test that minifying generated documentation, with whitespace collapsed by the templates, gives the same result
+    as htmlmin on the plain rendered templates
+    """
+    htmlmin = pytest.importorskip("htmlmin")
+
+    schema_path = get_test_case_path(case_name)
+    config = GenerationConfiguration(template_name=template_name)
+    intermediate_representation = _get_intermediate_representation(schema_path, config, None)
+    rendered = _get_template(config, False).render(schema=intermediate_representation, config=config)
+
+    minified = generate_from_schema(schema_path, config=config)
+
+    _assert_same_dom(
+        GENERATED_TIMESTAMP_REGEXP.sub("", minified), GENERATED_TIMESTAMP_REGEXP.sub("", htmlmin.minify(rendered))
+    )
+
+
+def test_minify_chunks_yields_as_it_goes() -> None:
+    """Test that the minified result is available before all chunks have been consumed"""
+    consumed = []
+
+    def _chunks():
+        for chunk in ["<div>    a</div>\n" * 10000, "<div>b</div>"]:
+            consumed.append(chunk)
+            yield chunk
+
+    minified_chunks = minify_chunks(_chunks(), "js")
+    first_chunk = next(minified_chunks)
+
+    assert first_chunk.startswith("<div> a</div> <div> a</div>")
+    assert len(consumed) == 1
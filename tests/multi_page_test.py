@@ -0,0 +1,111 @@
+import re
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+from click.testing import CliRunner
+
+from json_schema_for_humans.generate import generate_pages_from_schema, main
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.multi_page import get_pages
+from json_schema_for_humans.schema_node import SchemaNode
+from tests.cli_test import assert_cli_runner_result
+from tests.test_utils import assert_css_and_js_copied, get_test_case_path
+
+
+def _get_page(path: Path) -> BeautifulSoup:
+    return BeautifulSoup(path.read_text(encoding="utf-8"), "html.parser")
+
+
+def test_generate_pages(tmp_path: Path) -> None:
+    """Test that there is an index page linking to one page per root property"""
+    written_paths = generate_pages_from_schema(
+        get_test_case_path("with_definitions"), tmp_path, config=GenerationConfiguration(minify=False)
+    )
+
+    assert [Path(path).name for path in written_paths] == [
+        "index.html",
+        "billing_address.html",
+        "shipping_address.html",
+    ]
+    assert_css_and_js_copied(tmp_path)
+
+    index_page = _get_page(tmp_path / "index.html")
+    assert [link["href"] for link in index_page.select(".pages a")] == [
+        "billing_address.html#billing_address",
+        "shipping_address.html#shipping_address",
+    ]
+    assert not index_page.select(".property-name")
+
+    shipping_address_page = _get_page(tmp_path / "shipping_address.html")
+    assert [name.text for name in shipping_address_page.select(".property-name")] == ["shipping_address"]
+    assert shipping_address_page.select_one(".ref-link")["href"] == "billing_address.html#billing_address"
+    assert shipping_address_page.select_one(".index-link a")["href"] == "index.html"
+
+
+@pytest.mark.parametrize("link_to_reused_ref", [True, False])
+@pytest.mark.parametrize("template_name", ["js", "flat"])
+@pytest.mark.parametrize("case_name", ["with_definitions", "references", "recursive", "recursive_parent_in_definition"])
+def test_generate_pages_links(tmp_path: Path, template_name: str, case_name: str, link_to_reused_ref: bool) -> None:
+    """Test that all links point to an element of the target page, the current page for links to an anchor only"""
+    config = GenerationConfiguration(template_name=template_name, minify=False, link_to_reused_ref=link_to_reused_ref)
+    written_paths = generate_pages_from_schema(get_test_case_path(case_name), tmp_path, config=config)
+
+    for written_path in written_paths:
+        for link in _get_page(Path(written_path)).find_all("a", href=re.compile(r"^([^#:/]+\.html)?#.")):
+            page_name, html_id = link["href"].split("#")
+            target_page = _get_page(tmp_path / page_name) if page_name else _get_page(Path(written_path))
+            assert target_page.find(id=html_id), f"{link['href']} not found from {written_path}"
+
+
+def test_generate_pages_in_parallel(tmp_path: Path) -> None:
+    """Test that rendering the pages of root properties in other processes gives the same pages"""
+    case_path = get_test_case_path("with_definitions")
+    generate_pages_from_schema(case_path, tmp_path / "one_process", config=GenerationConfiguration(minify=False))
+    generate_pages_from_schema(
+        case_path, tmp_path / "parallel", config=GenerationConfiguration(minify=False, render_processes=2)
+    )
+
+    for page_path in (tmp_path / "one_process").glob("*.html"):
+        assert _get_page(page_path).body == _get_page(tmp_path / "parallel" / page_path.name).body
+
+
+def test_generate_pages_not_supported(tmp_path: Path) -> None:
+    """Test that the Markdown template is written to a single index page"""
+    written_paths = generate_pages_from_schema(
+        get_test_case_path("with_definitions"), tmp_path, config=GenerationConfiguration(template_name="md")
+    )
+
+    assert written_paths == [str(tmp_path / "index.md")]
+    assert "billing_address" in (tmp_path / "index.md").read_text(encoding="utf-8")
+
+
+def test_get_pages_names() -> None:
+    """Test that pages do not overwrite the index or each other"""
+    root = SchemaNode(0, "schema.json", [], "root", "root")
+    for property_name, html_id in [("index", "index"), ("a", "a"), ("A", "A"), ("a.", "a_"), ("a_", "a_")]:
+        root.properties[property_name] = SchemaNode(
+            1, "schema.json", [property_name], html_id, property_name, parent=root, parent_key=property_name
+        )
+
+    assert get_pages(GenerationConfiguration(), root) == {
+        "index": "index_2.html",
+        "a": "a.html",
+        "A": "A_2.html",
+        "a_": "a_.html",
+    }
+
+
+def test_generate_pages_using_cli() -> None:
+    """Test writing pages to a directory from the CLI"""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(main, [get_test_case_path("with_definitions"), "--pages-directory", "docs"])
+        assert_cli_runner_result(result)
+
+        assert sorted(path.name for path in Path("docs").glob("*.html")) == [
+            "billing_address.html",
+            "index.html",
+            "shipping_address.html",
+        ]
+        assert not Path("schema_doc.html").exists()
@@ -0,0 +1,114 @@
+import os
+import re
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from json_schema_for_humans.generate import generate_from_filename, generate_pages_from_schema
+from json_schema_for_humans.generation_configuration import DEFAULT_TEMPLATES_DIRECTORY, GenerationConfiguration
+from json_schema_for_humans.offline_assets import VENDOR_CSS_FILE_NAME, OfflineAssets
+from tests.test_utils import get_test_case_path
+
+BUNDLE_FILE_REGEXP = re.compile(r"schema_doc\.[0-9a-f]{10}\.(css|js)")
+
+
+def _get_external_urls(page: BeautifulSoup) -> list:
+    return [
+        element.get("href") or element.get("src")
+        for element in page.find_all(["link", "script"])
+        if element.get("href") or element.get("src")
+    ]
+
+
+@pytest.mark.parametrize("template_name", ["js", "flat"])
+def test_inline_assets(tmp_path: Path, template_name: str) -> None:
+    """Test that the page does not need any other file with inline assets"""
+    config = GenerationConfiguration(template_name=template_name, assets="inline")
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"), config=config)
+
+    assert os.listdir(tmp_path) == ["schema_doc.html"]
+    page = BeautifulSoup((tmp_path / "schema_doc.html").read_text(encoding="utf-8"), "html.parser")
+    assert _get_external_urls(page) == []
+    assert "Bootstrap v4" in page.find("style").string
+    assert ".generated-by-footer" in page.find("style").string
+    if template_name == "js":
+        assert "function anchorOnLoad" in page.find("script").string
+    else:
+        assert not page.find("script")
+
+
+def test_bundle_assets(tmp_path: Path) -> None:
+    """Test that the page links to hashed CSS and JS files written next to it"""
+    config = GenerationConfiguration(assets="bundle")
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"), config=config)
+
+    page = BeautifulSoup((tmp_path / "schema_doc.html").read_text(encoding="utf-8"), "html.parser")
+    bundle_files = _get_external_urls(page)
+    assert len(bundle_files) == 2
+    assert all(BUNDLE_FILE_REGEXP.fullmatch(file_name) for file_name in bundle_files)
+    assert sorted(os.listdir(tmp_path)) == sorted(["schema_doc.html"] + bundle_files)
+    assert not page.find("style")
+
+
+def test_bundle_assets_shared_by_pages(tmp_path: Path) -> None:
+    """Test that all pages of a documentation split in pages use the same bundle"""
+    config = GenerationConfiguration(assets="bundle", minify=False)
+    pages = generate_pages_from_schema(get_test_case_path("with_definitions"), str(tmp_path), config=config)
+
+    assert len(pages) > 1
+    bundle_files = {file_name for file_name in os.listdir(tmp_path) if BUNDLE_FILE_REGEXP.fullmatch(file_name)}
+    assert len(bundle_files) == 2
+    for page in pages:
+        page_soup = BeautifulSoup((tmp_path / page).read_text(encoding="utf-8"), "html.parser")
+        assert set(_get_external_urls(page_soup)) == bundle_files
+
+
+def test_bundle_file_names_change_with_content() -> None:
+    """Test that the names of bundle files are different for different contents"""
+    js_bundle_names = OfflineAssets(GenerationConfiguration(assets="bundle")).get_bundle_file_names()
+    flat_bundle_names = OfflineAssets(
+        GenerationConfiguration(assets="bundle", template_name="flat")
+    ).get_bundle_file_names()
+
+    assert set(js_bundle_names) == {".css", ".js"}
+    assert set(flat_bundle_names) == {".css"}
+    assert js_bundle_names[".css"] != flat_bundle_names[".css"]
+
+
+def test_vendored_css_is_trimmed() -> None:
+    """Test that the vendored Bootstrap stylesheet only keeps the rules for the classes used by the template"""
+    with open(os.path.join(DEFAULT_TEMPLATES_DIRECTORY, "js", VENDOR_CSS_FILE_NAME), encoding="utf-8") as css_file:
+        vendored_css = css_file.read()
+
+    assert ".collapse:not(.show){display:none}" in vendored_css
+    assert ".nav-tabs" in vendored_css
+    assert ".dropdown-menu" not in vendored_css
+    assert ".carousel" not in vendored_css
+
+
+def test_cdn_assets(tmp_path: Path) -> None:
+    """Test that the page links to the CDNs and to the files of the template by default"""
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"))
+
+    page = BeautifulSoup((tmp_path / "schema_doc.html").read_text(encoding="utf-8"), "html.parser")
+    assert "schema_doc.css" in _get_external_urls(page)
+    assert "https://code.jquery.com/jquery-3.4.1.min.js" in _get_external_urls(page)
+    assert sorted(os.listdir(tmp_path)) == ["schema_doc.css", "schema_doc.html", "schema_doc.min.js"]
+
+
+def test_unknown_assets_mode() -> None:
+    """Test that an unknown assets mode is reported"""
+    with pytest.raises(ValueError, match="Unknown assets mode"):
+        OfflineAssets(GenerationConfiguration(assets="local"))
+
+
+def test_inline_assets_vanilla_runtime() -> None:
+    """Test that jQuery and Bootstrap JS are left out of the inline assets with the vanilla runtime"""
+    config = GenerationConfiguration(assets="inline", template_js_options={"runtime": "vanilla"})
+    assets = OfflineAssets(config).get_contents()
+
+    assert "jQuery v3" not in assets[".js"]
+    assert "Bootstrap v4" not in assets[".js"]
+    assert "function anchorOnLoad" in assets[".js"]
+    assert "Bootstrap v4" in assets[".css"]
@@ -0,0 +1,126 @@
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from json_schema_for_humans.generate import (
+    CSS_FILE_NAME,
+    JS_FILE_NAME,
+    generate_from_filename,
+    generate_pages_from_schema,
+    main,
+)
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.output_files import OutputFiles
+from tests.cli_test import assert_cli_runner_result
+from tests.test_utils import get_test_case_path
+
+# Modification time given to existing files, to see if they are written again
+OLD_MTIME = 1000000000
+
+
+def _set_old_mtime(directory: Path) -> None:
+    for path in directory.iterdir():
+        os.utime(path, (OLD_MTIME, OLD_MTIME))
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path: Path) -> None:
+    """Test that generating the same documentation again leaves the files as they are"""
+    config = GenerationConfiguration(deterministic_output=True)
+    result_path = tmp_path / "schema_doc.html"
+    generate_from_filename(get_test_case_path("basic"), str(result_path), config=config)
+    _set_old_mtime(tmp_path)
+
+    output_files = OutputFiles()
+    generate_from_filename(get_test_case_path("basic"), str(result_path), config=config, output_files=output_files)
+
+    assert not output_files.written
+    assert sorted(output_files.unchanged) == sorted(
+        str(tmp_path / name) for name in ["schema_doc.html", CSS_FILE_NAME, JS_FILE_NAME]
+    )
+    assert {path.stat().st_mtime for path in tmp_path.iterdir()} == {OLD_MTIME}
+
+
+def test_changed_files_are_rewritten(tmp_path: Path) -> None:
+    """Test that only the files whose content changed are written again, and that no temporary file is left"""
+    config = GenerationConfiguration(deterministic_output=True)
+    result_path = tmp_path / "schema_doc.html"
+    generate_from_filename(get_test_case_path("basic"), str(result_path), config=config)
+    (tmp_path / CSS_FILE_NAME).write_text("outdated", encoding="utf-8")
+    _set_old_mtime(tmp_path)
+
+    output_files = OutputFiles()
+    generate_from_filename(
+        get_test_case_path("with_definitions"), str(result_path), config=config, output_files=output_files
+    )
+
+    assert sorted(output_files.written) == sorted([str(result_path), str(tmp_path / CSS_FILE_NAME)])
+    assert output_files.unchanged == [str(tmp_path / JS_FILE_NAME)]
+    assert "outdated" not in (tmp_path / CSS_FILE_NAME).read_text(encoding="utf-8")
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["schema_doc.html", CSS_FILE_NAME, JS_FILE_NAME])
+
+
+@pytest.mark.skipif(os.name == "nt", reason="File permissions are POSIX only")
+def test_written_file_permissions(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that new files get the permissions of the umask, without changing it, and that rewritten files keep theirs"""
+    umask = os.umask(0o027)
+    try:
+
+        def _fail_umask(_: int) -> int:
+            raise AssertionError("The umask is global to the process, it must not be changed")
+
+        monkeypatch.setattr(os, "umask", _fail_umask)
+        output_files = OutputFiles()
+        output_files.write_text(str(tmp_path / "new.txt"), "New")
+        (tmp_path / "existing.txt").write_text("Old", encoding="utf-8")
+        (tmp_path / "existing.txt").chmod(0o600)
+        output_files.write_text(str(tmp_path / "existing.txt"), "New")
+    finally:
+        monkeypatch.undo()
+        os.umask(umask)
+
+    assert (tmp_path / "new.txt").stat().st_mode & 0o777 == 0o640
+    assert (tmp_path / "existing.txt").stat().st_mode & 0o777 == 0o600
+    assert (tmp_path / "existing.txt").read_text(encoding="utf-8") == "New"
+
+
+def test_failed_write_leaves_file(tmp_path: Path) -> None:
+    """Test that a file is left as it was if writing its new content fails"""
+    path = tmp_path / "file.txt"
+    path.write_text("before", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with OutputFiles().open(str(path)) as output_file:
+            output_file.write("after")
+            raise RuntimeError()
+
+    assert path.read_text(encoding="utf-8") == "before"
+    assert [child.name for child in tmp_path.iterdir()] == ["file.txt"]
+
+
+def test_unchanged_pages_are_not_rewritten(tmp_path: Path) -> None:
+    """Test that pages that did not change are not written again"""
+    config = GenerationConfiguration(deterministic_output=True)
+    pages = generate_pages_from_schema(get_test_case_path("with_definitions"), str(tmp_path), config=config)
+
+    output_files = OutputFiles()
+    generate_pages_from_schema(
+        get_test_case_path("with_definitions"), str(tmp_path), config=config, output_files=output_files
+    )
+
+    assert not output_files.written
+    assert set(pages) <= set(output_files.unchanged)
+
+
+def test_unchanged_files_using_cli() -> None:
+    """Test that the CLI reports the files that were not written again"""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        arguments = [get_test_case_path("basic"), "doc.html", "--config", "deterministic_output"]
+        assert_cli_runner_result(runner.invoke(main, arguments))
+
+        result = runner.invoke(main, arguments)
+
+        assert_cli_runner_result(result)
+        assert "3 unchanged files were not rewritten" in result.output
@@ -0,0 +1,34 @@
+import pytest
+
+from json_schema_for_humans.generate import _get_template, generate_from_schema
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from tests.md_utils_asserts import GENERATED_TIMESTAMP_REGEXP
+from tests.test_utils import get_test_case_path
+
+
+def _generate(case_name: str, **config_options) -> str:
+    config = GenerationConfiguration(**config_options)
+    return GENERATED_TIMESTAMP_REGEXP.sub(
+        "", generate_from_schema(get_test_case_path(case_name), config=config, minify=config.minify)
+    )
+
+
+@pytest.mark.parametrize("template_name", ["js", "flat"])
+@pytest.mark.parametrize("minify", [True, False])
+def test_render_in_parallel(template_name: str, minify: bool) -> None:
+    """Test that rendering the root properties in other processes gives the same documentation"""
+    for case_name in ["with_definitions", "references", "additional_properties", "pattern_properties"]:
+        expected = _generate(case_name, template_name=template_name, minify=minify)
+
+        assert _generate(case_name, template_name=template_name, minify=minify, render_processes=2) == expected
+
+
+def test_render_in_parallel_not_supported() -> None:
+    """Test that the Markdown template is rendered in one process"""
+    config = GenerationConfiguration(template_name="md", render_processes=2)
+    parallel_renderer = _get_template(config, False).environment.parallel_renderer
+
+    assert _generate("with_definitions", template_name="md", render_processes=2) == _generate(
+        "with_definitions", template_name="md"
+    )
+    assert not parallel_renderer._can_render(None, [None, None])
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from json_schema_for_humans.generate import (
+    _get_intermediate_representation,
+    generate_from_filename,
+    generate_from_schema,
+)
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.jinja_filters import get_description
+from json_schema_for_humans.search_index import build_search_index
+from tests.test_utils import get_test_case_path
+
+SEARCH_CONFIG = {"template_js_options": {"search": True}}
+
+
+def _get_inline_search_index(page: str) -> list:
+    return json.loads(BeautifulSoup(page, "html.parser").find(id="search-index").string)
+
+
+def test_build_search_index() -> None:
+    """Test that the properties of referenced definitions are indexed where they are displayed"""
+    config = GenerationConfiguration()
+    intermediate_representation = _get_intermediate_representation(get_test_case_path("with_definitions"), config, None)
+
+    assert build_search_index(intermediate_representation, get_description) == [
+        ["#billing_address", "billing_address", "root > billing_address", "", ""],
+        ["#billing_address_city", "city", "root > billing_address > city", "", ""],
+        ["#billing_address_futureProperty", "futureProperty", "root > billing_address > futureProperty", "", ""],
+        ["#billing_address_state", "state", "root > billing_address > state", "", ""],
+        ["#billing_address_street_address", "street_address", "root > billing_address > street_address", "", ""],
+        ["#shipping_address", "shipping_address", "root > shipping_address", "", ""],
+    ]
+
+
+@pytest.mark.parametrize(
+    "case_name", ["with_descriptions", "references", "recursive", "combining_oneOf", "pattern_properties"]
+)
+def test_search_index_targets(case_name: str) -> None:
+    """Test that all properties in the search index can be found in the page"""
+    page = generate_from_schema(get_test_case_path(case_name), config=GenerationConfiguration(**SEARCH_CONFIG))
+    soup = BeautifulSoup(page, "html.parser")
+
+    search_index = _get_inline_search_index(page)
+    assert search_index
+    for target, *_ in search_index:
+        assert soup.find(id=target[1:]), target
+
+
+def test_search_index_escaped() -> None:
+    """Test that a description cannot end the script of the inline index"""
+    page = generate_from_schema(get_test_case_path("html_in_patterns"), config=GenerationConfiguration(**SEARCH_CONFIG))
+
+    search_index_script = BeautifulSoup(page, "html.parser").find(id="search-index").string
+    assert "<" not in search_index_script
+    assert any("<" in part for entry in json.loads(search_index_script) for part in entry)
+
+
+def test_search_index_with_lazy_sections(tmp_path: Path) -> None:
+    """Test that the index is written along with lazy sections instead of in the page"""
+    config = GenerationConfiguration(template_js_options={"search": True, "lazy_sections": True})
+    generate_from_filename(get_test_case_path("with_definitions"), str(tmp_path / "schema_doc.html"), config=config)
+
+    page = BeautifulSoup((tmp_path / "schema_doc.html").read_text(encoding="utf-8"), "html.parser")
+    assert not page.find(id="search-index")
+    assert page.find("script", src="schema_doc_sections/search_index.js")
+    assert (
+        (tmp_path / "schema_doc_sections" / "search_index.js")
+        .read_text(encoding="utf-8")
+        .startswith('searchIndexLoaded([["#billing_address",')
+    )
+
+
+def test_search_disabled() -> None:
+    """Test that there is no search box by default"""
+    page = generate_from_schema(get_test_case_path("with_definitions"), config=GenerationConfiguration())
+
+    assert 'id="search-input"' not in page
+    assert 'id="search-index"' not in page
@@ -0,0 +1,157 @@
+import io
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+from click.testing import CliRunner
+
+from json_schema_for_humans.generate import main
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.serve import RenderServer
+
+
+def _request(app: RenderServer, path: str, body: bytes = None, query: str = "") -> Tuple[str, Dict[str, str], str]:
+    """Send a request to the WSGI application, get its status, headers and body"""
+    environ = {"PATH_INFO": path, "QUERY_STRING": query}
+    if body is not None:
+        environ.update(REQUEST_METHOD="POST", CONTENT_LENGTH=str(len(body)), **{"wsgi.input": io.BytesIO(body)})
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status: str, headers: list) -> None:
+        response.update(status=status, headers=dict(headers))
+
+    result = app(environ, start_response)
+    try:
+        content = b"".join(result).decode("utf-8")
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return response["status"], response["headers"], content
+
+
+def _write_json(path: Path, content: dict) -> None:
+    path.write_text(json.dumps(content), encoding="utf-8")
+    # Make sure the change is seen even if the file system only keeps the time in seconds
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def app(tmp_path: Path) -> RenderServer:
+    """Application with a registered schema referencing another file"""
+    _write_json(tmp_path / "common.json", {"type": "string", "description": "First description"})
+    _write_json(tmp_path / "schema.json", {"title": "Person", "properties": {"name": {"$ref": "common.json"}}})
+    schema_files = [(str(tmp_path / "schema.json"), "schema.json")]
+    return RenderServer(GenerationConfiguration(deterministic_output=True), schema_files)
+
+
+def test_render_registered_schema(app: RenderServer, tmp_path: Path) -> None:
+    """Test that a registered schema is cached until a file it references changes"""
+    status, headers, content = _request(app, "/schemas/schema.json")
+    assert status == "200 OK"
+    assert headers["X-Cache"] == "miss"
+    assert "First description" in content
+
+    status, headers, cached_content = _request(app, "/schemas/schema.json")
+    assert headers["X-Cache"] == "hit"
+    assert cached_content == content
+
+    _write_json(tmp_path / "common.json", {"type": "string", "description": "Second description"})
+    status, headers, content = _request(app, "/schemas/schema.json")
+    assert headers["X-Cache"] == "miss"
+    assert "Second description" in content
+
+
+def test_render_posted_schema(app: RenderServer) -> None:
+    """Test that posted JSON or YAML schemas are rendered with the configuration of the request"""
+    status, headers, content = _request(app, "/render", b"title: Posted\ntype: object\n", "config=template_name=md")
+    assert status == "200 OK"
+    assert headers["Content-Type"] == "text/markdown; charset=utf-8"
+    assert content.startswith("# Posted")
+
+    status, _, content = _request(app, "/render", b'{"title": "Posted"')
+    assert status == "400 Bad Request"
+
+
+def test_render_invalid_config(app: RenderServer) -> None:
+    """Test that a configuration whose template cannot be loaded is a bad request that does not block next renders"""
+    status, _, content = _request(app, "/render", b'{"title": "Posted"}', "config=template_name=nope")
+    assert status == "400 Bad Request"
+    assert "Invalid config" in content
+
+    status, _, content = _request(app, "/render", b'{"title": "Posted"}')
+    assert status == "200 OK"
+    assert "Posted" in content
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "config=templates_directory=/tmp",
+        "config=cache_directory=/tmp",
+        "config=no_copy_css",
+        "config=render_processes=64",
+        "config=template_name=../templates/js",
+    ],
+)
+def test_render_config_not_allowed(app: RenderServer, query: str) -> None:
+    """Test that requests cannot change paths used by the server nor its resources"""
+    status, _, content = _request(app, "/schemas/schema.json", query=query)
+    assert status == "400 Bad Request"
+    assert "Invalid config parameter" in content
+
+
+def test_asset_config_ignored(app: RenderServer, tmp_path: Path) -> None:
+    """Test that assets are only served from the template of the application"""
+    (tmp_path / "js").mkdir()
+    (tmp_path / "js" / "secret.js").write_text("secret", encoding="utf-8")
+
+    status, _, _ = _request(app, "/secret.js", query=f"config=templates_directory={tmp_path}")
+    assert status == "404 Not Found"
+    status, headers, _ = _request(app, "/schema_doc.js", query=f"config=templates_directory={tmp_path}")
+    assert status == "200 OK"
+    assert headers["Content-Type"] == "application/javascript; charset=utf-8"
+
+
+def test_render_not_blocked_by_unread_response(app: RenderServer) -> None:
+    """Test that a document whose response is not read yet does not block the next renders"""
+    environ = {"PATH_INFO": "/schemas/schema.json"}
+    setup_testing_defaults(environ)
+    unread_response = app(environ, lambda status, headers: None)
+
+    responses = []
+    render_thread = threading.Thread(
+        target=lambda: responses.append(_request(app, "/render", b'{"title": "Posted"}')), daemon=True
+    )
+    render_thread.start()
+    render_thread.join(timeout=30)
+    assert responses and responses[0][0] == "200 OK"
+    assert "First description" in b"".join(unread_response).decode("utf-8")
+
+
+def test_metrics(app: RenderServer) -> None:
+    """Test that the metrics count requests, renders and cache hits"""
+    _request(app, "/schemas/schema.json")
+    _request(app, "/schemas/schema.json")
+    assert _request(app, "/schemas/missing.json")[0] == "404 Not Found"
+    assert _request(app, "/schemas/schema_doc.css")[0] == "200 OK"
+
+    metrics = json.loads(_request(app, "/metrics")[2])
+
+    assert metrics["requests"] == 5
+    assert metrics["renders"] == 1
+    assert metrics["cache_hits"] == 1
+    assert metrics["errors"] == 1
+    assert metrics["tracked_files"] == 2
+
+
+def test_serve_subcommand_help() -> None:
+    """Test that the serve subcommand is run instead of generating a schema named serve"""
+    result = CliRunner().invoke(main, ["serve", "--help"])
+    assert result.exit_code == 0
+    assert "Run a local HTTP server" in result.output
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.stdio_server import run_stdio_server
+
+
+def _write_json(path: Path, content: Dict[str, Any]) -> None:
+    path.write_text(json.dumps(content), encoding="utf-8")
+    # Make sure the change is seen even if the file system only keeps the time in seconds
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def _run(jobs: List[Any], jobs_count: int = 1) -> List[Dict[str, Any]]:
+    input_stream = io.StringIO("".join(f"{job if isinstance(job, str) else json.dumps(job)}\n" for job in jobs))
+    output_stream = io.StringIO()
+    run_stdio_server(input_stream, output_stream, GenerationConfiguration(deterministic_output=True), jobs_count)
+    return [json.loads(line) for line in output_stream.getvalue().splitlines()]
+
+
+def test_stdio_server(tmp_path: Path) -> None:
+    """Test that schema files and inline schemas are documented, with the configuration of each job"""
+    _write_json(tmp_path / "common.json", {"type": "string", "description": "First description"})
+    _write_json(tmp_path / "schema.json", {"properties": {"name": {"$ref": "common.json"}}})
+    inline_schema = {"title": "Inline", "properties": {"name": {"$ref": "common.json"}}}
+
+    results = _run(
+        [
+            {"id": "file", "schema": str(tmp_path / "schema.json"), "output": str(tmp_path / "schema.html")},
+            {
+                "id": "inline",
+                "schema": str(tmp_path / "inline.json"),
+                "inline_schema": inline_schema,
+                "output": str(tmp_path / "inline.md"),
+                "config": {"template_name": "md"},
+            },
+        ]
+    )
+
+    assert [(result["id"], result["status"], result["error"]) for result in results] == [
+        ("file", "ok", None),
+        ("inline", "ok", None),
+    ]
+    assert results[0]["used_schemas"] == [str(tmp_path / "common.json"), str(tmp_path / "schema.json")]
+    assert results[1]["used_schemas"] == [str(tmp_path / "common.json")]
+    assert "First description" in (tmp_path / "schema.html").read_text(encoding="utf-8")
+    assert (tmp_path / "inline.md").read_text(encoding="utf-8").startswith("# Inline")
+
+
+def test_stdio_server_changed_file(tmp_path: Path) -> None:
+    """Test that a referenced file that changed between jobs is read again"""
+    _write_json(tmp_path / "common.json", {"type": "string", "description": "First description"})
+    _write_json(tmp_path / "schema.json", {"properties": {"name": {"$ref": "common.json"}}})
+    job = {"schema": str(tmp_path / "schema.json"), "output": str(tmp_path / "schema.html")}
+
+    _run([job])
+    _write_json(tmp_path / "common.json", {"type": "string", "description": "Second description"})
+    _run([job])
+
+    assert "Second description" in (tmp_path / "schema.html").read_text(encoding="utf-8")
+
+
+def test_stdio_server_errors(tmp_path: Path) -> None:
+    """Test that invalid jobs and failed generations are reported without stopping the server"""
+    results = _run(
+        [
+            "not json",
+            ["not", "an", "object"],
+            {"id": 1, "output": str(tmp_path / "result.html")},
+            {"id": 2, "schema": str(tmp_path / "missing.json"), "output": str(tmp_path / "result.html")},
+        ],
+        jobs_count=2,
+    )
+
+    assert sorted([result["id"] for result in results], key=str) == [1, 2, None, None]
+    assert all(result["status"] == "error" and result["error"] for result in results)
@@ -0,0 +1,70 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from json_schema_for_humans.generation_configuration import GenerationConfiguration
+from json_schema_for_humans.watch import Watcher
+
+
+def _write_json(path: Path, content: Dict[str, Any]) -> None:
+    path.write_text(json.dumps(content), encoding="utf-8")
+    # Make sure the change is seen even if the file system only keeps the time in seconds
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def _write_definition(path: Path, description: str) -> None:
+    _write_json(path, {"definitions": {"name": {"type": "string", "description": description}}})
+
+
+@pytest.fixture
+def tasks(tmp_path: Path) -> List[Tuple[str, str]]:
+    """2 schemas referencing the same file through another one, and a schema referencing nothing"""
+    _write_definition(tmp_path / "common.json", "First description")
+    _write_json(tmp_path / "person.json", {"$ref": "common.json#/definitions/name"})
+    for name in ["a", "b"]:
+        _write_json(tmp_path / f"{name}.json", {"properties": {"who": {"$ref": "person.json"}}})
+    _write_json(tmp_path / "c.json", {"properties": {"count": {"type": "integer"}}})
+    return [(str(tmp_path / f"{name}.json"), str(tmp_path / "docs" / f"{name}.html")) for name in ["a", "b", "c"]]
+
+
+def test_watch(tmp_path: Path, tasks: List[Tuple[str, str]]) -> None:
+    """Test that only the results using a changed file, directly or not, are generated again"""
+    watcher = Watcher(tasks, GenerationConfiguration(deterministic_output=True))
+    assert [result.error for result in watcher.build()] == [None, None, None]
+    assert str(tmp_path / "common.json") in watcher.watched_files
+    assert watcher.check() == []
+
+    _write_definition(tmp_path / "common.json", "Second description")
+    results = watcher.check()
+
+    assert [Path(result.result_path).name for result in results] == ["a.html", "b.html"]
+    assert "Second description" in Path(tasks[0][1]).read_text(encoding="utf-8")
+    assert watcher.check() == []
+
+
+def test_watch_new_reference(tmp_path: Path, tasks: List[Tuple[str, str]]) -> None:
+    """Test that files referenced after a change are watched too"""
+    watcher = Watcher(tasks, GenerationConfiguration(deterministic_output=True))
+    watcher.build()
+
+    _write_json(tmp_path / "c.json", {"properties": {"who": {"$ref": "common.json#/definitions/name"}}})
+    assert [Path(result.result_path).name for result in watcher.check()] == ["c.html"]
+    _write_definition(tmp_path / "common.json", "Second description")
+
+    assert [Path(result.result_path).name for result in watcher.check()] == ["a.html", "b.html", "c.html"]
+
+
+def test_watch_error(tmp_path: Path, tasks: List[Tuple[str, str]]) -> None:
+    """Test that a schema that cannot be documented is generated again once fixed"""
+    watcher = Watcher(tasks, GenerationConfiguration(deterministic_output=True))
+    watcher.build()
+
+    (tmp_path / "person.json").write_text("{", encoding="utf-8")
+    assert all(result.error for result in watcher.check())
+    _write_json(tmp_path / "person.json", {"$ref": "common.json#/definitions/name"})
+
+    assert [result.error for result in watcher.check()] == [None, None]